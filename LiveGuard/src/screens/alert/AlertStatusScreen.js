@@ -111,10 +111,10 @@ const AlertStatusScreen = ({ navigation, route }) => {
   const { isConnected } = useNetInfo();
   const isFocused = useIsFocused();
   const locationSubscription = useRef(null);
+  // Server-advertised minimum gap between location PATCHes (update_interval_s)
+  const locationIntervalRef = useRef(0);
+  const lastLocationSentRef = useRef(0);
   const toastTimer = useRef(null);
-  const pollTimerRef = useRef(null);
-  const lastStatusRef = useRef(null);
-  const unchangedSinceRef = useRef(Date.now());
   const { colors, isDark } = useTheme();
   const styles = useMemo(() => makeStyles(colors), [colors]);
 
@@ -158,34 +158,33 @@ const AlertStatusScreen = ({ navigation, route }) => {
     if (alertId) dispatch(fetchAlertStatus(alertId));
   }, [alertId, dispatch]);
 
-  // Track when status last changed to drive poll backoff
-  useEffect(() => {
-    if (currentAlert?.status && currentAlert.status !== lastStatusRef.current) {
-      lastStatusRef.current = currentAlert.status;
-      unchangedSinceRef.current = Date.now();
-    }
-  }, [currentAlert?.status]);
-
-  // ── Poll alert status with backoff ───────────────────────────────────────────
+  // ── Live status via long-poll ────────────────────────────────────────────────
+  // Each /status/wait/ request returns as soon as the alert changes (or after
+  // ~25 s with a 304) and is immediately re-issued; a terminal status ends it.
   useEffect(() => {
     if (!isFocused || !alertId) return;
-    doFetch();
-    if (isTerminal) return;
-
-    const schedule = () => {
-      const unchanged = Date.now() - unchangedSinceRef.current;
-      const delay = unchanged > 5 * 60_000 ? 30_000 : unchanged > 2 * 60_000 ? 15_000 : 5_000;
-      pollTimerRef.current = setTimeout(() => {
-        doFetch();
-        schedule();
-      }, delay);
+    let stopped = false;
+    let inFlight = null;
+
+    const run = async () => {
+      let action = await (inFlight = dispatch(fetchAlertStatus(alertId)));
+      while (!stopped) {
+        if (fetchAlertStatus.fulfilled.match(action)) {
+          if (TERMINAL_STATUSES.includes(action.payload?.status)) return;
+        } else {
+          await new Promise((resolve) => setTimeout(resolve, 5_000));
+          if (stopped) return;
+        }
+        action = await (inFlight = dispatch(fetchAlertStatus({ alertId, wait: true })));
+      }
     };
 
-    schedule();
+    run();
     return () => {
-      if (pollTimerRef.current) clearTimeout(pollTimerRef.current);
+      stopped = true;
+      inFlight?.abort();
     };
-  }, [isFocused, isTerminal, alertId, doFetch]);
+  }, [isFocused, alertId, dispatch]);
 
   // ── 60-second cancel countdown ───────────────────────────────────────────────
   useEffect(() => {
@@ -215,12 +214,22 @@ const AlertStatusScreen = ({ navigation, route }) => {
       locationSubscription.current = await Location.watchPositionAsync(
         { accuracy: Location.Accuracy.High, distanceInterval: 15, timeInterval: 10000 },
         (loc) => {
+          const now = Date.now();
+          if (now - lastLocationSentRef.current < locationIntervalRef.current) return;
+          lastLocationSentRef.current = now;
           dispatch(updateAlertLocation({
             alertId,
             latitude: loc.coords.latitude,
             longitude: loc.coords.longitude,
             accuracy: loc.coords.accuracy,
-          }));
+          }))
+            .unwrap()
+            .then((data) => {
+              if (data?.update_interval_s != null) {
+                locationIntervalRef.current = data.update_interval_s * 1000;
+              }
+            })
+            .catch(() => {});
         }
       );
     })();
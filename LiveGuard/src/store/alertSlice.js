@@ -89,12 +89,31 @@ export const fetchPriorityQuestions = createAsyncThunk(
   }
 );
 
+// Last ETag per alert; the server answers 304 while the status is unchanged.
+const statusEtags = {};
+
+// Long-poll: the server holds /status/wait/ until the alert changes or
+// STATUS_WAIT_S passes, so the client timeout must outlast it.
+const STATUS_WAIT_S = 25;
+const STATUS_WAIT_TIMEOUT_MS = (STATUS_WAIT_S + 10) * 1000;
+
+// Accepts an alert id, or { alertId, wait: true } to long-poll for the next change.
 export const fetchAlertStatus = createAsyncThunk(
   'alert/fetchStatus',
-  async (alert_id, { rejectWithValue }) => {
+  async (arg, { getState, rejectWithValue, signal }) => {
+    const { alertId: alert_id, wait = false } = typeof arg === 'object' ? arg : { alertId: arg };
     try {
-      const { data } = await api.get(`/api/alerts/${alert_id}/status/`);
-      return data;
+      const cached = getState().alert.alertStatus;
+      const etag = String(cached?.alert_id) === String(alert_id) ? statusEtags[alert_id] : null;
+      const response = await api.get(`/api/alerts/${alert_id}/status/${wait ? 'wait/' : ''}`, {
+        headers: etag ? { 'If-None-Match': etag } : {},
+        validateStatus: (s) => (s >= 200 && s < 300) || s === 304,
+        signal,
+        ...(wait ? { params: { timeout: STATUS_WAIT_S }, timeout: STATUS_WAIT_TIMEOUT_MS } : {}),
+      });
+      if (response.status === 304) return cached;
+      statusEtags[alert_id] = response.headers?.etag;
+      return response.data;
     } catch (err) {
       return rejectWithValue(err.response?.data?.detail || 'Failed to fetch alert status');
     }
@@ -223,8 +242,9 @@ const alertSlice = createSlice({
 
     // fetchAlertStatus
     builder
-      .addCase(fetchAlertStatus.pending, (state) => {
-        state.loading = true;
+      .addCase(fetchAlertStatus.pending, (state, { meta }) => {
+        // A parked long-poll is not "loading" from the user's point of view.
+        if (!meta.arg?.wait) state.loading = true;
         state.statusError = null;
       })
       .addCase(fetchAlertStatus.fulfilled, (state, { payload }) => {
@@ -233,9 +253,9 @@ const alertSlice = createSlice({
         state.currentAlert = payload;  // keep currentAlert fresh so AlertStatusScreen reflects updates
         state.statusError = null;
       })
-      .addCase(fetchAlertStatus.rejected, (state, { payload }) => {
+      .addCase(fetchAlertStatus.rejected, (state, { payload, meta }) => {
         state.loading = false;
-        state.statusError = payload;
+        if (!meta.aborted) state.statusError = payload;
       });
 
     // fetchAlertHistory
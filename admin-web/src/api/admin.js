@@ -57,18 +57,33 @@ export const updateAgencyStaff = async (agencyId, userId, data) => {
   return response.data;
 };
 
-export const fetchAlerts = async ({ status, type, priority, search, page, page_size } = {}) => {
+// The admin alert and notification lists are keyset-paginated: pass the
+// cursor taken from a previous response's `next` / `previous` link.
+export const cursorFrom = (link) => (link ? new URL(link).searchParams.get('cursor') : null);
+
+export const fetchAlerts = async ({ status, type, priority, search, cursor, page_size } = {}) => {
   const params = {};
   if (status) params.status = status;
   if (type) params.type = type;
   if (priority) params.priority = priority;
   if (search) params.search = search;
-  if (page) params.page = page;
+  if (cursor) params.cursor = cursor;
   if (page_size) params.page_size = page_size;
   const response = await client.get('/api/admin/alerts/', { params });
   return response.data;
 };
 
+// Streams every alert matching the filters (oldest first) as CSV.
+export const exportAlerts = async ({ status, type, priority, search } = {}) => {
+  const params = { format: 'csv' };
+  if (status) params.status = status;
+  if (type) params.type = type;
+  if (priority) params.priority = priority;
+  if (search) params.search = search;
+  const response = await client.get('/api/admin/alerts/export/', { params, responseType: 'blob' });
+  return response.data;
+};
+
 export const fetchAlert = async (alertId) => {
   const response = await client.get(`/api/admin/alerts/${alertId}/`);
   return response.data;
@@ -81,8 +96,12 @@ export const assignAlert = async (alertId, agencyId) => {
   return response.data;
 };
 
-export const fetchUsers = async () => {
-  const response = await client.get('/api/admin/users/');
+export const fetchUsers = async ({ search, cursor, page_size } = {}) => {
+  const params = {};
+  if (search) params.search = search;
+  if (cursor) params.cursor = cursor;
+  if (page_size) params.page_size = page_size;
+  const response = await client.get('/api/admin/users/', { params });
   return response.data;
 };
 
@@ -91,12 +110,12 @@ export const toggleUserActive = async (userId, isActive) => {
   return response.data;
 };
 
-export const fetchNotifications = async ({ channel, status, assignment, page, page_size } = {}) => {
+export const fetchNotifications = async ({ channel, status, assignment, cursor, page_size } = {}) => {
   const params = {};
   if (channel) params.channel = channel;
   if (status) params.status = status;
   if (assignment) params.assignment = assignment;
-  if (page) params.page = page;
+  if (cursor) params.cursor = cursor;
   if (page_size) params.page_size = page_size;
   const response = await client.get('/api/admin/notifications/', { params });
   return response.data;
@@ -107,6 +126,17 @@ export const fetchReports = async () => {
   return response.data;
 };
 
+// metric: 'alerts' | 'response_time'; interval: 'hour' | 'day'; start/end: ISO strings.
+export const fetchReportTimeseries = async ({ metric, interval, start, end } = {}) => {
+  const params = {};
+  if (metric) params.metric = metric;
+  if (interval) params.interval = interval;
+  if (start) params.start = start;
+  if (end) params.end = end;
+  const response = await client.get('/api/admin/reports/timeseries/', { params });
+  return response.data;
+};
+
 export const fetchSettings = async () => {
   const response = await client.get('/api/admin/settings/');
   return response.data;
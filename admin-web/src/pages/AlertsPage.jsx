@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react';
 import { Link } from 'react-router-dom';
 import ShellLayout from '../components/ShellLayout';
-import { fetchAlerts } from '../api/admin';
+import { cursorFrom, exportAlerts, fetchAlerts } from '../api/admin';
 import { parseApiError } from '../api/errors';
 
 // B4 — sortable column header
@@ -26,9 +26,11 @@ const AlertsPage = () => {
   const [error, setError] = useState('');
   const [filters, setFilters] = useState({ status: '', type: '', priority: '' });
   const [search, setSearch] = useState('');
+  const [cursor, setCursor] = useState(null);
   const [page, setPage] = useState(1);
+  const [links, setLinks] = useState({ next: null, previous: null });
   const [totalCount, setTotalCount] = useState(0);
-  const [totalPages, setTotalPages] = useState(1);
+  const [countExact, setCountExact] = useState(true);
   // B4 — client-side sort of the currently loaded page
   const [sortConfig, setSortConfig] = useState({ key: null, dir: 'asc' });
 
@@ -39,7 +41,7 @@ const AlertsPage = () => {
       const data = await fetchAlerts({
         ...filters,
         search: search.trim() || undefined,
-        page,
+        cursor,
         page_size: PAGE_SIZE,
       });
 
@@ -48,7 +50,8 @@ const AlertsPage = () => {
 
       setAlerts(rows);
       setTotalCount(count);
-      setTotalPages(Math.max(1, Math.ceil(count / PAGE_SIZE)));
+      setCountExact(data?.count_is_exact ?? true);
+      setLinks({ next: data?.next ?? null, previous: data?.previous ?? null });
     } catch (err) {
       setError(parseApiError(err, 'Failed to load alerts.'));
     } finally {
@@ -56,11 +59,21 @@ const AlertsPage = () => {
     }
   };
 
-  useEffect(() => { load(); }, [filters, search, page]);
+  useEffect(() => { load(); }, [filters, search, cursor]);
+
+  const resetPages = () => {
+    setCursor(null);
+    setPage(1);
+  };
+
+  const goTo = (link, step) => {
+    setCursor(cursorFrom(link));
+    setPage((p) => p + step);
+  };
 
   const setFilter = (key) => (e) => {
     setFilters((prev) => ({ ...prev, [key]: e.target.value }));
-    setPage(1);
+    resetPages();
   };
 
   // B4
@@ -78,26 +91,24 @@ const AlertsPage = () => {
     });
   }, [alerts, sortConfig]);
 
-  const exportCsv = () => {
-    const headers = ['ID', 'Type', 'Priority', 'Status', 'Reporter', 'Address', 'Created', 'Assignments'];
-    const rows = alerts.map((a) => [
-      a.alert_id,
-      a.alert_type,
-      a.priority_level,
-      a.status,
-      (a.reporter?.full_name || '').replace(/,/g, ' '),
-      (a.address || '').replace(/,/g, ' '),
-      new Date(a.created_at).toLocaleString(),
-      a.assignment_count ?? 0,
-    ]);
-    const csv = [headers, ...rows].map((r) => r.join(',')).join('\n');
-    const blob = new Blob([csv], { type: 'text/csv' });
-    const url = URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = `alerts-page-${page}-${Date.now()}.csv`;
-    a.click();
-    URL.revokeObjectURL(url);
+  const [exporting, setExporting] = useState(false);
+
+  const exportCsv = async () => {
+    setExporting(true);
+    setError('');
+    try {
+      const blob = await exportAlerts({ ...filters, search: search.trim() || undefined });
+      const url = URL.createObjectURL(blob);
+      const a = document.createElement('a');
+      a.href = url;
+      a.download = `alerts-${Date.now()}.csv`;
+      a.click();
+      URL.revokeObjectURL(url);
+    } catch (err) {
+      setError(parseApiError(err, 'Failed to export alerts.'));
+    } finally {
+      setExporting(false);
+    }
   };
 
   return (
@@ -108,12 +119,12 @@ const AlertsPage = () => {
             <h2>Alerts</h2>
             <p>
               All emergency alerts across the system.
-              {totalCount > 0 && ` ${totalCount} result${totalCount !== 1 ? 's' : ''}`}
+              {totalCount > 0 && ` ${countExact ? '' : 'About '}${totalCount.toLocaleString()} result${totalCount !== 1 ? 's' : ''}`}
             </p>
           </div>
           <div className="panel-actions">
-            <button type="button" className="ghost-btn" onClick={exportCsv} disabled={alerts.length === 0} title="Export current page as CSV">
-              Export CSV
+            <button type="button" className="ghost-btn" onClick={exportCsv} disabled={exporting || alerts.length === 0} title="Export every matching alert as CSV">
+              {exporting ? 'Exporting...' : 'Export CSV'}
             </button>
             <button type="button" className="ghost-btn" onClick={load} disabled={loading}>
               {loading ? 'Loading...' : 'Refresh'}
@@ -126,7 +137,7 @@ const AlertsPage = () => {
             type="search"
             placeholder="Search by ID, type, status, reporter, address…"
             value={search}
-            onChange={(e) => { setSearch(e.target.value); setPage(1); }}
+            onChange={(e) => { setSearch(e.target.value); resetPages(); }}
           />
         </div>
 
@@ -185,11 +196,13 @@ const AlertsPage = () => {
                 </tbody>
               </table>
             </div>
-            {totalPages > 1 && (
+            {(links.next || links.previous) && (
               <div className="pagination">
-                <button className="page-btn" onClick={() => setPage((p) => Math.max(1, p - 1))} disabled={page === 1}>← Prev</button>
-                <span className="page-info">Page {page} of {totalPages}</span>
-                <button className="page-btn" onClick={() => setPage((p) => Math.min(totalPages, p + 1))} disabled={page === totalPages}>Next →</button>
+                <button className="page-btn" onClick={() => goTo(links.previous, -1)} disabled={!links.previous}>← Prev</button>
+                <span className="page-info">
+                  Page {page}{countExact && ` of ${Math.max(1, Math.ceil(totalCount / PAGE_SIZE))}`}
+                </span>
+                <button className="page-btn" onClick={() => goTo(links.next, 1)} disabled={!links.next}>Next →</button>
               </div>
             )}
           </>
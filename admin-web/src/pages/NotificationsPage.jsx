@@ -1,6 +1,6 @@
 import { useEffect, useMemo, useState } from 'react';
 import ShellLayout from '../components/ShellLayout';
-import { fetchNotifications, broadcastNotification } from '../api/admin';
+import { cursorFrom, fetchNotifications, broadcastNotification } from '../api/admin';
 import { parseApiError } from '../api/errors';
 
 // B4 — sortable column header
@@ -23,9 +23,11 @@ const NotificationsPage = () => {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
   const [filters, setFilters] = useState({ channel: '', status: '', assignment: '' });
+  const [cursor, setCursor] = useState(null);
   const [page, setPage] = useState(1);
+  const [links, setLinks] = useState({ next: null, previous: null });
   const [totalCount, setTotalCount] = useState(0);
-  const [totalPages, setTotalPages] = useState(1);
+  const [countExact, setCountExact] = useState(true);
   // B4
   const [sortConfig, setSortConfig] = useState({ key: null, dir: 'asc' });
 
@@ -61,14 +63,15 @@ const NotificationsPage = () => {
     try {
       const data = await fetchNotifications({
         ...filters,
-        page,
+        cursor,
         page_size: PAGE_SIZE,
       });
       const rows = Array.isArray(data) ? data : (data?.results || []);
       const count = Array.isArray(data) ? rows.length : Number(data?.count ?? rows.length);
       setLogs(rows);
       setTotalCount(count);
-      setTotalPages(Math.max(1, Math.ceil(count / PAGE_SIZE)));
+      setCountExact(data?.count_is_exact ?? true);
+      setLinks({ next: data?.next ?? null, previous: data?.previous ?? null });
     } catch (err) {
       setError(parseApiError(err, 'Failed to load notification logs.'));
     } finally {
@@ -76,11 +79,21 @@ const NotificationsPage = () => {
     }
   };
 
-  useEffect(() => { load(); }, [filters, page]);
+  useEffect(() => { load(); }, [filters, cursor]);
+
+  const resetPages = () => {
+    setCursor(null);
+    setPage(1);
+  };
+
+  const goTo = (link, step) => {
+    setCursor(cursorFrom(link));
+    setPage((p) => p + step);
+  };
 
   const setFilter = (key) => (e) => {
     setFilters((prev) => ({ ...prev, [key]: e.target.value }));
-    setPage(1);
+    resetPages();
   };
 
   // B4
@@ -106,7 +119,7 @@ const NotificationsPage = () => {
             <h2>Notification Log</h2>
             <p>
               Audit trail of all notification delivery attempts.
-              {totalCount > 0 && ` ${totalCount} result${totalCount !== 1 ? 's' : ''}`}
+              {totalCount > 0 && ` ${countExact ? '' : 'About '}${totalCount.toLocaleString()} result${totalCount !== 1 ? 's' : ''}`}
             </p>
           </div>
           <button type="button" className="ghost-btn" onClick={load} disabled={loading}>
@@ -212,11 +225,13 @@ const NotificationsPage = () => {
                 </tbody>
               </table>
             </div>
-            {totalPages > 1 && (
+            {(links.next || links.previous) && (
               <div className="pagination">
-                <button className="page-btn" onClick={() => setPage((p) => Math.max(1, p - 1))} disabled={page === 1}>← Prev</button>
-                <span className="page-info">Page {page} of {totalPages}</span>
-                <button className="page-btn" onClick={() => setPage((p) => Math.min(totalPages, p + 1))} disabled={page === totalPages}>Next →</button>
+                <button className="page-btn" onClick={() => goTo(links.previous, -1)} disabled={!links.previous}>← Prev</button>
+                <span className="page-info">
+                  Page {page}{countExact && ` of ${Math.max(1, Math.ceil(totalCount / PAGE_SIZE))}`}
+                </span>
+                <button className="page-btn" onClick={() => goTo(links.next, 1)} disabled={!links.next}>Next →</button>
               </div>
             )}
           </>
@@ -1,10 +1,11 @@
 import { useEffect, useState } from 'react';
 import ShellLayout from '../components/ShellLayout';
-import { fetchReports } from '../api/admin';
+import { fetchReports, fetchReportTimeseries } from '../api/admin';
 import { parseApiError } from '../api/errors';
 
 const fmtSeconds = (s) => {
   if (s == null) return '—';
+  if (s < 60) return `${Math.round(s)} s`;
   const mins = Math.round(s / 60);
   if (mins < 60) return `${mins} min`;
   return `${(mins / 60).toFixed(1)} hr`;
@@ -17,8 +18,15 @@ const rateClass = (pct) => {
   return 'bad';
 };
 
+// Alerts of all types per hour, from the per-type series.
+const hourlyTotals = (trend) => (trend?.buckets || []).map((bucket, i) => ({
+  bucket,
+  count: Object.values(trend.series).reduce((sum, values) => sum + values[i], 0),
+}));
+
 const ReportsPage = () => {
   const [data, setData] = useState(null);
+  const [trend, setTrend] = useState(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState('');
 
@@ -26,7 +34,12 @@ const ReportsPage = () => {
     setLoading(true);
     setError('');
     try {
-      setData(await fetchReports());
+      const [reports, hourly] = await Promise.all([
+        fetchReports(),
+        fetchReportTimeseries({ metric: 'alerts', interval: 'hour' }),
+      ]);
+      setData(reports);
+      setTrend(hourly);
     } catch (err) {
       setError(parseApiError(err, 'Failed to load reports.'));
     } finally {
@@ -74,6 +87,25 @@ const ReportsPage = () => {
               ))}
             </div>
 
+            {/* Hourly trend */}
+            <div className="section-title">Alerts per Hour (last 24 h)</div>
+            {(() => {
+              const totals = hourlyTotals(trend);
+              const peak = Math.max(1, ...totals.map((t) => t.count));
+              return (
+                <div className="trend-chart">
+                  {totals.map(({ bucket, count }) => (
+                    <div
+                      key={bucket}
+                      className={`trend-bar ${count ? '' : 'empty'}`}
+                      style={{ height: `${(count / peak) * 100}%` }}
+                      title={`${new Date(bucket).toLocaleString()}: ${count}`}
+                    />
+                  ))}
+                </div>
+              );
+            })()}
+
             {/* Type + Status distributions */}
             <div className="breakdown-grid">
               <div className="breakdown-card">
@@ -128,21 +160,57 @@ const ReportsPage = () => {
               </table>
             </div>
 
-            {/* Avg response time by agency type */}
-            <div className="section-title">Avg Response Time by Agency Type</div>
+            {/* Response time by agency type: mean and percentiles */}
+            <div className="section-title">Response Time by Agency Type</div>
+            <div className="table-wrap">
+              <table className="data-table">
+                <thead>
+                  <tr>
+                    <th>Agency Type</th>
+                    <th>Average</th>
+                    <th>p50</th>
+                    <th>p90</th>
+                    <th>p99</th>
+                  </tr>
+                </thead>
+                <tbody>
+                  {Object.entries(data?.avg_response_seconds_by_agency_type || {}).map(([type, seconds]) => {
+                    const pct = data?.response_time_percentiles_by_agency_type?.[type];
+                    return (
+                      <tr key={type}>
+                        <td><span className="badge type">{type}</span></td>
+                        <td>{fmtSeconds(seconds)}</td>
+                        <td>{fmtSeconds(pct?.p50)}</td>
+                        <td>{fmtSeconds(pct?.p90)}</td>
+                        <td>{fmtSeconds(pct?.p99)}</td>
+                      </tr>
+                    );
+                  })}
+                </tbody>
+              </table>
+            </div>
+
+            {/* Time from assignment to a delivered notification */}
+            <div className="section-title">Notification Delivery Latency by Agency Type</div>
             <div className="table-wrap">
               <table className="data-table">
                 <thead>
                   <tr>
                     <th>Agency Type</th>
-                    <th>Avg Response Time</th>
+                    <th>Deliveries</th>
+                    <th>p50</th>
+                    <th>p90</th>
+                    <th>p99</th>
                   </tr>
                 </thead>
                 <tbody>
-                  {Object.entries(data?.avg_response_seconds_by_agency_type || {}).map(([type, seconds]) => (
+                  {Object.entries(data?.delivery_latency_percentiles_by_agency_type || {}).map(([type, pct]) => (
                     <tr key={type}>
                       <td><span className="badge type">{type}</span></td>
-                      <td>{fmtSeconds(seconds)}</td>
+                      <td>{pct.count}</td>
+                      <td>{fmtSeconds(pct.p50)}</td>
+                      <td>{fmtSeconds(pct.p90)}</td>
+                      <td>{fmtSeconds(pct.p99)}</td>
                     </tr>
                   ))}
                 </tbody>
@@ -1,7 +1,7 @@
 import { useEffect, useMemo, useState } from 'react';
 import ShellLayout from '../components/ShellLayout';
 import { useModal } from '../components/Modal';
-import { fetchUsers, toggleUserActive } from '../api/admin';
+import { cursorFrom, fetchUsers, toggleUserActive } from '../api/admin';
 import { parseApiError } from '../api/errors';
 
 const PAGE_SIZE = 20;
@@ -29,7 +29,11 @@ const UsersPage = () => {
   const [toggling, setToggling] = useState(null);
   const [selected, setSelected] = useState(new Set());
   const [bulkBusy, setBulkBusy] = useState(false);
+  const [cursor, setCursor] = useState(null);
   const [page, setPage] = useState(1);
+  const [links, setLinks] = useState({ next: null, previous: null });
+  const [totalCount, setTotalCount] = useState(0);
+  const [countExact, setCountExact] = useState(true);
 
   // B4 — sort state
   const [sortConfig, setSortConfig] = useState({ key: null, dir: 'asc' });
@@ -38,8 +42,16 @@ const UsersPage = () => {
     setLoading(true);
     setError('');
     try {
-      const data = await fetchUsers();
-      setUsers(Array.isArray(data) ? data : data?.results || []);
+      const data = await fetchUsers({
+        search: query.trim() || undefined,
+        cursor,
+        page_size: PAGE_SIZE,
+      });
+      const rows = Array.isArray(data) ? data : data?.results || [];
+      setUsers(rows);
+      setTotalCount(Number(data?.count ?? rows.length));
+      setCountExact(data?.count_is_exact ?? true);
+      setLinks({ next: data?.next ?? null, previous: data?.previous ?? null });
     } catch (err) {
       setError(parseApiError(err, 'Failed to load users.'));
     } finally {
@@ -47,35 +59,34 @@ const UsersPage = () => {
     }
   };
 
-  useEffect(() => { load(); }, []);
+  useEffect(() => { load(); }, [query, cursor]);
 
-  const filtered = useMemo(() => {
-    const term = query.trim().toLowerCase();
-    return term
-      ? users.filter((u) =>
-          [u.full_name, u.email, u.phone_number]
-            .filter(Boolean).join(' ').toLowerCase().includes(term)
-        )
-      : users;
-  }, [users, query]);
+  const resetPages = () => {
+    setCursor(null);
+    setPage(1);
+  };
 
-  // B4 — client-side sort of the current page's filtered rows
+  const goTo = (link, step) => {
+    setCursor(cursorFrom(link));
+    setPage((p) => p + step);
+  };
+
+  // B4 — client-side sort of the current page
   const sorted = useMemo(() => {
-    if (!sortConfig.key) return filtered;
-    return [...filtered].sort((a, b) => {
+    if (!sortConfig.key) return users;
+    return [...users].sort((a, b) => {
       const av = a[sortConfig.key] ?? '';
       const bv = b[sortConfig.key] ?? '';
       const cmp = String(av).localeCompare(String(bv), undefined, { numeric: true });
       return sortConfig.dir === 'asc' ? cmp : -cmp;
     });
-  }, [filtered, sortConfig]);
+  }, [users, sortConfig]);
 
   const handleSort = (key) => {
     setSortConfig((prev) => ({
       key,
       dir: prev.key === key && prev.dir === 'asc' ? 'desc' : 'asc',
     }));
-    setPage(1);
   };
 
   const handleToggle = async (user) => {
@@ -99,10 +110,7 @@ const UsersPage = () => {
     }
   };
 
-  const totalPages = Math.max(1, Math.ceil(sorted.length / PAGE_SIZE));
-  const paginated = sorted.slice((page - 1) * PAGE_SIZE, page * PAGE_SIZE);
-
-  const allPageSelected = paginated.length > 0 && paginated.every((u) => selected.has(u.user_id));
+  const allPageSelected = sorted.length > 0 && sorted.every((u) => selected.has(u.user_id));
 
   const toggleSelect = (id) => {
     setSelected((prev) => {
@@ -116,13 +124,13 @@ const UsersPage = () => {
     if (allPageSelected) {
       setSelected((prev) => {
         const next = new Set(prev);
-        paginated.forEach((u) => next.delete(u.user_id));
+        sorted.forEach((u) => next.delete(u.user_id));
         return next;
       });
     } else {
       setSelected((prev) => {
         const next = new Set(prev);
-        paginated.forEach((u) => next.add(u.user_id));
+        sorted.forEach((u) => next.add(u.user_id));
         return next;
       });
     }
@@ -156,7 +164,10 @@ const UsersPage = () => {
         <div className="panel-header">
           <div>
             <h2>Civilian Users</h2>
-            <p>Registered civilian accounts on the platform.</p>
+            <p>
+              Registered civilian accounts on the platform.
+              {totalCount > 0 && ` ${countExact ? '' : 'About '}${totalCount.toLocaleString()} result${totalCount !== 1 ? 's' : ''}`}
+            </p>
           </div>
           <button type="button" className="ghost-btn" onClick={load} disabled={loading}>
             {loading ? 'Refreshing...' : 'Refresh'}
@@ -168,7 +179,7 @@ const UsersPage = () => {
             type="search"
             placeholder="Search by name, email, or phone..."
             value={query}
-            onChange={(e) => { setQuery(e.target.value); setPage(1); }}
+            onChange={(e) => { setQuery(e.target.value); resetPages(); }}
           />
         </div>
 
@@ -207,7 +218,7 @@ const UsersPage = () => {
                   </tr>
                 </thead>
                 <tbody>
-                  {paginated.map((user) => (
+                  {sorted.map((user) => (
                     <tr key={user.user_id} className={selected.has(user.user_id) ? 'row-selected' : ''}>
                       <td>
                         <input type="checkbox" checked={selected.has(user.user_id)} onChange={() => toggleSelect(user.user_id)} />
@@ -238,11 +249,13 @@ const UsersPage = () => {
                 </tbody>
               </table>
             </div>
-            {totalPages > 1 && (
+            {(links.next || links.previous) && (
               <div className="pagination">
-                <button className="page-btn" onClick={() => setPage((p) => Math.max(1, p - 1))} disabled={page === 1}>← Prev</button>
-                <span className="page-info">Page {page} of {totalPages}</span>
-                <button className="page-btn" onClick={() => setPage((p) => Math.min(totalPages, p + 1))} disabled={page === totalPages}>Next →</button>
+                <button className="page-btn" onClick={() => goTo(links.previous, -1)} disabled={!links.previous}>← Prev</button>
+                <span className="page-info">
+                  Page {page}{countExact && ` of ${Math.max(1, Math.ceil(totalCount / PAGE_SIZE))}`}
+                </span>
+                <button className="page-btn" onClick={() => goTo(links.next, 1)} disabled={!links.next}>Next →</button>
               </div>
             )}
           </>
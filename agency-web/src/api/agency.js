@@ -1,15 +1,41 @@
 import client from './client';
+import config from '../config';
 
-export const fetchAgencyAssignments = async () => {
-  const response = await client.get('/api/agency/alerts/');
+// Delta sync: pass the previous sync_token (or 0 for a full snapshot).
+export const fetchAgencyAssignments = async (since = '0') => {
+  const response = await client.get('/api/agency/alerts/', { params: { since } });
   return response.data;
 };
 
+// Resolved/cancelled assignments, newest first.  Pass the previous page's
+// `next` URL (a keyset cursor) to fetch older ones.
+export const fetchAgencyHistory = async (next = null) => {
+  const response = await client.get(next || '/api/agency/alerts/history/');
+  return response.data;
+};
+
+// Server-Sent Events.  The stream is opened with a single-use ticket rather
+// than the access token, so a dropped connection must be reopened with a new
+// ticket; pass the last event id seen as `cursor` to replay what was missed.
+export const openAgencyStream = async (cursor = null) => {
+  if (typeof EventSource === 'undefined') return null;
+  const response = await client.post('/api/agency/stream/ticket/');
+  const params = new URLSearchParams({ ticket: response.data.ticket });
+  if (cursor) params.set('cursor', cursor);
+  return new EventSource(`${config.API_BASE_URL}/api/agency/stream/?${params}`);
+};
+
 export const fetchAssignmentLocation = async (assignmentId) => {
   const response = await client.get(`/api/agency/alerts/${assignmentId}/location/`);
   return response.data;
 };
 
+// Every delivery attempt for one assignment (list payloads carry a per-channel summary).
+export const fetchAssignmentNotifications = async (assignmentId) => {
+  const response = await client.get(`/api/agency/alerts/${assignmentId}/notifications/`);
+  return response.data;
+};
+
 export const acknowledgeAssignment = async (assignmentId, payload) => {
   const response = await client.post(
     `/api/agency/alerts/${assignmentId}/acknowledge/`,
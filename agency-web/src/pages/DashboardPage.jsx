@@ -3,7 +3,10 @@ import { Radio, Check, Bell, BellOff, AlertTriangle, LogOut } from 'lucide-react
 import { useAuth } from '../context/AuthContext';
 import {
   fetchAgencyAssignments,
+  fetchAgencyHistory,
   fetchAssignmentLocation,
+  fetchAssignmentNotifications,
+  openAgencyStream,
   acknowledgeAssignment,
   updateAssignmentStatus,
   registerWebPushSubscription,
@@ -50,6 +53,19 @@ const normalizeList = (payload) => {
   return [];
 };
 
+// Apply a delta-sync response to the cached assignment list.
+const mergeDelta = (current, payload) => {
+  const changed = normalizeList(payload?.assignments ?? payload);
+  if (payload?.full !== false) return changed;
+
+  const byId = new Map(current.map((a) => [a.assignment_id, a]));
+  (payload.removed || []).forEach((id) => byId.delete(id));
+  changed.forEach((a) => byId.set(a.assignment_id, a));
+  return [...byId.values()].sort(
+    (a, b) => new Date(b.assigned_at) - new Date(a.assigned_at)
+  );
+};
+
 /* ─── Live ticker — forces re-render every second ────────────────────────── */
 const useNow = () => {
   const [now, setNow] = useState(Date.now());
@@ -208,7 +224,9 @@ const MapPanel = ({ locationData, loading }) => {
   );
 };
 
-const ActivityLog = ({ assignment, notes = [] }) => {
+// `logs` are the full delivery attempts once loaded; until then the
+// per-channel `delivery` summary from the list payload is shown.
+const ActivityLog = ({ assignment, logs = null, notes = [] }) => {
   if (!assignment) return null;
 
   let seq = 0;
@@ -220,8 +238,14 @@ const ActivityLog = ({ assignment, notes = [] }) => {
     seq: seq++,
   });
 
-  const deliveryLogs = [...(assignment.notification_logs || [])]
-    .sort((a, b) => new Date(a.sent_at) - new Date(b.sent_at));
+  const deliveryLogs = logs
+    ? [...logs].sort((a, b) => new Date(a.sent_at) - new Date(b.sent_at))
+    : (assignment.delivery || []).map((d) => ({
+        channel_type: d.channel_type,
+        delivery_status: d.attempts > 1 ? `${d.delivery_status} after ${d.attempts} attempts` : d.delivery_status,
+        sent_at: d.last_attempt_at,
+        error_message: d.error_message,
+      }));
   deliveryLogs.forEach((log) => {
     const retryText = (log.retry_count ?? 0) > 0 ? ` (retry ${log.retry_count})` : '';
     const cleanedError = summarizeError(log.error_message);
@@ -478,6 +502,12 @@ const DashboardPage = () => {
   const [loadingList, setLoadingList]   = useState(true);
   const [listError,   setListError]     = useState('');
 
+  // Resolved tab: paged from /alerts/history/ (the live feed only carries active work)
+  const [history,        setHistory]        = useState([]);
+  const [historyNext,    setHistoryNext]    = useState(null);
+  const [historyLoading, setHistoryLoading] = useState(false);
+  const historyRef = useRef([]);
+
   const [selectedId,    setSelectedId]    = useState(null);
   const [locationData,  setLocationData]  = useState(null);
   const [loadingDetail, setLoadingDetail] = useState(false);
@@ -488,6 +518,8 @@ const DashboardPage = () => {
 
   const [newAlertToast, setNewAlertToast] = useState(0);
   const prevIdsRef     = useRef(null);
+  const syncTokenRef   = useRef('0');
+  const assignmentsRef = useRef([]);
   const toastTimerRef  = useRef(null);
 
   const [soundEnabled, setSoundEnabled]     = useState(true);
@@ -566,8 +598,10 @@ const DashboardPage = () => {
     setLoadingList(true);
     setListError('');
     try {
-      const data = await fetchAgencyAssignments();
-      const list = normalizeList(data);
+      const data = await fetchAgencyAssignments(syncTokenRef.current);
+      const list = mergeDelta(assignmentsRef.current, data);
+      syncTokenRef.current = data?.sync_token ?? '0';
+      assignmentsRef.current = list;
 
       // Detect new assignments on every poll after the first load
       if (prevIdsRef.current !== null) {
@@ -588,6 +622,7 @@ const DashboardPage = () => {
       setSelectedId((prev) => {
         if (!prev) return list[0]?.assignment_id ?? null;
         if (list.some((a) => String(a.assignment_id) === String(prev))) return prev;
+        if (historyRef.current.some((a) => String(a.assignment_id) === String(prev))) return prev;
         return list[0]?.assignment_id ?? null;
       });
     } catch (err) {
@@ -608,18 +643,103 @@ const DashboardPage = () => {
     }
   }, []);
 
+  /* ── Resolved history, one keyset page at a time ── */
+  const loadHistory = useCallback(async (next = null) => {
+    setHistoryLoading(true);
+    try {
+      const data = await fetchAgencyHistory(next);
+      const list = next ? [...historyRef.current, ...normalizeList(data)] : normalizeList(data);
+      historyRef.current = list;
+      setHistory(list);
+      setHistoryNext(data?.next ?? null);
+    } catch (err) {
+      setListError(parseApiError(err, 'Failed to load resolved alerts.'));
+    } finally {
+      setHistoryLoading(false);
+    }
+  }, []);
+
+  useEffect(() => {
+    if (activeTab === 'resolved') loadHistory();
+  }, [activeTab, loadHistory]);
+
+  // Live rows win over history rows (they may have just been closed).
+  const allAssignments = useMemo(() => {
+    const byId = new Map(history.map((a) => [a.assignment_id, a]));
+    assignments.forEach((a) => byId.set(a.assignment_id, a));
+    return [...byId.values()];
+  }, [assignments, history]);
+
   const loadAssignmentsRef = useRef(loadAssignments);
   useEffect(() => { loadAssignmentsRef.current = loadAssignments; }, [loadAssignments]);
 
+  // While the event stream is connected, polling only reconciles every 5 minutes.
+  const streamLiveRef = useRef(false);
+  const lastPollRef   = useRef(0);
+
   useEffect(() => {
     loadAssignmentsRef.current();
+    lastPollRef.current = Date.now();
     const id = setInterval(() => {
       if (throttledUntilRef.current && Date.now() < throttledUntilRef.current) return;
+      if (streamLiveRef.current && Date.now() - lastPollRef.current < 300_000) return;
+      lastPollRef.current = Date.now();
       loadAssignmentsRef.current();
     }, 30_000);
     return () => clearInterval(id);
   }, []);
 
+  /* ── Live updates over SSE ── */
+  const selectedIdRef = useRef(null);
+  useEffect(() => { selectedIdRef.current = selectedId; }, [selectedId]);
+
+  useEffect(() => {
+    let source = null;
+    let closed = false;
+    let retryTimer = null;
+    let lastEventId = null;
+
+    const refresh = (event) => {
+      if (event?.lastEventId) lastEventId = event.lastEventId;
+      loadAssignmentsRef.current();
+    };
+
+    // Tickets are single-use, so the browser's own reconnect would be
+    // refused: close on error and reopen with a fresh ticket instead.
+    const connect = async () => {
+      try {
+        source = await openAgencyStream(lastEventId);
+      } catch {
+        source = null;
+      }
+      if (closed) { source?.close(); return; }
+      if (!source) { retryTimer = setTimeout(connect, 10_000); return; }
+
+      source.onopen = () => { streamLiveRef.current = true; };
+      source.onerror = () => {
+        streamLiveRef.current = false;
+        source.close();
+        retryTimer = setTimeout(connect, 3_000);
+      };
+      source.addEventListener('assignment.created', refresh);
+      source.addEventListener('alert.status', refresh);
+      source.addEventListener('reset', refresh);
+      source.addEventListener('alert.location', (event) => {
+        lastEventId = event.lastEventId || lastEventId;
+        const data = JSON.parse(event.data);
+        if (String(data.assignment_id) !== String(selectedIdRef.current)) return;
+        setLocationData((prev) => ({ ...prev, ...data }));
+      });
+    };
+
+    connect();
+    return () => {
+      closed = true;
+      clearTimeout(retryTimer);
+      source?.close();
+    };
+  }, []);
+
   /* ── Register browser Web Push subscription ── */
   useEffect(() => {
     if (!('serviceWorker' in navigator) || !('PushManager' in window)) return;
@@ -660,7 +780,22 @@ const DashboardPage = () => {
       .finally(() => setLoadingDetail(false));
   }, [selectedId]);
 
-  const selected = assignments.find((a) => String(a.assignment_id) === String(selectedId)) || null;
+  const selected = allAssignments.find((a) => String(a.assignment_id) === String(selectedId)) || null;
+
+  /* ── Full delivery log for the selected card; refetched when its summary changes ── */
+  const [deliveryLogs, setDeliveryLogs] = useState(null);
+  const deliveryKey = (selected?.delivery || [])
+    .map((d) => `${d.channel_type}:${d.attempts}:${d.delivery_status}`)
+    .join('|');
+  useEffect(() => {
+    setDeliveryLogs(null);
+    if (!selectedId) return undefined;
+    let cancelled = false;
+    fetchAssignmentNotifications(selectedId)
+      .then((logs) => { if (!cancelled) setDeliveryLogs(logs); })
+      .catch(() => {});
+    return () => { cancelled = true; };
+  }, [selectedId, deliveryKey]);
 
   /* ── Status update ── */
   const handleStatus = async (nextStatus) => {
@@ -688,7 +823,7 @@ const DashboardPage = () => {
   const throttleSecsLeft = throttledUntil ? Math.max(0, Math.ceil((throttledUntil - now) / 1000)) : 0;
 
   const displayedAssignments = useMemo(() => {
-    let list = [...assignments];
+    let list = [...allAssignments];
     if (activeTab === 'resolved') {
       list = list.filter((a) => ['RESOLVED', 'CANCELLED'].includes((a.alert_status || '').toUpperCase()));
     } else {
@@ -710,7 +845,7 @@ const DashboardPage = () => {
       return pa - pb;
     });
     return list;
-  }, [assignments, activeTab, priorityFilter, queueSearch]);
+  }, [allAssignments, activeTab, priorityFilter, queueSearch]);
 
   // Keyboard arrow-key navigation through queue
   useEffect(() => {
@@ -835,7 +970,9 @@ const DashboardPage = () => {
             <div className="queue-empty" style={{ color: '#ff6b6b' }}>{listError}</div>
           ) : displayedAssignments.length === 0 ? (
             <div className="queue-empty">
-              {activeTab === 'resolved' ? 'No resolved alerts' : 'No active alerts'}
+              {activeTab === 'resolved'
+                ? (historyLoading ? 'Loading resolved alerts…' : 'No resolved alerts')
+                : 'No active alerts'}
             </div>
           ) : (
             displayedAssignments.map((item) => (
@@ -848,6 +985,15 @@ const DashboardPage = () => {
               />
             ))
           )}
+          {activeTab === 'resolved' && historyNext && !listError && (
+            <button
+              className="flow-action-btn secondary queue-load-more"
+              onClick={() => loadHistory(historyNext)}
+              disabled={historyLoading}
+            >
+              {historyLoading ? 'Loading…' : 'Load older'}
+            </button>
+          )}
         </div>
       </aside>
 
@@ -1064,7 +1210,7 @@ const DashboardPage = () => {
               </div>
 
               {/* ── Activity log ── */}
-              <ActivityLog assignment={selected} notes={notesMap[selectedId] || []} />
+              <ActivityLog assignment={selected} logs={deliveryLogs} notes={notesMap[selectedId] || []} />
 
               {/* ── Dispatcher notes ── */}
               <div className="notes-section">
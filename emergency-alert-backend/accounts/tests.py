@@ -5,6 +5,8 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import User
 from agencies.models import SecurityAgency, AgencyUser
+from alerts.models import EmergencyAlert, AlertSearchDocument
+from alerts.search import index_alerts
 
 
 def create_user(email='user@test.com', password='password123', phone='+2348011111111', full_name='Test User'):
@@ -173,6 +175,12 @@ class ProfileViewTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['full_name'], 'Updated Name')
 
+    def test_rename_rewrites_search_documents(self):
+        alert = EmergencyAlert.objects.create(user=self.user, alert_type='BANDITRY', priority_level='HIGH')
+        index_alerts([alert.alert_id])
+        self.client.put(self.url, {'full_name': 'Chidi Eze'}, **auth_header(self.user))
+        self.assertEqual(AlertSearchDocument.objects.get(alert=alert).body, 'Chidi Eze')
+
     def test_profile_view_for_agency_user_includes_agency_metadata(self):
         agency_user = create_agency_user(email='agencyprofile@test.com')
         response = self.client.get(self.url, **auth_header(agency_user))
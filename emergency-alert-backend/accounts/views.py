@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -7,6 +8,10 @@ from rest_framework_simplejwt.exceptions import TokenError
 
 from .models import User
 from alert_system.api_responses import error_response, derive_detail_from_errors
+from admin_panel import rollups
+from alerts.models import AlertAssignment, EmergencyAlert
+from alerts.search import index_user_alerts
+from alerts.sync import record_tombstones
 from .serializers import (
     UserRegistrationSerializer,
     UserLoginSerializer,
@@ -104,7 +109,10 @@ class ProfileView(APIView):
             request.user, data=request.data, partial=True
         )
         if serializer.is_valid():
+            renamed = serializer.validated_data.get('full_name', request.user.full_name) != request.user.full_name
             serializer.save()
+            if renamed:
+                index_user_alerts(request.user)
             return Response(serializer.data, status=status.HTTP_200_OK)
         return error_response(
             detail=derive_detail_from_errors(serializer.errors),
@@ -198,5 +206,11 @@ class DeleteAccountView(APIView):
                 status_code=status.HTTP_400_BAD_REQUEST,
                 errors={'password': ['Incorrect password.']},
             )
-        request.user.delete()
+        # Agency dashboards drop the cascaded assignments on their next delta
+        # sync; report rollups drop the deleted alerts' rows right away.
+        with transaction.atomic():
+            touched_days = rollups.days_touched_by(EmergencyAlert.objects.filter(user=request.user))
+            record_tombstones(AlertAssignment.objects.filter(alert__user=request.user))
+            request.user.delete()
+            rollups.recompute_days(*touched_days)
         return Response({'message': 'Account deleted successfully.'}, status=status.HTTP_200_OK)
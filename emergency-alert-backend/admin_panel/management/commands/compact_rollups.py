@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from admin_panel.rollups import compact_rollups
+from admin_panel.sketches import rebuild_sketches
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold closed days into the reporting rollup tables and recompute days '
+        'whose alerts changed since the last run. Run from cron, or with --loop '
+        'as a standalone worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help=(
+                'Recompute every day, and the latency sketches, from the source tables '
+                '(first pass only with --loop).'
+            ),
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep compacting instead of exiting after one pass.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=300.0,
+            help='Seconds between passes when --loop is set (default: 300).',
+        )
+
+    def handle(self, *args, **options):
+        rebuild = options['rebuild']
+        while True:
+            days = compact_rollups(rebuild=rebuild)
+            if days is None:
+                rebuild_sketches()
+                self.stdout.write(self.style.SUCCESS('Rebuilt all rollups and latency sketches.'))
+            elif days:
+                self.stdout.write(self.style.SUCCESS(f'Compacted {days} day(s).'))
+            rebuild = False
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
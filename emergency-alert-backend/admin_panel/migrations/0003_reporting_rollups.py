@@ -0,0 +1,60 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0002_systemsetting'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupCheckpoint',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('compacted_through', models.DateField()),
+                ('last_run', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='AlertDailyRollup',
+            fields=[
+                ('rollup_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('alert_type', models.CharField(max_length=20)),
+                ('status', models.CharField(max_length=15)),
+                ('priority_level', models.CharField(max_length=10)),
+                ('state', models.CharField(blank=True, default='', max_length=100)),
+                ('count', models.IntegerField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'alert_type', 'status', 'priority_level', 'state'), name='alert_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='DeliveryDailyRollup',
+            fields=[
+                ('rollup_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('channel_type', models.CharField(max_length=5)),
+                ('delivery_status', models.CharField(max_length=10)),
+                ('count', models.IntegerField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'channel_type', 'delivery_status'), name='delivery_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ResponseDailyRollup',
+            fields=[
+                ('rollup_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('agency_type', models.CharField(max_length=20)),
+                ('responses', models.IntegerField()),
+                ('response_seconds', models.FloatField()),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'agency_type'), name='response_rollup_key')],
+            },
+        ),
+    ]
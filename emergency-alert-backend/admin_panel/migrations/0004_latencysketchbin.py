@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_reporting_rollups'),
+        ('agencies', '0004_agencyevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LatencySketchBin',
+            fields=[
+                ('bin_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('metric', models.CharField(choices=[('response', 'Assignment to acknowledgment'), ('delivery', 'Assignment to notification delivery')], max_length=10)),
+                ('bin', models.IntegerField()),
+                ('count', models.BigIntegerField()),
+                ('agency', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='agencies.securityagency')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('day', 'agency', 'metric', 'bin'), name='latency_sketch_bin_key')],
+            },
+        ),
+    ]
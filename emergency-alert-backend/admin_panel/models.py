@@ -1,5 +1,8 @@
 from django.db import models
-from django.db.models import AutoField, CharField, TextField, OneToOneField, CASCADE, GenericIPAddressField, DateTimeField
+from django.db.models import (
+    AutoField, BigAutoField, CharField, TextField, IntegerField, FloatField, OneToOneField, CASCADE,
+    GenericIPAddressField, DateField, DateTimeField, BigIntegerField, ForeignKey,
+)
 
 
 class SystemAdmin(models.Model):
@@ -30,3 +33,85 @@ class SystemSetting(models.Model):
 
     def __str__(self):
         return f"{self.key} = {self.value}"
+
+
+# ─── Reporting rollups (maintained by admin_panel.rollups) ─────────────────────
+
+class AlertDailyRollup(models.Model):
+    """Alerts created per UTC day, by type, current status, priority and state."""
+    rollup_id = BigAutoField(primary_key=True)
+    day = DateField()
+    alert_type = CharField(max_length=20)
+    status = CharField(max_length=15)
+    priority_level = CharField(max_length=10)
+    state = CharField(max_length=100, blank=True, default='')
+    count = IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'alert_type', 'status', 'priority_level', 'state'],
+                name='alert_rollup_key',
+            ),
+        ]
+
+
+class DeliveryDailyRollup(models.Model):
+    """Notification attempts per UTC day, by channel and delivery status."""
+    rollup_id = BigAutoField(primary_key=True)
+    day = DateField()
+    channel_type = CharField(max_length=5)
+    delivery_status = CharField(max_length=10)
+    count = IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'channel_type', 'delivery_status'], name='delivery_rollup_key'),
+        ]
+
+
+class ResponseDailyRollup(models.Model):
+    """Agency responses per UTC day of response, by agency type, with the summed response time."""
+    rollup_id = BigAutoField(primary_key=True)
+    day = DateField()
+    agency_type = CharField(max_length=20)
+    responses = IntegerField()
+    response_seconds = FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'agency_type'], name='response_rollup_key'),
+        ]
+
+
+class LatencySketchBin(models.Model):
+    """One DDSketch bin of an agency's daily latency sketch (see admin_panel.sketches)."""
+    METRICS = [
+        ('response', 'Assignment to acknowledgment'),
+        ('delivery', 'Assignment to notification delivery'),
+    ]
+
+    bin_id = BigAutoField(primary_key=True)
+    day = DateField()
+    agency = ForeignKey('agencies.SecurityAgency', on_delete=CASCADE, related_name='+')
+    metric = CharField(max_length=10, choices=METRICS)
+    bin = IntegerField()
+    count = BigIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['day', 'agency', 'metric', 'bin'], name='latency_sketch_bin_key'),
+        ]
+
+
+class RollupCheckpoint(models.Model):
+    """
+    Progress of the rollup compactor: days before compacted_through are in
+    the rollup tables, and alerts changed after last_run still need a pass.
+    """
+    name = CharField(max_length=50, primary_key=True)
+    compacted_through = DateField()
+    last_run = DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} through {self.compacted_through}"
@@ -0,0 +1,133 @@
+"""
+Shared cache for admin analytics payloads.
+
+Several admins opening the reports page together used to recompute the same
+payload side by side.  cached_report() keeps one copy per report key:
+
+  fresh   (younger than ADMIN_REPORT_CACHE_TTL_S)   served as is        HIT
+  stale   (up to ADMIN_REPORT_STALE_S older)        served as is, and   STALE
+          one background thread recomputes it
+  missing or expired                                computed inline     MISS
+
+Computations are single-flight.  Within a process, concurrent requests for
+the same key wait on the one in progress (COALESCED).  Across processes a
+cache.add() lock elects one computer and the others poll the cache for its
+result, computing themselves only if it does not arrive within
+LOCK_TIMEOUT_S.  The cross-process part needs the shared cache configured
+in settings.CACHES; with a per-process cache every process computes on its
+own.  The status is reported in the X-Cache-Status header.
+"""
+import logging
+import time
+from threading import Event, Lock, Thread
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from rest_framework.response import Response
+
+logger = logging.getLogger(__name__)
+
+HIT, STALE, MISS, COALESCED = 'HIT', 'STALE', 'MISS', 'COALESCED'
+HEADER = 'X-Cache-Status'
+
+CACHE_KEY = 'admin_report:{}'
+LOCK_KEY = 'admin_report_lock:{}'
+# Longest a computation may hold the cross-process lock.
+LOCK_TIMEOUT_S = 30
+WAIT_POLL_S = 0.05
+
+
+class _Flight:
+    def __init__(self):
+        self.done = Event()
+        self.payload = None
+        self.error = None
+
+
+_flights = {}
+_flights_lock = Lock()
+
+
+def _store(key, compute):
+    payload = compute()
+    cache.set(
+        CACHE_KEY.format(key), (time.time(), payload),
+        settings.ADMIN_REPORT_CACHE_TTL_S + settings.ADMIN_REPORT_STALE_S,
+    )
+    return payload
+
+
+def _compute_once(key, compute, computed_before):
+    """Compute under the cross-process lock, or wait for whoever holds it."""
+    lock = LOCK_KEY.format(key)
+    if cache.add(lock, 1, LOCK_TIMEOUT_S):
+        try:
+            return _store(key, compute), MISS
+        finally:
+            cache.delete(lock)
+    deadline = time.monotonic() + LOCK_TIMEOUT_S
+    while time.monotonic() < deadline:
+        time.sleep(WAIT_POLL_S)
+        entry = cache.get(CACHE_KEY.format(key))
+        if entry is not None and entry[0] > computed_before:
+            return entry[1], COALESCED
+    return _store(key, compute), MISS
+
+
+def _single_flight(key, compute, computed_before=0.0):
+    """Return (payload, status) with at most one computation per key in this process."""
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return flight.payload, COALESCED
+    try:
+        flight.payload, cache_status = _compute_once(key, compute, computed_before)
+        return flight.payload, cache_status
+    except Exception as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+        flight.done.set()
+
+
+def _refresh(key, compute, computed_at):
+    try:
+        _single_flight(key, compute, computed_at)
+    except Exception:
+        logger.exception(f"Background refresh of report {key!r} failed")
+    finally:
+        close_old_connections()
+
+
+def cached_report(key, compute):
+    """Return (payload, cache status) for the report `key`, computed by compute()."""
+    entry = cache.get(CACHE_KEY.format(key))
+    if entry is not None:
+        computed_at, payload = entry
+        age = time.time() - computed_at
+        if age < settings.ADMIN_REPORT_CACHE_TTL_S:
+            return payload, HIT
+        if age < settings.ADMIN_REPORT_CACHE_TTL_S + settings.ADMIN_REPORT_STALE_S:
+            if key not in _flights:
+                Thread(
+                    target=_refresh, args=(key, compute, computed_at),
+                    daemon=True, name=f'report-refresh-{key}',
+                ).start()
+            return payload, STALE
+    return _single_flight(key, compute)
+
+
+def cached_report_response(key, compute):
+    payload, cache_status = cached_report(key, compute)
+    response = Response(payload)
+    response[HEADER] = cache_status
+    return response
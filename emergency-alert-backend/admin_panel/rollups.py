@@ -0,0 +1,264 @@
+"""
+Daily rollups behind the admin reports.
+
+Reports used to rescan EmergencyAlert, AlertAssignment and NotificationLog
+on every request.  compact_rollups() folds whole days (TIME_ZONE, i.e. UTC)
+into three small tables instead:
+
+  AlertDailyRollup     alerts created per day x type x status x priority x state
+  DeliveryDailyRollup  notification attempts per day x channel x delivery status
+  ResponseDailyRollup  responses and summed response time per day x agency type
+
+Readers add the rollups up (O(days), not O(rows)) and combine them with a
+live aggregate over the tail: rows from the first day not compacted yet,
+normally just today, read through the created_at / sent_at / response_time
+indexes.  Before the first compaction the tail is the whole table, so
+reports are always complete.
+
+The compactor runs periodically (`manage.py compact_rollups --loop`, or
+from cron).  Each run folds in the days that closed since the previous one
+and recomputes every earlier day holding an alert whose updated_at moved
+(status changes), so the rollups trail a status change by at most one run.
+Notification logs and response times are written once and need no such
+pass.  Deleted rows leave no updated_at behind, so code deleting alerts
+recomputes the days they touched (days_touched_by / recompute_days, as
+account deletion does); --rebuild recomputes every day, e.g. after other
+bulk deletions.
+"""
+from collections import Counter
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.db import transaction
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from alerts.models import EmergencyAlert, AlertAssignment
+from notifications.models import NotificationLog
+
+from .models import AlertDailyRollup, DeliveryDailyRollup, ResponseDailyRollup, RollupCheckpoint
+
+CHECKPOINT = 'daily'
+
+# A row stamped just before a run may commit just after it.  Days are closed
+# only this long after midnight, and changed alerts are re-read this far
+# back, so such rows are picked up by the next run.
+SETTLE = timedelta(minutes=5)
+
+RESPONSE_DURATION = ExpressionWrapper(F('response_time') - F('assigned_at'), output_field=DurationField())
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def _in_range(queryset, field, start=None, end=None):
+    if start is not None:
+        queryset = queryset.filter(**{f'{field}__gte': start})
+    if end is not None:
+        queryset = queryset.filter(**{f'{field}__lt': end})
+    return queryset
+
+
+# ─── Compaction ───────────────────────────────────────────────────────────────
+
+def _alert_rollups(start, end, days):
+    groups = (
+        _in_range(EmergencyAlert.objects, 'created_at', start, end)
+        .annotate(day=TruncDate('created_at'), state=Coalesce('location__state', Value('')))
+        .values('day', 'alert_type', 'status', 'priority_level', 'state')
+        .annotate(count=Count('alert_id'))
+        .order_by()
+    )
+    return [AlertDailyRollup(**group) for group in groups if days is None or group['day'] in days]
+
+
+def _delivery_rollups(start, end, days):
+    groups = (
+        _in_range(NotificationLog.objects, 'sent_at', start, end)
+        .annotate(day=TruncDate('sent_at'))
+        .values('day', 'channel_type', 'delivery_status')
+        .annotate(count=Count('log_id'))
+        .order_by()
+    )
+    return [DeliveryDailyRollup(**group) for group in groups if days is None or group['day'] in days]
+
+
+def _response_rollups(start, end, days):
+    groups = (
+        _in_range(AlertAssignment.objects.filter(response_time__isnull=False), 'response_time', start, end)
+        .annotate(day=TruncDate('response_time'))
+        .values('day', 'agency__agency_type')
+        .annotate(responses=Count('assignment_id'), total=Sum(RESPONSE_DURATION))
+        .order_by()
+    )
+    return [
+        ResponseDailyRollup(
+            day=group['day'],
+            agency_type=group['agency__agency_type'],
+            responses=group['responses'],
+            response_seconds=group['total'].total_seconds(),
+        )
+        for group in groups if days is None or group['day'] in days
+    ]
+
+
+def _replace(model, days, rows):
+    stale = model.objects.all() if days is None else model.objects.filter(day__in=days)
+    stale.delete()
+    model.objects.bulk_create(rows, batch_size=1000)
+
+
+def compact_rollups(now=None, rebuild=False):
+    """
+    Bring the rollup tables up to date; returns the number of days
+    recomputed (None after a full rebuild).
+    """
+    now = now or timezone.now()
+    # First day that stays in the live tail.
+    cutoff = timezone.localdate(now - SETTLE)
+    end = day_start(cutoff)
+
+    with transaction.atomic():
+        checkpoint = RollupCheckpoint.objects.select_for_update().filter(name=CHECKPOINT).first()
+        if checkpoint is None or rebuild:
+            alert_days = new_days = start = None
+        else:
+            first_new = checkpoint.compacted_through
+            new_days = {first_new + timedelta(days=n) for n in range((cutoff - first_new).days)}
+            changed_days = set(
+                EmergencyAlert.objects
+                .filter(updated_at__gte=checkpoint.last_run - SETTLE, created_at__lt=day_start(first_new))
+                .annotate(day=TruncDate('created_at'))
+                .values_list('day', flat=True)
+                .distinct()
+            )
+            alert_days = new_days | changed_days
+            start = day_start(min(alert_days)) if alert_days else None
+
+        if alert_days is None or alert_days:
+            _replace(AlertDailyRollup, alert_days, _alert_rollups(start, end, alert_days))
+        if new_days is None or new_days:
+            new_start = None if new_days is None else day_start(min(new_days))
+            _replace(DeliveryDailyRollup, new_days, _delivery_rollups(new_start, end, new_days))
+            _replace(ResponseDailyRollup, new_days, _response_rollups(new_start, end, new_days))
+
+        RollupCheckpoint.objects.update_or_create(
+            name=CHECKPOINT, defaults={'compacted_through': cutoff, 'last_run': now},
+        )
+    return None if alert_days is None else len(alert_days)
+
+
+def days_touched_by(alerts):
+    """(alert, delivery, response) days holding rows of an alert queryset; call before deleting it."""
+    def days(queryset, field):
+        return set(queryset.annotate(day=TruncDate(field)).values_list('day', flat=True).distinct())
+
+    return (
+        days(alerts, 'created_at'),
+        days(NotificationLog.objects.filter(assignment__alert__in=alerts), 'sent_at'),
+        days(AlertAssignment.objects.filter(alert__in=alerts, response_time__isnull=False), 'response_time'),
+    )
+
+
+def recompute_days(alert_days, delivery_days, response_days):
+    """Recompute already compacted days from the source tables, e.g. after a deletion."""
+    with transaction.atomic():
+        checkpoint = RollupCheckpoint.objects.select_for_update().filter(name=CHECKPOINT).first()
+        if checkpoint is None:
+            return
+        cutoff = checkpoint.compacted_through
+        end = day_start(cutoff)
+        for model, build, days in (
+            (AlertDailyRollup, _alert_rollups, alert_days),
+            (DeliveryDailyRollup, _delivery_rollups, delivery_days),
+            (ResponseDailyRollup, _response_rollups, response_days),
+        ):
+            # Later days are still in the live tail.
+            days = {day for day in days if day < cutoff}
+            if days:
+                _replace(model, days, build(day_start(min(days)), end, days))
+
+
+# ─── Reading ──────────────────────────────────────────────────────────────────
+
+def tail_start():
+    """Start of the live tail, or None when nothing has been compacted yet."""
+    compacted_through = (
+        RollupCheckpoint.objects.filter(name=CHECKPOINT)
+        .values_list('compacted_through', flat=True).first()
+    )
+    return None if compacted_through is None else day_start(compacted_through)
+
+
+def checkpoint_state():
+    """(compacted_through, last_run) of the last compaction, or None."""
+    return (
+        RollupCheckpoint.objects.filter(name=CHECKPOINT)
+        .values_list('compacted_through', 'last_run').first()
+    )
+
+
+def alert_totals(now, tail=None):
+    """
+    Alert counts over all time and the last 7 / 30 calendar days (today
+    included), plus all-time Counters per status, alert_type and
+    priority_level.  Two grouped queries.
+    """
+    today = timezone.localdate(now)
+    windows = {'last_7d': today - timedelta(days=6), 'last_30d': today - timedelta(days=29)}
+    keys = ('status', 'alert_type', 'priority_level')
+
+    rolled = AlertDailyRollup.objects.values(*keys).annotate(
+        all_time=Sum('count'),
+        **{name: Sum('count', filter=Q(day__gte=first)) for name, first in windows.items()},
+    ).order_by()
+    live = _in_range(EmergencyAlert.objects, 'created_at', tail).values(*keys).annotate(
+        all_time=Count('alert_id'),
+        **{name: Count('alert_id', filter=Q(created_at__gte=day_start(first))) for name, first in windows.items()},
+    ).order_by()
+
+    totals = Counter({'all_time': 0, **{name: 0 for name in windows}})
+    by_key = {key: Counter() for key in keys}
+    for group in chain(rolled, live):
+        for name in totals:
+            totals[name] += group[name] or 0
+        for key in keys:
+            by_key[key][group[key]] += group['all_time']
+    return {'totals': dict(totals), **by_key}
+
+
+def delivery_totals(tail=None):
+    """Counter of notification attempts per (channel_type, delivery_status)."""
+    rolled = DeliveryDailyRollup.objects.values('channel_type', 'delivery_status').annotate(
+        n=Sum('count'),
+    ).order_by()
+    live = _in_range(NotificationLog.objects, 'sent_at', tail).values('channel_type', 'delivery_status').annotate(
+        n=Count('log_id'),
+    ).order_by()
+    counts = Counter()
+    for group in chain(rolled, live):
+        counts[group['channel_type'], group['delivery_status']] += group['n']
+    return counts
+
+
+def average_response_seconds(tail=None):
+    """Mean seconds from assignment to response, per agency type that has responded."""
+    rolled = ResponseDailyRollup.objects.values('agency_type').annotate(
+        n=Sum('responses'), seconds=Sum('response_seconds'),
+    ).order_by()
+    live = (
+        _in_range(AlertAssignment.objects.filter(response_time__isnull=False), 'response_time', tail)
+        .values('agency__agency_type')
+        .annotate(n=Count('assignment_id'), total=Sum(RESPONSE_DURATION))
+        .order_by()
+    )
+    responses, seconds = Counter(), Counter()
+    for group in rolled:
+        responses[group['agency_type']] += group['n']
+        seconds[group['agency_type']] += group['seconds']
+    for group in live:
+        responses[group['agency__agency_type']] += group['n']
+        seconds[group['agency__agency_type']] += group['total'].total_seconds()
+    return {agency_type: round(seconds[agency_type] / n) for agency_type, n in responses.items()}
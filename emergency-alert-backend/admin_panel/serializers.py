@@ -5,6 +5,9 @@ from accounts.models import User
 from notifications.models import NotificationLog
 from .models import SystemSetting
 
+# Alert statuses counted as an agency's active alerts.
+ACTIVE_ALERT_STATUSES = ('DISPATCHED', 'ACKNOWLEDGED', 'RESPONDING')
+
 
 # ─── Agency ───────────────────────────────────────────────────────────────────
 
@@ -97,13 +100,17 @@ class AgencyListSerializer(serializers.ModelSerializer):
             'operational_capacity', 'staff_count', 'active_alert_count',
         ]
 
+    # Lists annotate both counts (admin_panel.views.with_agency_counts); a
+    # freshly saved agency falls back to counting.
     def get_staff_count(self, obj):
+        if hasattr(obj, 'staff_total'):
+            return obj.staff_total
         return obj.staff.count()
 
     def get_active_alert_count(self, obj):
-        return obj.assignments.filter(
-            alert__status__in=['DISPATCHED', 'ACKNOWLEDGED', 'RESPONDING']
-        ).count()
+        if hasattr(obj, 'active_alert_total'):
+            return obj.active_alert_total
+        return obj.assignments.filter(alert__status__in=ACTIVE_ALERT_STATUSES).count()
 
 
 class AgencyDetailSerializer(AgencyListSerializer):
@@ -213,6 +220,8 @@ class CivilianUserSerializer(serializers.ModelSerializer):
         fields = ['user_id', 'full_name', 'email', 'phone_number', 'date_joined', 'alert_count', 'is_active']
 
     def get_alert_count(self, obj):
+        if hasattr(obj, 'alert_total'):
+            return obj.alert_total
         return obj.alerts.count()
 
 
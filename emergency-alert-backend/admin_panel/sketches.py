@@ -0,0 +1,160 @@
+"""
+Latency percentiles from mergeable DDSketch histograms.
+
+A mean hides the slow tail, and exact percentiles would need every
+observation.  DDSketch (Masson, Rim & Lee, VLDB 2019) maps a value x > 0 to
+the bin ceil(log_gamma(x)) with gamma = (1 + a) / (1 - a); any quantile read
+back from the bin counts is within relative error a of the true one.  Values
+are clamped to [MIN_SECONDS, MAX_SECONDS], so a sketch never has more than
+about a thousand bins however many values it holds, and two sketches merge
+by adding their bin counts.
+
+The bins are stored as rows, one per (day, agency, metric, bin):
+
+  response  assignment -> acknowledgment, recorded by the acknowledge view
+  delivery  assignment -> successful notification attempt, recorded by the
+            notification dispatcher
+
+Recording is an atomic counter increment, so every web and worker process
+writes into the same sketch.  A percentile over any set of days and
+agencies is one grouped SUM of the matching bins followed by a merge.
+"""
+import math
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, Min, Q, Sum
+from django.utils import timezone
+
+from .models import LatencySketchBin
+
+RELATIVE_ACCURACY = 0.01
+MIN_SECONDS = 0.01
+MAX_SECONDS = 30 * 24 * 3600.0
+
+RESPONSE = 'response'
+DELIVERY = 'delivery'
+
+QUANTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+
+class DDSketch:
+    gamma = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    _log_gamma = math.log(gamma)
+
+    def __init__(self, bins=None):
+        self.bins = defaultdict(int, bins or {})
+
+    @classmethod
+    def key(cls, value):
+        value = min(max(value, MIN_SECONDS), MAX_SECONDS)
+        return math.ceil(math.log(value) / cls._log_gamma)
+
+    @classmethod
+    def value(cls, key):
+        # Midpoint (in relative terms) of the bin (gamma^(key-1), gamma^key].
+        return 2 * cls.gamma ** key / (cls.gamma + 1)
+
+    @property
+    def count(self):
+        return sum(self.bins.values())
+
+    def add(self, value, count=1):
+        self.bins[self.key(value)] += count
+
+    def merge(self, other):
+        for key, count in other.bins.items():
+            self.bins[key] += count
+        return self
+
+    def quantile(self, q):
+        total = self.count
+        if not total:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return self.value(key)
+        return self.value(max(self.bins))
+
+    def summary(self):
+        return {
+            'count': self.count,
+            **{name: _round(self.quantile(q)) for name, q in QUANTILES.items()},
+        }
+
+
+def _round(seconds):
+    return None if seconds is None else round(seconds, 1)
+
+
+def record(metric, agency_id, seconds, at=None):
+    """Add one observation to the agency's sketch for the day of `at` (default: now)."""
+    key = dict(
+        day=timezone.localdate(at or timezone.now()),
+        agency_id=agency_id, metric=metric, bin=DDSketch.key(seconds),
+    )
+    if LatencySketchBin.objects.filter(**key).update(count=F('count') + 1):
+        return
+    try:
+        with transaction.atomic():
+            LatencySketchBin.objects.create(count=1, **key)
+    except IntegrityError:
+        # Another process created the bin first.
+        LatencySketchBin.objects.filter(**key).update(count=F('count') + 1)
+
+
+def sketches(metric, group_by='agency__agency_type', **filters):
+    """{group: DDSketch} merged over the bins matching filters (e.g. day__gte=...)."""
+    merged = defaultdict(DDSketch)
+    rows = (
+        LatencySketchBin.objects.filter(metric=metric, **filters)
+        .values_list(group_by, 'bin')
+        .annotate(n=Sum('count'))
+        .order_by()
+    )
+    for group, key, count in rows:
+        merged[group].bins[key] += count
+    return dict(merged)
+
+
+def percentiles(metric, group_by='agency__agency_type', **filters):
+    """{group: {'count', 'p50', 'p90', 'p99'}} in seconds."""
+    return {group: sketch.summary() for group, sketch in sketches(metric, group_by, **filters).items()}
+
+
+def rebuild_sketches():
+    """Recompute every sketch from the assignment and notification tables."""
+    from alerts.models import AlertAssignment
+    from notifications.models import NotificationLog
+
+    merged = defaultdict(DDSketch)
+    responded = (
+        AlertAssignment.objects.filter(response_time__isnull=False)
+        .values_list('agency_id', 'assigned_at', 'response_time')
+    )
+    for agency_id, assigned_at, response_time in responded.iterator(chunk_size=2000):
+        day = timezone.localdate(response_time)
+        merged[day, agency_id, RESPONSE].add((response_time - assigned_at).total_seconds())
+    # A dispatch is the first successful attempt per channel; attempts logged
+    # after the acknowledgment notify the civilian, not the agency.
+    delivered = (
+        NotificationLog.objects.filter(delivery_status='SENT')
+        .filter(Q(assignment__response_time__isnull=True) | Q(sent_at__lte=F('assignment__response_time')))
+        .values_list('assignment_id', 'channel_type', 'assignment__agency_id', 'assignment__assigned_at')
+        .annotate(first=Min('sent_at'))
+        .order_by()
+    )
+    for _, _, agency_id, assigned_at, sent_at in delivered.iterator(chunk_size=2000):
+        day = timezone.localdate(sent_at)
+        merged[day, agency_id, DELIVERY].add((sent_at - assigned_at).total_seconds())
+
+    with transaction.atomic():
+        LatencySketchBin.objects.all().delete()
+        LatencySketchBin.objects.bulk_create([
+            LatencySketchBin(day=day, agency_id=agency_id, metric=metric, bin=key, count=count)
+            for (day, agency_id, metric), sketch in merged.items()
+            for key, count in sketch.bins.items()
+        ], batch_size=1000)
@@ -1,5 +1,15 @@
+import csv
+from datetime import timedelta
+import io
+import json
+import random
+import threading
+import time
 from unittest.mock import patch
+from django.test import override_settings
 from django.urls import reverse
+from django.core.cache import cache
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -7,8 +17,14 @@ from rest_framework_simplejwt.tokens import RefreshToken
 from accounts.models import User
 from agencies.models import SecurityAgency, AgencyUser
 from alerts.models import EmergencyAlert, Location, AlertAssignment
+from alerts.search import index_alerts
 from notifications.models import NotificationLog
 
+from admin_panel.models import AlertDailyRollup, LatencySketchBin, RollupCheckpoint
+from admin_panel import exports, report_cache, sketches
+from admin_panel.pagination import AdminCursorPagination
+from admin_panel.rollups import compact_rollups
+
 
 # ─── Helpers ──────────────────────────────────────────────────────────────────
 
@@ -91,6 +107,47 @@ class DashboardTests(APITestCase):
         self.assertEqual(resp.data['totals']['agencies_total'], 1)
         self.assertEqual(resp.data['totals']['civilian_users'], 1)
 
+    def test_unchanged_dashboard_returns_304(self):
+        etag = self.client.get(reverse('admin-dashboard'), **auth(self.admin))['ETag']
+        resp = self.client.get(reverse('admin-dashboard'), HTTP_IF_NONE_MATCH=etag, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        make_alert(self.user, alert_type='OTHER')
+        resp = self.client.get(reverse('admin-dashboard'), HTTP_IF_NONE_MATCH=etag, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['totals']['alerts_all_time'], 2)
+
+    def test_dashboard_breakdown_and_average_response(self):
+        make_alert(self.user, alert_type='FIRE_INCIDENCE', alert_status='RESOLVED')
+        agency = SecurityAgency.objects.get()
+        for minutes in (2, 4):
+            assignment = AlertAssignment.objects.create(alert=make_alert(self.user), agency=agency)
+            AlertAssignment.objects.filter(pk=assignment.pk).update(
+                response_time=assignment.assigned_at + timedelta(minutes=minutes),
+            )
+        resp = self.client.get(reverse('admin-dashboard'), **auth(self.admin))
+        self.assertEqual(resp.data['alerts_by_status']['PENDING'], 3)
+        self.assertEqual(resp.data['alerts_by_status']['RESOLVED'], 1)
+        self.assertEqual(resp.data['alerts_by_status']['CANCELLED'], 0)
+        self.assertEqual(resp.data['alerts_by_type']['FIRE_INCIDENCE'], 1)
+        self.assertEqual(resp.data['alerts_by_priority']['HIGH'], 4)
+        self.assertEqual(resp.data['avg_agency_response_seconds'], 180)
+
+    def test_dashboard_cost_is_constant(self):
+        headers = auth(self.admin)
+        # User lookup (JWT auth) plus five aggregates.
+        with self.assertNumQueries(6):
+            resp = self.client.get(reverse('admin-dashboard'), {'date_range': '7d'}, **headers)
+        self.assertIsNone(resp.data['avg_agency_response_seconds'])
+
+    def test_compaction_changes_all_time_etag(self):
+        etag = self.client.get(reverse('admin-dashboard'), **auth(self.admin))['ETag']
+        compact_rollups(timezone.now() + timedelta(days=2))
+        resp = self.client.get(reverse('admin-dashboard'), HTTP_IF_NONE_MATCH=etag, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['totals']['alerts_all_time'], 1)
+        self.assertEqual(sum(resp.data['alerts_by_status'].values()), 1)
+
 
 # ─── Agency management ────────────────────────────────────────────────────────
 
@@ -105,6 +162,23 @@ class AgencyListCreateTests(APITestCase):
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         self.assertEqual(len(resp.data), 1)
 
+    def test_list_counts_in_one_query(self):
+        user = make_user()
+        for i in range(5):
+            agency = make_agency(name=f'Agency {i}', email=f'a{i}@a.com', phone=f'+23480123456{i:02d}')
+            for j in range(i):
+                staff = User.objects.create_user(
+                    email=f's{i}{j}@a.com', password='pass12345', phone_number=f'+234809{i}{j:07d}', full_name='Staff',
+                )
+                AgencyUser.objects.create(agency=agency, user=staff, role='DISPATCHER')
+                for alert_status in ('DISPATCHED', 'RESOLVED'):
+                    AlertAssignment.objects.create(alert=make_alert(user, alert_status=alert_status), agency=agency)
+        headers = auth(self.admin)
+        with self.assertNumQueries(2):
+            resp = self.client.get(self.url, **headers)
+        counts = {row['agency_name']: (row['staff_count'], row['active_alert_count']) for row in resp.data}
+        self.assertEqual(counts, {f'Agency {i}': (i, i) for i in range(5)})
+
     def test_create_agency(self):
         payload = {
             'agency_name': 'Fire Service Lagos',
@@ -200,6 +274,30 @@ class AlertListTests(APITestCase):
         resp = self.client.get(self.url + '?priority=HIGH', **auth(self.admin))
         self.assertEqual(resp.data['count'], 2)
 
+    def test_search_matches_document_words(self):
+        other = make_user(email='ada@test.com', phone='+2348000000003')
+        other.full_name = 'Adaeze Okafor'
+        other.save(update_fields=['full_name'])
+        alert = make_alert(other, alert_type='KIDNAPPING')
+        alert.description = 'Two men forced a child into a van'
+        alert.save(update_fields=['description'])
+        Location.objects.filter(alert=alert).update(address='Allen Avenue, Ikeja', city='Ikeja', state='Lagos')
+        index_alerts(EmergencyAlert.objects.values_list('alert_id', flat=True))
+
+        def found(search):
+            resp = self.client.get(self.url, {'search': search}, **auth(self.admin))
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            return sorted(row['alert_id'] for row in resp.data['results'])
+
+        self.assertEqual(found('ada'), [alert.alert_id])
+        self.assertEqual(found('Okafor  ikeja'), [alert.alert_id])
+        self.assertEqual(found('van LAGOS'), [alert.alert_id])
+        self.assertEqual(found('okafor abuja'), [])
+        self.assertEqual(len(found('fire')), 1)
+        self.assertEqual(len(found('test user')), 2)
+        self.assertEqual(found(str(alert.alert_id)), [alert.alert_id])
+        self.assertEqual(found('100%_'), [])
+
 
 class AlertDetailTests(APITestCase):
     def setUp(self):
@@ -285,13 +383,31 @@ class CivilianUserListTests(APITestCase):
         resp = self.client.get(self.url, **auth(self.admin))
         self.assertEqual(resp.status_code, status.HTTP_200_OK)
         # admin is_staff=True — must not appear in results
-        self.assertEqual(len(resp.data), 2)
+        self.assertEqual(resp.data['count'], 2)
+        self.assertEqual(len(resp.data['results']), 2)
 
     def test_user_response_includes_alert_count(self):
         user = make_user()
         make_alert(user)
         resp = self.client.get(self.url, **auth(self.admin))
-        self.assertEqual(resp.data[0]['alert_count'], 1)
+        self.assertEqual(resp.data['results'][0]['alert_count'], 1)
+
+    def test_page_costs_constant_queries(self):
+        for i in range(25):
+            user = make_user(f'civ{i}@test.com', f'+23480{i:09d}')
+            for _ in range(i % 3):
+                make_alert(user)
+        headers = auth(self.admin)
+        # User lookup, the bounded count, the page keys and the page's alert counts.
+        with self.assertNumQueries(4):
+            resp = self.client.get(self.url, {'page_size': 10}, **headers)
+        self.assertEqual(resp.data['count'], 25)
+        self.assertEqual([row['email'] for row in resp.data['results']][:2], ['civ24@test.com', 'civ23@test.com'])
+        self.assertEqual(resp.data['results'][0]['alert_count'], 0)
+        self.assertEqual(resp.data['results'][1]['alert_count'], 2)
+
+        resp = self.client.get(self.url, {'search': 'civ7@'}, **headers)
+        self.assertEqual([row['email'] for row in resp.data['results']], ['civ7@test.com'])
 
 
 class CivilianUserDetailTests(APITestCase):
@@ -635,6 +751,29 @@ class NotificationLogListTests(APITestCase):
         self.assertEqual(resp.data['count'], 31)
         self.assertLessEqual(len(resp.data['results']), 20)
 
+    def test_pages_follow_the_keyset_cursor(self):
+        headers = auth(self.admin)
+        seen = []
+        url = self.url
+        while url:
+            resp = self.client.get(url, **headers)
+            self.assertEqual(resp.status_code, status.HTTP_200_OK)
+            seen += [row['log_id'] for row in resp.data['results']]
+            url = resp.data['next']
+        self.assertEqual(seen, list(NotificationLog.objects.order_by('-sent_at', '-log_id').values_list('log_id', flat=True)))
+
+        with self.assertNumQueries(2):
+            # User lookup and the page itself: one read of the sent_at order.
+            resp = self.client.get(self.url, {'page_size': 5, 'count': 'false'}, **headers)
+        self.assertNotIn('count', resp.data)
+        self.assertEqual(len(resp.data['results']), 5)
+
+    @patch.object(AdminCursorPagination, 'count_limit', 10)
+    def test_count_is_bounded(self):
+        resp = self.client.get(self.url, **auth(self.admin))
+        self.assertEqual(resp.data['count'], 10)
+        self.assertFalse(resp.data['count_is_exact'])
+
     def test_notification_log_assignment_filter(self):
         resp = self.client.get(
             f"{self.url}?assignment={self.other_assignment.assignment_id}",
@@ -645,6 +784,100 @@ class NotificationLogListTests(APITestCase):
         self.assertEqual(resp.data['results'][0]['assignment_id'], self.other_assignment.assignment_id)
 
 
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.user = make_user()
+        self.agency = make_agency()
+        now = timezone.now()
+        self.alerts = []
+        for i in range(7):
+            alert = make_alert(self.user, alert_type='FIRE_INCIDENCE' if i % 2 else 'BANDITRY')
+            # Two alerts share each timestamp so the key column breaks ties.
+            EmergencyAlert.objects.filter(pk=alert.pk).update(created_at=now - timedelta(hours=10 - i // 2))
+            self.alerts.append(alert)
+        assignment = AlertAssignment.objects.create(alert=self.alerts[0], agency=self.agency)
+        for channel in ('PUSH', 'SMS', 'EMAIL'):
+            NotificationLog.objects.create(
+                assignment=assignment, channel_type=channel, recipient='x', delivery_status='SENT',
+            )
+
+    def export(self, name, **params):
+        resp = self.client.get(reverse(name), params, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertTrue(resp.streaming)
+        return resp, b''.join(resp.streaming_content).decode()
+
+    def expected_order(self, qs):
+        return list(qs.order_by('created_at', 'alert_id').values_list('alert_id', flat=True))
+
+    @patch.object(exports, 'CHUNK_SIZE', 3)
+    def test_csv_streams_every_alert_in_keyset_order(self):
+        resp, body = self.export('admin-alert-export')
+        self.assertEqual(resp['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertIn('attachment; filename="alerts.csv"', resp['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(list(rows[0]), [name for name, _ in exports.ALERT_COLUMNS])
+        self.assertEqual([int(row['alert_id']) for row in rows], self.expected_order(EmergencyAlert.objects.all()))
+        self.assertEqual(rows[0]['reporter_email'], self.user.email)
+
+    def test_csv_neutralizes_formulas(self):
+        EmergencyAlert.objects.filter(pk=self.alerts[0].pk).update(description='=HYPERLINK("http://x","y")')
+        EmergencyAlert.objects.filter(pk=self.alerts[1].pk).update(description='@SUM(1)')
+        _, body = self.export('admin-alert-export')
+        rows = {int(row['alert_id']): row for row in csv.DictReader(io.StringIO(body))}
+        self.assertEqual(rows[self.alerts[0].alert_id]['description'], '\'=HYPERLINK("http://x","y")')
+        self.assertEqual(rows[self.alerts[1].alert_id]['description'], "'@SUM(1)")
+        # Validated fields such as phone numbers are exported unchanged.
+        self.assertEqual(rows[self.alerts[0].alert_id]['reporter_phone'], self.user.phone_number)
+
+        _, body = self.export('admin-alert-export', format='ndjson')
+        self.assertIn('"=HYPERLINK', body)
+
+    def test_batches_are_bounded_range_reads(self):
+        batches = list(exports.keyset_batches(
+            EmergencyAlert.objects.all(), exports.ALERT_COLUMNS, 'created_at', 'alert_id', size=3,
+        ))
+        self.assertEqual([len(batch) for batch in batches], [3, 3, 1])
+        with self.assertNumQueries(3):
+            list(exports.keyset_batches(
+                EmergencyAlert.objects.all(), exports.ALERT_COLUMNS, 'created_at', 'alert_id', size=3,
+            ))
+
+    def test_ndjson_and_filters(self):
+        resp, body = self.export('admin-alert-export', format='ndjson', type='FIRE_INCIDENCE')
+        self.assertEqual(resp['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(
+            [row['alert_id'] for row in rows],
+            self.expected_order(EmergencyAlert.objects.filter(alert_type='FIRE_INCIDENCE')),
+        )
+        self.assertTrue(all(row['alert_type'] == 'FIRE_INCIDENCE' for row in rows))
+
+    def test_start_and_end_bound_the_export(self):
+        start = EmergencyAlert.objects.order_by('created_at').values_list('created_at', flat=True)[2]
+        _, body = self.export('admin-alert-export', format='ndjson', start=start.isoformat())
+        self.assertEqual(len(body.splitlines()), 5)
+        _, body = self.export('admin-alert-export', format='ndjson', end=start.isoformat())
+        self.assertEqual(len(body.splitlines()), 2)
+
+    def test_notification_log_export(self):
+        _, body = self.export('admin-notification-export', channel='sms')
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual([row['channel_type'] for row in rows], ['SMS'])
+        self.assertEqual(rows[0]['agency_name'], self.agency.agency_name)
+        self.assertEqual(int(rows[0]['alert_id']), self.alerts[0].alert_id)
+
+    def test_bad_parameters_and_permissions(self):
+        url = reverse('admin-alert-export')
+        resp = self.client.get(url, {'format': 'xml'}, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.get(url, {'start': 'yesterday'}, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        resp = self.client.get(url, **auth(self.user))
+        self.assertEqual(resp.status_code, status.HTTP_403_FORBIDDEN)
+
+
 class BroadcastNotificationTests(APITestCase):
     def setUp(self):
         self.admin = make_admin()
@@ -665,3 +898,311 @@ class BroadcastNotificationTests(APITestCase):
         self.assertTrue(resp.data['queued'])
         self.assertEqual(resp.data['target_count'], 1)
         mock_thread.return_value.start.assert_called_once()
+
+
+# ─── Reports ──────────────────────────────────────────────────────────────────
+
+@override_settings(ADMIN_REPORT_CACHE_TTL_S=0, ADMIN_REPORT_STALE_S=0)
+class ReportsRollupTests(APITestCase):
+    url = reverse('admin-reports')
+
+    def setUp(self):
+        self.admin = make_admin()
+        self.user = make_user()
+        self.agency = make_agency()
+        now = timezone.now()
+        for days_ago, alert_type, alert_status in (
+            (0, 'BANDITRY', 'PENDING'),
+            (3, 'FIRE_INCIDENCE', 'RESOLVED'),
+            (3, 'BANDITRY', 'DISPATCHED'),
+            (20, 'KIDNAPPING', 'CANCELLED'),
+            (90, 'BANDITRY', 'RESOLVED'),
+        ):
+            alert = make_alert(self.user, alert_type=alert_type, alert_status=alert_status)
+            created = now - timedelta(days=days_ago)
+            EmergencyAlert.objects.filter(pk=alert.pk).update(created_at=created, updated_at=created)
+            assignment = AlertAssignment.objects.create(alert=alert, agency=self.agency)
+            AlertAssignment.objects.filter(pk=assignment.pk).update(
+                assigned_at=created, response_time=created + timedelta(minutes=days_ago + 1),
+            )
+            for channel, delivery_status in (('PUSH', 'SENT'), ('SMS', 'FAILED')):
+                log = NotificationLog.objects.create(
+                    assignment=assignment, channel_type=channel, recipient='x', delivery_status=delivery_status,
+                )
+                NotificationLog.objects.filter(pk=log.pk).update(sent_at=created)
+        self.old_alert = EmergencyAlert.objects.get(alert_type='KIDNAPPING')
+
+    def report(self):
+        resp = self.client.get(self.url, **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        resp.data.pop('generated_at')
+        return resp.data
+
+    def test_report_contents(self):
+        data = self.report()
+        self.assertEqual(data['alert_volume'], {'last_24h': 1, 'last_7d': 3, 'last_30d': 4, 'all_time': 5})
+        self.assertEqual(data['alert_types']['BANDITRY'], 3)
+        self.assertEqual(data['alert_statuses']['RESOLVED'], 2)
+        self.assertEqual(data['notification_delivery']['SMS'], {
+            'total': 5, 'sent': 0, 'failed': 5, 'success_rate': 0.0,
+        })
+        self.assertEqual(data['notification_delivery']['EMAIL']['success_rate'], None)
+        # (1 + 4 + 4 + 21 + 91) minutes over five responses.
+        self.assertEqual(data['avg_response_seconds_by_agency_type'], {'POLICE': round(121 * 60 / 5)})
+
+    def test_rollups_match_live_aggregates(self):
+        live = self.report()
+        self.assertIsNone(compact_rollups())
+        self.assertTrue(AlertDailyRollup.objects.exists())
+        self.assertEqual(self.report(), live)
+
+    def test_compaction_picks_up_changed_and_new_days(self):
+        compact_rollups()
+        self.assertEqual(compact_rollups(), 0)
+
+        self.old_alert.status = 'RESOLVED'
+        self.old_alert.save(update_fields=['status', 'updated_at'])
+        self.assertEqual(compact_rollups(), 1)
+        self.assertEqual(self.report()['alert_statuses']['RESOLVED'], 3)
+
+        tomorrow = timezone.now() + timedelta(days=1)
+        # Today closes; the changed alert's day is re-read once more (SETTLE overlap).
+        self.assertEqual(compact_rollups(now=tomorrow), 2)
+        checkpoint = RollupCheckpoint.objects.get()
+        self.assertEqual(checkpoint.compacted_through, timezone.localdate(tomorrow))
+        self.assertEqual(self.report()['alert_volume']['all_time'], 5)
+
+    def test_deleted_account_leaves_the_rollups(self):
+        compact_rollups()
+        other = make_user('other@test.com', '+2348000000009')
+        make_alert(other, alert_type='BANDITRY')
+        resp = self.client.delete(
+            reverse('auth-delete-account'), {'password': 'pass123'}, format='json', **auth(self.user),
+        )
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+
+        data = self.report()
+        self.assertEqual(data['alert_volume']['all_time'], 1)
+        self.assertEqual(sum(data['alert_types'].values()), 1)
+        self.assertEqual(data['notification_delivery']['SMS']['total'], 0)
+        self.assertEqual(data['avg_response_seconds_by_agency_type'], {})
+        dashboard = self.client.get(reverse('admin-dashboard'), **auth(self.admin)).data
+        self.assertEqual(sum(dashboard['alerts_by_status'].values()), dashboard['totals']['alerts_all_time'])
+
+
+@override_settings(ADMIN_REPORT_CACHE_TTL_S=0, ADMIN_REPORT_STALE_S=0)
+class LatencySketchTests(APITestCase):
+    def setUp(self):
+        self.admin = make_admin()
+        self.user = make_user()
+        self.police = make_agency()
+        self.fire = make_agency(name='Fire', agency_type='FIRE', email='f@a.com', phone='+2348012345679')
+
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(4, 1.5) for _ in range(20000))
+        sketch = sketches.DDSketch()
+        for value in values:
+            sketch.add(value)
+        self.assertLess(len(sketch.bins), 1000)
+        for q in (0.5, 0.9, 0.99):
+            exact = values[int(q * (len(values) - 1))]
+            self.assertAlmostEqual(sketch.quantile(q) / exact, 1, delta=sketches.RELATIVE_ACCURACY)
+
+    def test_merge_equals_sketch_of_union(self):
+        left, right, both = sketches.DDSketch(), sketches.DDSketch(), sketches.DDSketch()
+        for n in range(1, 500):
+            (left if n % 3 else right).add(n * 1.7)
+            both.add(n * 1.7)
+        self.assertEqual(left.merge(right).bins, both.bins)
+        self.assertIsNone(sketches.DDSketch().quantile(0.5))
+
+    def test_record_merges_days_and_agencies(self):
+        yesterday = timezone.now() - timedelta(days=1)
+        for seconds in (30, 60, 60, 90):
+            sketches.record(sketches.RESPONSE, self.police.agency_id, seconds, yesterday)
+        sketches.record(sketches.RESPONSE, self.police.agency_id, 60)
+        sketches.record(sketches.RESPONSE, self.fire.agency_id, 600)
+        # One row per day and bin: the repeated value only incremented its bin.
+        self.assertEqual(LatencySketchBin.objects.filter(agency=self.police).count(), 4)
+
+        by_type = sketches.percentiles(sketches.RESPONSE)
+        self.assertEqual(by_type['POLICE']['count'], 5)
+        self.assertAlmostEqual(by_type['POLICE']['p50'], 60, delta=1)
+        self.assertAlmostEqual(by_type['FIRE']['p99'], 600, delta=6)
+        today = sketches.percentiles(sketches.RESPONSE, day__gte=timezone.localdate())
+        self.assertEqual(today['POLICE']['count'], 1)
+        self.assertEqual(sketches.percentiles(sketches.DELIVERY), {})
+
+    def test_rebuild_matches_recorded_sketches(self):
+        now = timezone.now()
+        for minutes, agency in ((2, self.police), (5, self.police), (9, self.fire)):
+            assignment = AlertAssignment.objects.create(alert=make_alert(self.user), agency=agency)
+            AlertAssignment.objects.filter(pk=assignment.pk).update(
+                assigned_at=now, response_time=now + timedelta(minutes=minutes),
+            )
+            sketches.record(sketches.RESPONSE, agency.agency_id, minutes * 60, now + timedelta(minutes=minutes))
+            for channel, seconds in (('PUSH', 3), ('PUSH', 4), ('SMS', 8)):
+                log = NotificationLog.objects.create(
+                    assignment=assignment, channel_type=channel, recipient='x', delivery_status='SENT',
+                )
+                NotificationLog.objects.filter(pk=log.pk).update(sent_at=now + timedelta(seconds=seconds))
+            sketches.record(sketches.DELIVERY, agency.agency_id, 3, now)
+            sketches.record(sketches.DELIVERY, agency.agency_id, 8, now)
+            # The civilian's acknowledgment notice is not an agency delivery.
+            log = NotificationLog.objects.create(
+                assignment=assignment, channel_type='SMS', recipient='civilian', delivery_status='SENT',
+            )
+            NotificationLog.objects.filter(pk=log.pk).update(sent_at=now + timedelta(minutes=minutes + 1))
+
+        recorded = {
+            metric: sketches.percentiles(metric, group_by='agency_id')
+            for metric in (sketches.RESPONSE, sketches.DELIVERY)
+        }
+        sketches.rebuild_sketches()
+        for metric, expected in recorded.items():
+            self.assertEqual(sketches.percentiles(metric, group_by='agency_id'), expected)
+
+    def test_reports_include_percentiles(self):
+        sketches.record(sketches.DELIVERY, self.police.agency_id, 4.2)
+        resp = self.client.get(reverse('admin-reports'), **auth(self.admin))
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['response_time_percentiles_by_agency_type'], {})
+        self.assertEqual(resp.data['delivery_latency_percentiles_by_agency_type'], {
+            'POLICE': {'count': 1, 'p50': 4.2, 'p90': 4.2, 'p99': 4.2},
+        })
+
+
+class ReportCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return {'n': self.calls}
+
+    def age_entry(self, key, seconds):
+        computed_at, payload = cache.get(report_cache.CACHE_KEY.format(key))
+        cache.set(report_cache.CACHE_KEY.format(key), (computed_at - seconds, payload))
+
+    @override_settings(ADMIN_REPORT_CACHE_TTL_S=60, ADMIN_REPORT_STALE_S=300)
+    def test_miss_then_hit(self):
+        self.assertEqual(report_cache.cached_report('r', self.compute), ({'n': 1}, 'MISS'))
+        self.assertEqual(report_cache.cached_report('r', self.compute), ({'n': 1}, 'HIT'))
+        self.assertEqual(self.calls, 1)
+
+    @override_settings(ADMIN_REPORT_CACHE_TTL_S=60, ADMIN_REPORT_STALE_S=300)
+    @patch('admin_panel.report_cache.Thread')
+    def test_stale_entry_is_served_while_refreshing(self, mock_thread):
+        report_cache.cached_report('r', self.compute)
+        self.age_entry('r', 120)
+        self.assertEqual(report_cache.cached_report('r', self.compute), ({'n': 1}, 'STALE'))
+        mock_thread.return_value.start.assert_called_once()
+
+        target = mock_thread.call_args.kwargs['target']
+        with patch('admin_panel.report_cache.close_old_connections'):
+            target(*mock_thread.call_args.kwargs['args'])
+        self.assertEqual(report_cache.cached_report('r', self.compute), ({'n': 2}, 'HIT'))
+
+    @override_settings(ADMIN_REPORT_CACHE_TTL_S=60, ADMIN_REPORT_STALE_S=300)
+    def test_expired_entry_is_recomputed_inline(self):
+        report_cache.cached_report('r', self.compute)
+        self.age_entry('r', 400)
+        self.assertEqual(report_cache.cached_report('r', self.compute), ({'n': 2}, 'MISS'))
+
+    @override_settings(ADMIN_REPORT_CACHE_TTL_S=60, ADMIN_REPORT_STALE_S=300)
+    def test_concurrent_misses_share_one_computation(self):
+        release = threading.Event()
+
+        def slow():
+            release.wait(5)
+            return self.compute()
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(report_cache.cached_report('slow', slow)))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(self.calls, 1)
+        self.assertEqual(sorted(status for _, status in results), ['COALESCED'] * 4 + ['MISS'])
+        self.assertTrue(all(payload == {'n': 1} for payload, _ in results))
+
+    def test_reports_view_reports_cache_status(self):
+        admin = make_admin()
+        headers = auth(admin)
+        first = self.client.get(reverse('admin-reports'), **headers)
+        second = self.client.get(reverse('admin-reports'), **headers)
+        self.assertEqual(first['X-Cache-Status'], 'MISS')
+        self.assertEqual(second['X-Cache-Status'], 'HIT')
+        self.assertEqual(first.data, second.data)
+
+
+@override_settings(ADMIN_REPORT_CACHE_TTL_S=0, ADMIN_REPORT_STALE_S=0)
+class ReportTimeseriesTests(APITestCase):
+    url = reverse('admin-report-timeseries')
+
+    def setUp(self):
+        self.admin = make_admin()
+        self.headers = auth(self.admin)
+        user = make_user()
+        agency = make_agency()
+        self.day = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=2)
+        for hour, alert_type, respond_after in ((1, 'BANDITRY', 2), (1, 'BANDITRY', 4), (5, 'OTHER', None)):
+            alert = make_alert(user, alert_type=alert_type)
+            created = self.day + timedelta(hours=hour, minutes=10)
+            EmergencyAlert.objects.filter(pk=alert.pk).update(created_at=created)
+            if respond_after is not None:
+                assignment = AlertAssignment.objects.create(alert=alert, agency=agency)
+                AlertAssignment.objects.filter(pk=assignment.pk).update(
+                    assigned_at=created, response_time=created + timedelta(minutes=respond_after),
+                )
+
+    def get(self, **params):
+        return self.client.get(self.url, params, **self.headers)
+
+    def test_hourly_alert_counts_are_gap_filled(self):
+        resp = self.get(start=self.day.date().isoformat(), end=(self.day + timedelta(days=1)).isoformat())
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['interval'], 'hour')
+        self.assertEqual(len(resp.data['buckets']), 24)
+        banditry = resp.data['series']['BANDITRY']
+        self.assertEqual(banditry[1], 2)
+        self.assertEqual(sum(banditry), 2)
+        self.assertEqual(resp.data['series']['OTHER'][5], 1)
+        self.assertEqual(sum(resp.data['series']['KIDNAPPING']), 0)
+
+    def test_daily_response_times_by_agency_type(self):
+        resp = self.get(metric='response_time')
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data['interval'], 'day')
+        self.assertEqual(len(resp.data['buckets']), 30)
+        # The default range ends with the current day, not an empty future one.
+        self.assertEqual(resp.data['buckets'][-1], (self.day + timedelta(days=2)).isoformat())
+        police = resp.data['series']['POLICE']
+        index = resp.data['buckets'].index(self.day.isoformat())
+        self.assertEqual(police[index], 180)
+        self.assertEqual([v for v in police if v is not None], [180])
+        self.assertEqual(set(resp.data['series']['FIRE']), {None})
+
+    def test_unaligned_range_is_widened_to_whole_buckets(self):
+        resp = self.get(
+            start=(self.day + timedelta(minutes=30)).isoformat(),
+            end=(self.day + timedelta(hours=2, minutes=1)).isoformat(),
+        )
+        self.assertEqual(resp.data['start'], self.day.isoformat())
+        self.assertEqual(len(resp.data['buckets']), 3)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.get(metric='bogus').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(interval='week').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(start='yesterday').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(start='2026-02-01', end='2026-01-01').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.get(start='2000-01-01', end='2026-01-01').status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,95 @@
+"""
+Time-bucketed series for the admin trend charts.
+
+The database truncates timestamps (TruncHour / TruncDay) and groups, so a
+series costs one aggregate query whatever the range, and only one row per
+(bucket, key) that has data reaches Python.  Empty buckets are filled in
+here, so every series is aligned with the returned bucket list.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count
+from django.db.models.functions import TruncDay, TruncHour
+
+from agencies.models import SecurityAgency
+from alerts.models import EmergencyAlert, AlertAssignment
+
+from .rollups import RESPONSE_DURATION
+
+INTERVALS = {
+    'hour': (TruncHour, timedelta(hours=1)),
+    'day': (TruncDay, timedelta(days=1)),
+}
+# Upper bound on the buckets of one response (about 7 months of hours).
+MAX_BUCKETS = 5000
+
+
+def floor_to(moment, interval):
+    if interval == 'hour':
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def bucket_starts(start, end, interval):
+    """Bucket starts covering [start, end); start must already be floored."""
+    step = INTERVALS[interval][1]
+    buckets = []
+    moment = start
+    while moment < end:
+        buckets.append(moment)
+        moment += step
+    return buckets
+
+
+def _fill(rows, buckets, key_field, value_field, keys, empty):
+    index = {bucket: i for i, bucket in enumerate(buckets)}
+    series = {key: [empty] * len(buckets) for key in keys}
+    for row in rows:
+        position = index.get(row['bucket'])
+        if position is not None:
+            series.setdefault(row[key_field], [empty] * len(buckets))[position] = row[value_field]
+    return series
+
+
+def alert_counts(start, end, interval):
+    """{alert_type: [alerts created per bucket]} for every alert type."""
+    trunc = INTERVALS[interval][0]
+    rows = (
+        EmergencyAlert.objects
+        .filter(created_at__gte=start, created_at__lt=end)
+        .annotate(bucket=trunc('created_at'))
+        .values('bucket', 'alert_type')
+        .annotate(count=Count('alert_id'))
+        .order_by()
+    )
+    buckets = bucket_starts(start, end, interval)
+    keys = [alert_type for alert_type, _ in EmergencyAlert.ALERT_TYPES]
+    return buckets, _fill(rows, buckets, 'alert_type', 'count', keys, 0)
+
+
+def response_times(start, end, interval):
+    """
+    {agency_type: [mean response seconds per bucket]}, bucketed by when the
+    agency responded; None where nobody responded.
+    """
+    trunc = INTERVALS[interval][0]
+    rows = [
+        {**row, 'seconds': round(row['avg'].total_seconds())}
+        for row in (
+            AlertAssignment.objects
+            .filter(response_time__gte=start, response_time__lt=end)
+            .annotate(bucket=trunc('response_time'))
+            .values('bucket', 'agency__agency_type')
+            .annotate(avg=Avg(RESPONSE_DURATION))
+            .order_by()
+        )
+    ]
+    buckets = bucket_starts(start, end, interval)
+    keys = [agency_type for agency_type, _ in SecurityAgency.AGENCY_TYPES]
+    return buckets, _fill(rows, buckets, 'agency__agency_type', 'seconds', keys, None)
+
+
+METRICS = {
+    'alerts': alert_counts,
+    'response_time': response_times,
+}
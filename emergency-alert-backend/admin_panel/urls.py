@@ -6,13 +6,16 @@ from .views import (
     AgencyStaffView,
     AgencyStaffDetailView,
     AlertListView,
+    AlertExportView,
     AlertDetailView,
     AlertAssignView,
     CivilianUserListView,
     CivilianUserDetailView,
     NotificationLogListView,
+    NotificationLogExportView,
     BroadcastNotificationView,
     ReportsView,
+    ReportTimeseriesView,
     SystemSettingsView,
 )
 
@@ -28,6 +31,7 @@ urlpatterns = [
 
     # Alert management
     path('alerts/', AlertListView.as_view(), name='admin-alert-list'),
+    path('alerts/export/', AlertExportView.as_view(), name='admin-alert-export'),
     path('alerts/<int:alert_id>/', AlertDetailView.as_view(), name='admin-alert-detail'),
     path('alerts/<int:alert_id>/assign/', AlertAssignView.as_view(), name='admin-alert-assign'),
 
@@ -37,10 +41,12 @@ urlpatterns = [
 
     # Notification audit trail + broadcast
     path('notifications/', NotificationLogListView.as_view(), name='admin-notification-logs'),
+    path('notifications/export/', NotificationLogExportView.as_view(), name='admin-notification-export'),
     path('notifications/broadcast/', BroadcastNotificationView.as_view(), name='admin-notification-broadcast'),
 
     # Aggregated reports
     path('reports/', ReportsView.as_view(), name='admin-reports'),
+    path('reports/timeseries/', ReportTimeseriesView.as_view(), name='admin-report-timeseries'),
 
     # Operational system settings
     path('settings/', SystemSettingsView.as_view(), name='admin-settings'),
@@ -1,28 +1,37 @@
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 from threading import Thread
 
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 from django.db import close_old_connections
-from django.db.models import Count, Avg, Q
+from django.db.models import Count, Avg, DurationField, ExpressionWrapper, F, Max, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
 
 logger = logging.getLogger(__name__)
 
 from alert_system.permissions import IsAdminUser
+from alert_system.conditional import is_not_modified, make_etag, not_modified_response, with_etag
 
 from agencies.models import SecurityAgency, AgencyUser
+from alerts.lifecycle import ASSIGNMENTS_RELEASED, emit
 from alerts.models import EmergencyAlert, AlertAssignment
+from alerts.search import search_filter
+from alerts.sync import touch_assignments
 from accounts.models import User
 from notifications.models import NotificationLog
 from notifications.services import NotificationDispatcher
 
+from . import exports, rollups, sketches, timeseries
 from .models import SystemSetting
+from .pagination import AlertCursorPagination, CivilianUserCursorPagination, NotificationLogCursorPagination
+from .report_cache import cached_report_response
 from .serializers import (
+    ACTIVE_ALERT_STATUSES,
     AgencyListSerializer,
     AgencyDetailSerializer,
     AgencyCreateUpdateSerializer,
@@ -65,10 +74,52 @@ def _parse_bool(value):
     return None, '"is_active" must be a boolean (true/false) or equivalent string (yes/no, on/off, 1/0).'
 
 
-class AdminPageNumberPagination(PageNumberPagination):
-    page_size = 20
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+def parse_moment(value):
+    """An ISO date or datetime query parameter as an aware datetime."""
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        moment = datetime.combine(day, datetime.min.time())
+    # Report buckets are truncated in the current time zone, so align with it.
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else timezone.localtime(moment)
+
+
+class ExportView(APIView):
+    """
+    Base for the streaming list exports (see admin_panel.exports).
+    ?format=csv|ndjson (default csv); ?start= / ?end= bound `order_field`.
+    Subclasses provide get_queryset(params), columns, order/key fields and filename.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    columns = order_field = key_field = filename = None
+
+    def perform_content_negotiation(self, request, force=False):
+        # ?format= names the export format, not a DRF renderer.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, request):
+        fmt = request.query_params.get('format', 'csv').lower()
+        if fmt not in exports.FORMATS:
+            return Response(
+                {'error': f"format must be one of: {', '.join(exports.FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        qs = self.get_queryset(request.query_params)
+        try:
+            if raw_start := request.query_params.get('start'):
+                qs = qs.filter(**{f'{self.order_field}__gte': parse_moment(raw_start)})
+            if raw_end := request.query_params.get('end'):
+                qs = qs.filter(**{f'{self.order_field}__lt': parse_moment(raw_end)})
+        except ValueError:
+            return Response(
+                {'error': 'start and end must be ISO dates or datetimes.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return exports.streaming_export(
+            request, qs, self.columns, self.order_field, self.key_field, fmt, self.filename,
+        )
 
 
 def _run_broadcast_job(channel, title, message):
@@ -144,6 +195,29 @@ def _run_broadcast_job(channel, title, message):
 
 # ─── Dashboard ────────────────────────────────────────────────────────────────
 
+BREAKDOWN_FIELDS = {
+    'status': EmergencyAlert.STATUSES,
+    'alert_type': EmergencyAlert.ALERT_TYPES,
+    'priority_level': EmergencyAlert.PRIORITY_LEVELS,
+}
+
+
+def alert_breakdown(alerts):
+    """
+    Alert counts per status, type and priority level, every choice included,
+    from a single aggregate query with one conditional COUNT per choice.
+    """
+    counts = alerts.aggregate(**{
+        f'{field}__{value}': Count('alert_id', filter=Q(**{field: value}))
+        for field, choices in BREAKDOWN_FIELDS.items()
+        for value, _ in choices
+    })
+    return {
+        field: {value: counts[f'{field}__{value}'] for value, _ in choices}
+        for field, choices in BREAKDOWN_FIELDS.items()
+    }
+
+
 class DashboardView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
@@ -164,52 +238,95 @@ class DashboardView(APIView):
         else:
             alerts = all_alerts
 
-        # Average agency response time (assigned_at → response_time)
-        responded = AlertAssignment.objects.filter(response_time__isnull=False)
-        avg_response_seconds = None
-        if responded.exists():
-            total = sum(
-                (a.response_time - a.assigned_at).total_seconds()
-                for a in responded
-            )
-            avg_response_seconds = round(total / responded.count())
+        # Four aggregate queries carry the totals and version the payload, so
+        # an unchanged dashboard is answered with 304 before the breakdown is
+        # counted: one more aggregate for a window, the daily rollups for 'all'.
+        # 'all' also versions on the rollup checkpoint, since a compaction
+        # moves alerts between the rollups and the live tail.
+        week_ago = now - timedelta(days=7)
+        alert_totals = all_alerts.aggregate(
+            total=Count('alert_id'),
+            latest=Max('updated_at'),
+            today=Count('alert_id', filter=Q(created_at__gte=today_start)),
+            week=Count('alert_id', filter=Q(created_at__gte=week_ago)),
+            month=Count('alert_id', filter=Q(created_at__gte=now - timedelta(days=30))),
+        )
+        agency_totals = SecurityAgency.objects.aggregate(
+            total=Count('agency_id'), active=Count('agency_id', filter=Q(is_active=True)),
+        )
+        civilian_count = User.objects.filter(is_staff=False, is_superuser=False).count()
+        responses = AlertAssignment.objects.filter(response_time__isnull=False).aggregate(
+            count=Count('assignment_id'),
+            latest=Max('updated_at'),
+            avg=Avg(ExpressionWrapper(F('response_time') - F('assigned_at'), output_field=DurationField())),
+        )
+        rollup_state = rollups.checkpoint_state() if date_range == 'all' else None
+        etag = make_etag(
+            'dashboard', date_range, *alert_totals.values(), *agency_totals.values(),
+            civilian_count, responses['count'], responses['latest'], *(rollup_state or ()),
+        )
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        if date_range == 'all':
+            tail = None if rollup_state is None else rollups.day_start(rollup_state[0])
+            totals = rollups.alert_totals(now, tail)
+            breakdown = {
+                field: {value: totals[field][value] for value, _ in choices}
+                for field, choices in BREAKDOWN_FIELDS.items()
+            }
+        else:
+            breakdown = alert_breakdown(alerts)
+        avg_response = responses['avg']
 
-        return Response({
+        return with_etag(Response({
             'totals': {
-                'alerts_all_time':  all_alerts.count(),
-                'alerts_today':     all_alerts.filter(created_at__gte=today_start).count(),
-                'alerts_this_week': all_alerts.filter(created_at__gte=now - timedelta(days=7)).count(),
-                'agencies_total':   SecurityAgency.objects.count(),
-                'agencies_active':  SecurityAgency.objects.filter(is_active=True).count(),
-                'civilian_users':   User.objects.filter(is_staff=False, is_superuser=False).count(),
-            },
-            'alerts_by_status': {
-                s: alerts.filter(status=s).count()
-                for s, _ in EmergencyAlert.STATUSES
+                'alerts_all_time':  alert_totals['total'],
+                'alerts_today':     alert_totals['today'],
+                'alerts_this_week': alert_totals['week'],
+                'agencies_total':   agency_totals['total'],
+                'agencies_active':  agency_totals['active'],
+                'civilian_users':   civilian_count,
             },
-            'alerts_by_type': {
-                t: alerts.filter(alert_type=t).count()
-                for t, _ in EmergencyAlert.ALERT_TYPES
-            },
-            'alerts_by_priority': {
-                p: alerts.filter(priority_level=p).count()
-                for p, _ in EmergencyAlert.PRIORITY_LEVELS
-            },
-            'avg_agency_response_seconds': avg_response_seconds,
-        })
+            'alerts_by_status':   breakdown['status'],
+            'alerts_by_type':     breakdown['alert_type'],
+            'alerts_by_priority': breakdown['priority_level'],
+            'avg_agency_response_seconds': (
+                round(avg_response.total_seconds()) if avg_response is not None else None
+            ),
+        }), etag)
 
 
 # ─── Agency management ────────────────────────────────────────────────────────
 
+def with_agency_counts(agencies):
+    """
+    Annotate the counts AgencyListSerializer shows.  Staff are counted in a
+    subquery so the assignment join is not multiplied by the staff rows.
+    """
+    staff = (
+        AgencyUser.objects.filter(agency=OuterRef('pk'))
+        .values('agency').annotate(n=Count('pk')).values('n')
+    )
+    return agencies.annotate(
+        staff_total=Coalesce(Subquery(staff), 0),
+        active_alert_total=Count(
+            'assignments', filter=Q(assignments__alert__status__in=ACTIVE_ALERT_STATUSES),
+        ),
+    )
+
+
 class AgencyListCreateView(APIView):
+    """
+    GET /api/admin/agencies/
+    Every agency with its staff and active alert counts, in one query.  Not
+    paginated: the list also feeds the assignment picker, and agencies
+    number in the hundreds at most.
+    """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get(self, request):
-        agencies = (
-            SecurityAgency.objects
-            .prefetch_related('staff__user', 'assignments')
-            .order_by('agency_name')
-        )
+        agencies = with_agency_counts(SecurityAgency.objects.order_by('agency_name'))
         return Response(AgencyListSerializer(agencies, many=True).data)
 
     def post(self, request):
@@ -229,8 +346,8 @@ class AgencyDetailView(APIView):
     def _get(self, agency_id):
         try:
             return (
-                SecurityAgency.objects
-                .prefetch_related('staff__user', 'assignments')
+                with_agency_counts(SecurityAgency.objects)
+                .prefetch_related('staff__user')
                 .get(agency_id=agency_id)
             )
         except SecurityAgency.DoesNotExist:
@@ -280,7 +397,7 @@ class AgencyStaffView(APIView):
 
     def _get_agency(self, agency_id):
         try:
-            return SecurityAgency.objects.prefetch_related('staff__user', 'assignments').get(agency_id=agency_id)
+            return with_agency_counts(SecurityAgency.objects).prefetch_related('staff__user').get(agency_id=agency_id)
         except SecurityAgency.DoesNotExist:
             return None
 
@@ -310,8 +427,8 @@ class AgencyStaffDetailView(APIView):
 
     def _agency_detail(self, agency_id):
         return (
-            SecurityAgency.objects
-            .prefetch_related('staff__user', 'assignments')
+            with_agency_counts(SecurityAgency.objects)
+            .prefetch_related('staff__user')
             .get(agency_id=agency_id)
         )
 
@@ -341,42 +458,58 @@ class AgencyStaffDetailView(APIView):
 
 # ─── Alert management ────────────────────────────────────────────────────────
 
+def filter_alerts(qs, params):
+    """The admin alert list filters, shared with the export."""
+    if s := params.get('status'):
+        qs = qs.filter(status=s)
+    if t := params.get('type'):
+        qs = qs.filter(alert_type=t)
+    if p := params.get('priority'):
+        qs = qs.filter(priority_level=p)
+    if raw_search := params.get('search'):
+        search = raw_search.strip()
+        if search:
+            # Reporter, place and description through the search document.
+            qs = qs.filter(search_filter(search))
+    return qs
+
+
 class AlertListView(APIView):
+    """
+    GET /api/admin/alerts/
+    All alerts, newest first.
+    Optional query params: ?status=  ?type=  ?priority=  ?search=
+    Keyset-paginated: follow `next` / `previous` (see admin_panel.pagination).
+    """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get(self, request):
-        qs = (
+        qs = filter_alerts(
             EmergencyAlert.objects
             .select_related('user', 'location')
-            .prefetch_related('assignments')
-            .order_by('-created_at')
+            .prefetch_related('assignments'),
+            request.query_params,
         )
-        # Query-param filters
-        if s := request.query_params.get('status'):
-            qs = qs.filter(status=s)
-        if t := request.query_params.get('type'):
-            qs = qs.filter(alert_type=t)
-        if p := request.query_params.get('priority'):
-            qs = qs.filter(priority_level=p)
-        if raw_search := request.query_params.get('search'):
-            search = raw_search.strip()
-            if search:
-                search_filter = (
-                    Q(alert_type__icontains=search) |
-                    Q(status__icontains=search) |
-                    Q(user__full_name__icontains=search) |
-                    Q(location__address__icontains=search)
-                )
-                if search.isdigit():
-                    search_filter |= Q(alert_id=int(search))
-                qs = qs.filter(search_filter)
-
-        paginator = AdminPageNumberPagination()
+        paginator = AlertCursorPagination()
         page = paginator.paginate_queryset(qs, request, view=self)
         serializer = AlertListAdminSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
 
+class AlertExportView(ExportView):
+    """
+    GET /api/admin/alerts/export/?format=csv|ndjson
+    Every matching alert, oldest first, streamed as it is read.
+    Takes the alert list filters plus ?start= / ?end= on created_at.
+    """
+    columns = exports.ALERT_COLUMNS
+    order_field, key_field = 'created_at', 'alert_id'
+    filename = 'alerts'
+
+    def get_queryset(self, params):
+        return filter_alerts(EmergencyAlert.objects.all(), params)
+
+
 class AlertDetailView(APIView):
     permission_classes = [IsAuthenticated, IsAdminUser]
 
@@ -421,11 +554,19 @@ class AlertAssignView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        assignment = AlertAssignment.objects.create(alert=alert, agency=agency)
+        assignment = AlertAssignment.objects.create(
+            alert=alert, agency=agency, is_active=alert.status not in ('RESOLVED', 'CANCELLED'),
+        )
 
         if alert.status == 'PENDING':
             alert.status = 'DISPATCHED'
-            alert.save(update_fields=['status'])
+            alert.save(update_fields=['status', 'updated_at'])
+            touch_assignments(alert=alert)
+        emit(
+            ASSIGNMENTS_RELEASED, alert.alert_id,
+            alert_type=alert.alert_type, priority_level=alert.priority_level, status=alert.status,
+            assignment_id=assignment.assignment_id,
+        )
 
         NotificationDispatcher().dispatch_alert(assignment)
 
@@ -438,16 +579,30 @@ class AlertAssignView(APIView):
 # ─── User management ──────────────────────────────────────────────────────────
 
 class CivilianUserListView(APIView):
+    """
+    GET /api/admin/users/
+    Civilian accounts, newest first, with their alert counts.
+    Optional query params: ?search= (name, email or phone)
+    Keyset-paginated: follow `next` / `previous` (see admin_panel.pagination).
+    """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get(self, request):
-        users = (
+        users = User.objects.filter(is_staff=False, is_superuser=False)
+        if search := request.query_params.get('search', '').strip():
+            users = users.filter(
+                Q(full_name__icontains=search) | Q(email__icontains=search) | Q(phone_number__icontains=search)
+            )
+        # Paginate on the key columns only, then count the page's alerts.
+        paginator = CivilianUserCursorPagination()
+        page = paginator.paginate_queryset(users.only('user_id', 'date_joined'), request, view=self)
+        rows = (
             User.objects
-            .filter(is_staff=False, is_superuser=False)
-            .prefetch_related('alerts')
-            .order_by('-date_joined')
+            .filter(user_id__in=[user.user_id for user in page])
+            .annotate(alert_total=Count('alerts'))
+            .order_by(*CivilianUserCursorPagination.ordering)
         )
-        return Response(CivilianUserSerializer(users, many=True).data)
+        return paginator.get_paginated_response(CivilianUserSerializer(rows, many=True).data)
 
 
 class CivilianUserDetailView(APIView):
@@ -490,33 +645,51 @@ class CivilianUserDetailView(APIView):
 
 # ─── Notification logs ────────────────────────────────────────────────────────
 
+def filter_notification_logs(qs, params):
+    """The notification log filters, shared with the export."""
+    if ch := params.get('channel'):
+        qs = qs.filter(channel_type=ch.upper())
+    if st := params.get('status'):
+        qs = qs.filter(delivery_status=st.upper())
+    if aid := params.get('assignment'):
+        qs = qs.filter(assignment_id=aid)
+    return qs
+
+
 class NotificationLogListView(APIView):
     """
     GET /api/admin/notifications/
-    Read-only view of all notification delivery attempts.
+    Read-only view of all notification delivery attempts, newest first.
     Optional query params: ?channel=PUSH|SMS|EMAIL  ?status=SENT|FAILED  ?assignment=<id>
+    Keyset-paginated: follow `next` / `previous` (see admin_panel.pagination).
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
     def get(self, request):
-        qs = (
-            NotificationLog.objects
-            .select_related('assignment__alert', 'assignment__agency')
-            .order_by('-sent_at')
+        qs = filter_notification_logs(
+            NotificationLog.objects.select_related('assignment__alert', 'assignment__agency'),
+            request.query_params,
         )
-        if ch := request.query_params.get('channel'):
-            qs = qs.filter(channel_type=ch.upper())
-        if st := request.query_params.get('status'):
-            qs = qs.filter(delivery_status=st.upper())
-        if aid := request.query_params.get('assignment'):
-            qs = qs.filter(assignment_id=aid)
-
-        paginator = AdminPageNumberPagination()
+        paginator = NotificationLogCursorPagination()
         page = paginator.paginate_queryset(qs, request, view=self)
         serializer = NotificationLogSerializer(page, many=True)
         return paginator.get_paginated_response(serializer.data)
 
 
+class NotificationLogExportView(ExportView):
+    """
+    GET /api/admin/notifications/export/?format=csv|ndjson
+    Every matching delivery attempt, oldest first, streamed as it is read.
+    Takes the notification log filters plus ?start= / ?end= on sent_at.
+    """
+    columns = exports.NOTIFICATION_LOG_COLUMNS
+    order_field, key_field = 'sent_at', 'log_id'
+    filename = 'notification-logs'
+
+    def get_queryset(self, params):
+        return filter_notification_logs(NotificationLog.objects.all(), params)
+
+
 # ─── Broadcast notification ───────────────────────────────────────────────────
 
 class BroadcastNotificationView(APIView):
@@ -573,23 +746,29 @@ class ReportsView(APIView):
     """
     GET /api/admin/reports/
     Aggregated operational metrics for the admin dashboard.
+
+    Served from the daily rollups plus a live tail (see admin_panel.rollups),
+    so the cost grows with the number of days, not rows.  last_7d and
+    last_30d are calendar days including today; last_24h is exact.
+    Shared between admins through admin_panel.report_cache.
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
 
+    CHANNELS = ('PUSH', 'SMS', 'EMAIL')
+
     def get(self, request):
-        now = timezone.now()
+        return cached_report_response('reports', self.build)
 
-        # Alert volume by period
-        def alert_count(days):
-            return EmergencyAlert.objects.filter(
-                created_at__gte=now - timedelta(days=days)
-            ).count()
+    def build(self):
+        now = timezone.now()
+        tail = rollups.tail_start()
+        alerts = rollups.alert_totals(now, tail)
+        deliveries = rollups.delivery_totals(tail)
 
         # Notification delivery rates per channel
         def channel_stats(channel):
-            logs = NotificationLog.objects.filter(channel_type=channel)
-            total = logs.count()
-            sent  = logs.filter(delivery_status='SENT').count()
+            total = sum(n for (ch, _), n in deliveries.items() if ch == channel)
+            sent  = deliveries[channel, 'SENT']
             return {
                 'total':        total,
                 'sent':         sent,
@@ -597,41 +776,105 @@ class ReportsView(APIView):
                 'success_rate': round(sent / total * 100, 1) if total else None,
             }
 
-        # Average response time (assigned_at → response_time) per agency type
-        responded = AlertAssignment.objects.filter(response_time__isnull=False).select_related('agency')
-        agency_response = {}
-        for asgmt in responded:
-            atype = asgmt.agency.agency_type
-            delta = (asgmt.response_time - asgmt.assigned_at).total_seconds()
-            agency_response.setdefault(atype, []).append(delta)
-        avg_response_by_type = {
-            k: round(sum(v) / len(v))
-            for k, v in agency_response.items()
-        }
-
-        return Response({
+        return {
             'alert_volume': {
-                'last_24h':  alert_count(1),
-                'last_7d':   alert_count(7),
-                'last_30d':  alert_count(30),
-                'all_time':  EmergencyAlert.objects.count(),
+                'last_24h':  EmergencyAlert.objects.filter(created_at__gte=now - timedelta(days=1)).count(),
+                'last_7d':   alerts['totals']['last_7d'],
+                'last_30d':  alerts['totals']['last_30d'],
+                'all_time':  alerts['totals']['all_time'],
             },
             'alert_types': {
-                t: EmergencyAlert.objects.filter(alert_type=t).count()
+                t: alerts['alert_type'][t]
                 for t, _ in EmergencyAlert.ALERT_TYPES
             },
             'alert_statuses': {
-                s: EmergencyAlert.objects.filter(status=s).count()
+                s: alerts['status'][s]
                 for s, _ in EmergencyAlert.STATUSES
             },
             'notification_delivery': {
-                'PUSH':  channel_stats('PUSH'),
-                'SMS':   channel_stats('SMS'),
-                'EMAIL': channel_stats('EMAIL'),
+                channel: channel_stats(channel) for channel in self.CHANNELS
             },
-            'avg_response_seconds_by_agency_type': avg_response_by_type,
+            # Average response time (assigned_at → response_time) per agency type
+            'avg_response_seconds_by_agency_type': rollups.average_response_seconds(tail),
+            # p50 / p90 / p99 seconds per agency type (see admin_panel.sketches)
+            'response_time_percentiles_by_agency_type': sketches.percentiles(sketches.RESPONSE),
+            'delivery_latency_percentiles_by_agency_type': sketches.percentiles(sketches.DELIVERY),
             'generated_at': now.isoformat(),
-        })
+        }
+
+
+class ReportTimeseriesView(APIView):
+    """
+    GET /api/admin/reports/timeseries/
+    Trend series for the reports charts.
+
+    Query params:
+      metric    alerts (created per bucket, by alert type; default) or
+                response_time (mean seconds to respond, by agency type)
+      interval  hour or day (default: hour for alerts, day for response_time)
+      start/end ISO date or datetime; end is exclusive.  Default: the last
+                24 hours or 30 days, up to and including the current bucket.
+
+    Buckets are computed by the database; every series has one value per
+    bucket, empty buckets included.
+    """
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    DEFAULT_INTERVALS = {'alerts': 'hour', 'response_time': 'day'}
+    DEFAULT_BUCKETS = {'hour': 24, 'day': 30}
+
+    def get(self, request):
+        metric = request.query_params.get('metric', 'alerts')
+        if metric not in timeseries.METRICS:
+            return Response(
+                {'error': f"metric must be one of: {', '.join(timeseries.METRICS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        interval = request.query_params.get('interval', self.DEFAULT_INTERVALS[metric])
+        if interval not in timeseries.INTERVALS:
+            return Response(
+                {'error': f"interval must be one of: {', '.join(timeseries.INTERVALS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        step = timeseries.INTERVALS[interval][1]
+
+        try:
+            raw_end = request.query_params.get('end')
+            end = parse_moment(raw_end) if raw_end else timezone.now()
+            raw_start = request.query_params.get('start')
+            start = parse_moment(raw_start) if raw_start else None
+        except (ValueError, OverflowError):
+            return Response(
+                {'error': 'start and end must be ISO dates or datetimes.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        # Whole buckets only: end is rounded up, start down.
+        floored_end = timeseries.floor_to(end, interval)
+        end = floored_end if floored_end == end else floored_end + step
+        if start is None:
+            start = end - step * self.DEFAULT_BUCKETS[interval]
+        start = timeseries.floor_to(start, interval)
+        if start >= end:
+            return Response({'error': 'start must be before end.'}, status=status.HTTP_400_BAD_REQUEST)
+        if (end - start) / step > timeseries.MAX_BUCKETS:
+            return Response(
+                {'error': f'Range too large: at most {timeseries.MAX_BUCKETS} {interval} buckets.'},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        def build():
+            buckets, series = timeseries.METRICS[metric](start, end, interval)
+            return {
+                'metric': metric,
+                'interval': interval,
+                'start': start.isoformat(),
+                'end': end.isoformat(),
+                'buckets': [bucket.isoformat() for bucket in buckets],
+                'series': series,
+            }
+
+        key = f'timeseries:{metric}:{interval}:{start.isoformat()}:{end.isoformat()}'
+        return cached_report_response(key, build)
 
 
 # ─── System settings ──────────────────────────────────────────────────────────
@@ -644,6 +887,7 @@ _DEFAULT_SETTINGS = [
     ('max_notification_retries',  '2',    'Maximum retry attempts per notification channel'),
     ('alert_polling_interval_s',  '5',    'Frontend polling interval in seconds (informational)'),
     ('location_update_interval_m','15',   'Min metres moved before location update is sent (informational)'),
+    ('escalation_timeout_s',      '90',   'Seconds without acknowledgment before the next agency ring is alerted'),
 ]
 
 
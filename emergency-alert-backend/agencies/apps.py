@@ -3,3 +3,12 @@ from django.apps import AppConfig
 
 class AgenciesConfig(AppConfig):
     name = 'agencies'
+
+    def ready(self):
+        from alerts.lifecycle import KINDS, TRANSIENT_KINDS, subscribe
+        from .events import on_alert_event
+        # Written with the change itself, so a crash after commit cannot
+        # lose a dashboard event; location pings (superseded by the next
+        # one) are fanned out after commit and stay off the request path.
+        subscribe(on_alert_event, *(kind for kind in KINDS if kind not in TRANSIENT_KINDS), atomic=True)
+        subscribe(on_alert_event, *TRANSIENT_KINDS)
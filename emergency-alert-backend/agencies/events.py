@@ -0,0 +1,87 @@
+"""
+Dashboard events for the agency SSE stream.
+
+on_alert_event() subscribes to the alert lifecycle bus (alerts.lifecycle)
+and turns each event into one AgencyEvent row per agency handling the alert:
+a new assignment became visible, an alert it handles changed status, or the
+civilian moved.  Assignment and status rows are inserted in the transaction
+of the change they describe (an atomic subscriber), so they commit together
+and none is lost if the process dies right after; location rows follow on
+commit.  Every web/worker process can publish and every ASGI process can
+stream, without a message broker.
+"""
+import json
+from datetime import timedelta
+
+from django.utils import timezone
+
+from .models import AgencyEvent
+
+ASSIGNMENT_CREATED = 'assignment.created'
+ALERT_STATUS = 'alert.status'
+ALERT_LOCATION = 'alert.location'
+
+# Replay window for reconnecting dashboards; older events are pruned.
+EVENT_RETENTION = timedelta(hours=24)
+
+# Lifecycle data keys that select recipients rather than describe the change.
+ROUTING_KEYS = ('assignment_id', 'escalation_ring')
+
+
+def fan_out(alert_id, kind, data, **assignment_filters):
+    """
+    Insert one event per agency handling the alert; assignment_filters narrow
+    the recipients (e.g. escalation_ring=2).
+    """
+    from alerts.models import AlertAssignment
+
+    AgencyEvent.objects.bulk_create([
+        AgencyEvent(
+            agency_id=agency_id,
+            kind=kind,
+            payload=json.dumps(
+                {'assignment_id': assignment_id, 'alert_id': alert_id, **data},
+                default=str,
+            ),
+        )
+        for assignment_id, agency_id in (
+            AlertAssignment.objects
+            .filter(alert_id=alert_id, is_standby=False, **assignment_filters)
+            .values_list('assignment_id', 'agency_id')
+        )
+    ])
+
+
+def on_alert_event(event):
+    from alerts import lifecycle
+
+    data = dict(event.data)
+    filters = {key: data.pop(key) for key in ROUTING_KEYS if key in data}
+    kind = {
+        lifecycle.ALERT_CREATED: ASSIGNMENT_CREATED,
+        lifecycle.ASSIGNMENTS_RELEASED: ASSIGNMENT_CREATED,
+        lifecycle.ALERT_STATUS_CHANGED: ALERT_STATUS,
+        lifecycle.ALERT_LOCATION_CHANGED: ALERT_LOCATION,
+    }[event.kind]
+    fan_out(event.alert_id, kind, data, **filters)
+
+
+def events_after(cursor, agency_ids=None, limit=500):
+    """Events with event_id > cursor, oldest first, as lightweight tuples."""
+    events = AgencyEvent.objects.filter(event_id__gt=cursor)
+    if agency_ids is not None:
+        events = events.filter(agency_id__in=agency_ids)
+    return list(
+        events.order_by('event_id')
+        .values_list('event_id', 'agency_id', 'kind', 'payload', 'created_at')[:limit]
+    )
+
+
+def latest_event_id():
+    return AgencyEvent.objects.order_by('-event_id').values_list('event_id', flat=True).first() or 0
+
+
+def prune_events(now=None):
+    return AgencyEvent.objects.filter(
+        created_at__lt=(now or timezone.now()) - EVENT_RETENTION,
+    ).delete()[0]
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from agencies.events import prune_events
+from alerts.lifecycle import prune_events as prune_alert_events
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete dashboard events (AgencyEvent) and alert lifecycle events '
+        '(AlertEvent) older than their retention windows. Run from cron, or '
+        'with --loop as a standalone worker.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep pruning instead of exiting after one pass.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=3600.0,
+            help='Seconds between passes when --loop is set (default: 3600).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            agency_events = prune_events()
+            alert_events = prune_alert_events()
+            if agency_events or alert_events:
+                self.stdout.write(self.style.SUCCESS(
+                    f'Pruned {agency_events} dashboard and {alert_events} alert event(s).'
+                ))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
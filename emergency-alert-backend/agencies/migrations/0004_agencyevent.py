@@ -0,0 +1,30 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0003_securityagency_web_push_subscription'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgencyEvent',
+            fields=[
+                ('event_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=30)),
+                ('payload', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('agency', models.ForeignKey(
+                    db_index=False,
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='+',
+                    to='agencies.securityagency',
+                )),
+            ],
+            options={
+                'indexes': [models.Index(fields=['agency', 'event_id'], name='agency_event_cursor_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0004_agencyevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='securityagency',
+            index=models.Index(fields=['agency_type', 'is_active'], name='agency_type_active_idx'),
+        ),
+    ]
@@ -1,5 +1,5 @@
 from django.db import models
-from django.db.models import AutoField, CharField, EmailField, TextField, IntegerField, BooleanField, ForeignKey, OneToOneField, CASCADE, DecimalField
+from django.db.models import AutoField, BigAutoField, CharField, EmailField, TextField, IntegerField, BooleanField, ForeignKey, OneToOneField, CASCADE, DecimalField, DateTimeField
 
 
 class SecurityAgency(models.Model):
@@ -26,6 +26,12 @@ class SecurityAgency(models.Model):
     latitude  = DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
     longitude = DecimalField(max_digits=10, decimal_places=7, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            # Dispatch: active agencies of the alert's types.
+            models.Index(fields=['agency_type', 'is_active'], name='agency_type_active_idx'),
+        ]
+
     def __str__(self):
         return self.agency_name
 
@@ -43,3 +49,25 @@ class AgencyUser(models.Model):
 
     def __str__(self):
         return f"{self.user} - {self.role} at {self.agency}"
+
+
+class AgencyEvent(models.Model):
+    """
+    Outbox of dashboard events (new assignment, status change, civilian
+    location) for the /api/agency/stream/ SSE endpoint.  event_id doubles as
+    the stream's replay cursor (SSE Last-Event-ID).  payload is JSON text,
+    written to the stream as-is.
+    """
+    event_id = BigAutoField(primary_key=True)
+    agency = ForeignKey(SecurityAgency, on_delete=CASCADE, related_name='+', db_index=False)
+    kind = CharField(max_length=30)
+    payload = TextField()
+    created_at = DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['agency', 'event_id'], name='agency_event_cursor_idx'),
+        ]
+
+    def __str__(self):
+        return f"Event #{self.event_id} {self.kind} for {self.agency_id}"
@@ -0,0 +1,222 @@
+"""
+GET /api/agency/stream/ — Server-Sent Events for agency dashboards.
+
+Served by the ASGI application only (uvicorn/daphne against
+alert_system.asgi).  Each open connection is a coroutine waiting on an
+asyncio.Queue, so thousands of idle dashboards cost one event loop, not one
+worker each.  A single EventHub task per process polls AgencyEvent with one
+indexed range query and fans the rows out to the subscribed agencies.
+
+Authentication: EventSource cannot set headers, and an access token in the
+query string would end up in proxy and access logs.  Browsers therefore
+first POST /api/agency/stream/ticket/ (normal JWT auth) and open the stream
+with ?ticket=<ticket>: a random value, valid for TICKET_TTL_S and redeemable
+once, kept in the shared cache.  Other clients may send the Authorization
+header instead.
+
+Replay: every event carries its event_id as the SSE id.  On reconnect the
+browser sends Last-Event-ID (or the client passes ?cursor=) and missed events
+are replayed from the table before live delivery resumes.  A cursor older
+than the retention window yields an `event: reset`, telling the client to
+resynchronize with GET /api/agency/alerts/.
+
+Old events are deleted by `manage.py prune_events` (cron or --loop), not by
+the hub, which only runs while a dashboard is connected.
+"""
+import asyncio
+import logging
+import secrets
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import StreamingHttpResponse
+
+from alert_system.realtime import authenticate_jwt, db_sync, json_error
+
+from .events import events_after, latest_event_id
+from .models import AgencyEvent
+
+logger = logging.getLogger(__name__)
+
+# Events younger than this may still be overtaken by a slower transaction
+# holding a lower event_id, so the hub's cursor does not move past them yet.
+SETTLE_S = 2.0
+# Undelivered events a slow client may accumulate before it is disconnected
+# (it reconnects and catches up through replay).
+QUEUE_SIZE = 256
+RECONNECT_MS = 3000
+TICKET_TTL_S = 30
+TICKET_KEY = 'agency_stream_ticket:{}'
+
+
+class EventHub:
+    """Per-process fan-out of AgencyEvent rows to connected dashboards."""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._task = None
+        self._cursor = None
+        self._delivered = set()
+
+    def subscribe(self, agency_id):
+        queue = asyncio.Queue(maxsize=QUEUE_SIZE + 1)
+        self._subscribers.setdefault(agency_id, set()).add(queue)
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, agency_id, queue):
+        queues = self._subscribers.get(agency_id)
+        if queues is not None:
+            queues.discard(queue)
+            if not queues:
+                del self._subscribers[agency_id]
+
+    def subscriber_count(self):
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    def dispatch(self, rows, now=None):
+        """
+        Deliver freshly read rows and advance the cursor over the settled
+        prefix.  Rows already delivered (re-read while settling) are skipped.
+        """
+        now = now if now is not None else time.time()
+        settled = True
+        for event_id, agency_id, kind, payload, created_at in rows:
+            if event_id not in self._delivered:
+                self._delivered.add(event_id)
+                for queue in list(self._subscribers.get(agency_id, ())):
+                    if queue.qsize() >= QUEUE_SIZE:
+                        # Slot QUEUE_SIZE + 1 is reserved for this sentinel.
+                        queue.put_nowait(None)
+                        self.unsubscribe(agency_id, queue)
+                    else:
+                        queue.put_nowait((event_id, kind, payload))
+            if settled and created_at.timestamp() <= now - SETTLE_S:
+                self._cursor = event_id
+            else:
+                settled = False
+        self._delivered = {event_id for event_id in self._delivered if event_id > self._cursor}
+
+    async def _run(self):
+        if self._cursor is None:
+            self._cursor = await db_sync(latest_event_id)()
+        interval = settings.AGENCY_STREAM_POLL_INTERVAL_S
+        while self._subscribers:
+            try:
+                rows = await db_sync(events_after)(self._cursor, list(self._subscribers))
+                self.dispatch(rows)
+            except Exception:
+                logger.exception('Agency event hub poll failed')
+            await asyncio.sleep(interval)
+
+
+hub = EventHub()
+
+
+def format_event(event_id, kind, payload):
+    return f'id: {event_id}\nevent: {kind}\ndata: {payload}\n\n'
+
+
+def replay(agency_id, cursor):
+    """Return (reset, events) for a reconnecting client."""
+    oldest = (
+        AgencyEvent.objects.filter(agency_id=agency_id)
+        .order_by('event_id').values_list('event_id', flat=True).first()
+    )
+    reset = oldest is not None and cursor < oldest - 1
+    events = [
+        (event_id, kind, payload)
+        for event_id, _, kind, payload, _ in events_after(cursor, [agency_id], limit=QUEUE_SIZE)
+    ]
+    return reset, events
+
+
+async def event_stream(agency_id, cursor):
+    queue = hub.subscribe(agency_id)
+    try:
+        yield f'retry: {RECONNECT_MS}\n\n'
+        replayed = set()
+        if cursor is not None:
+            reset, events = await db_sync(replay)(agency_id, cursor)
+            if reset:
+                yield 'event: reset\ndata: {}\n\n'
+            for event in events:
+                replayed.add(event[0])
+                yield format_event(*event)
+
+        heartbeat = settings.AGENCY_STREAM_HEARTBEAT_S
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ': keep-alive\n\n'
+                continue
+            if event is None:
+                return
+            if event[0] in replayed:
+                continue
+            yield format_event(*event)
+    finally:
+        hub.unsubscribe(agency_id, queue)
+
+
+def issue_ticket(agency_id):
+    """A single-use stream ticket for an agency, valid for TICKET_TTL_S."""
+    ticket = secrets.token_urlsafe(32)
+    cache.set(TICKET_KEY.format(ticket), agency_id, TICKET_TTL_S)
+    return ticket
+
+
+def redeem_ticket(ticket):
+    """The ticket's agency_id, or None.  Only the first redemption succeeds."""
+    key = TICKET_KEY.format(ticket)
+    agency_id = cache.get(key)
+    # delete() reports whether this caller removed the entry, so two
+    # concurrent redemptions cannot both succeed.
+    if agency_id is None or not cache.delete(key):
+        return None
+    return agency_id
+
+
+def _authenticate(request):
+    """Return (agency_id, None) or (None, error response)."""
+    ticket = request.GET.get('ticket')
+    if ticket:
+        agency_id = redeem_ticket(ticket)
+        if agency_id is None:
+            return None, json_error('Stream ticket is invalid or has expired.', 401)
+        return agency_id, None
+
+    user, error = authenticate_jwt(request)
+    if error is not None:
+        return None, error
+    profile = getattr(user, 'agency_profile', None)
+    if profile is None:
+        return None, json_error('You do not have permission to perform this action.', 403)
+    return profile.agency_id, None
+
+
+async def agency_stream(request):
+    if request.method != 'GET':
+        return json_error(f'Method "{request.method}" not allowed.', 405)
+    if not hasattr(request, 'scope'):
+        # Under WSGI an open stream would pin a worker; clients fall back to polling.
+        return json_error('Event stream is only available on the ASGI server.', 503)
+
+    agency_id, error = await db_sync(_authenticate)(request)
+    if error is not None:
+        return error
+
+    raw_cursor = request.headers.get('Last-Event-ID') or request.GET.get('cursor')
+    try:
+        cursor = int(raw_cursor) if raw_cursor else None
+    except ValueError:
+        return json_error('cursor must be an event id.', 400)
+
+    response = StreamingHttpResponse(event_stream(agency_id, cursor), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -1,12 +1,30 @@
+import asyncio
+import gzip
+import io
+import json
+from datetime import timedelta
 from unittest.mock import patch
+import msgpack
+from asgiref.sync import async_to_sync
+from django.core.management import call_command
+from django.db import transaction
+from django.test import AsyncClient, TransactionTestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models import User
-from agencies.models import SecurityAgency, AgencyUser
-from alerts.models import EmergencyAlert, Location, AlertAssignment, Acknowledgment
+from admin_panel.models import LatencySketchBin
+from agencies.models import SecurityAgency, AgencyUser, AgencyEvent
+from agencies.stream import EventHub, issue_ticket, redeem_ticket
+from alerts.lifecycle import ALERT_STATUS_CHANGED, emit
+from alerts.models import EmergencyAlert, Location, AlertAssignment, Acknowledgment, LocationPing
+from alerts.projections import assignment_rows
+from alerts.serializers import AlertAssignmentSerializer
+from alerts.sync import touch_assignments
+from notifications.models import NotificationLog
 
 
 def create_user(email='user@test.com', password='testpass123', phone='+2348011111111'):
@@ -40,7 +58,9 @@ def make_alert_with_assignment(civilian, agency, alert_status='DISPATCHED'):
         priority_level='HIGH', status=alert_status,
     )
     Location.objects.create(alert=alert, latitude='6.5244', longitude='3.3792')
-    assignment = AlertAssignment.objects.create(alert=alert, agency=agency)
+    assignment = AlertAssignment.objects.create(
+        alert=alert, agency=agency, is_active=alert_status not in ('RESOLVED', 'CANCELLED'),
+    )
     if alert_status in ('ACKNOWLEDGED', 'RESPONDING', 'RESOLVED'):
         Acknowledgment.objects.create(assignment=assignment, acknowledged_by='Test Dispatcher')
     return alert, assignment
@@ -83,6 +103,10 @@ class AcknowledgeAlertTests(APITestCase):
         self.assignment.refresh_from_db()
         self.assertEqual(self.assignment.notification_status, 'DELIVERED')
         self.assertIsNotNone(self.assignment.response_time)
+        self.assertEqual(
+            list(LatencySketchBin.objects.values_list('agency_id', 'metric', 'count')),
+            [(self.agency.agency_id, 'response', 1)],
+        )
 
     @patch('agencies.views.NotificationDispatcher')
     def test_cannot_acknowledge_twice(self, mock_dispatcher):
@@ -132,6 +156,262 @@ class AgencyAlertVisibilityTests(APITestCase):
         self.assertEqual(response_b.data[0]['agency']['agency_name'], 'Police B')
 
 
+class AgencyAlertDeltaSyncTests(APITestCase):
+    url = reverse('agency-alert-list')
+
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        self.alert, self.assignment = make_alert_with_assignment(self.civilian, self.agency)
+        other_civilian = create_user('other@test.com', phone='+2348011111113')
+        self.other_alert, self.other_assignment = make_alert_with_assignment(other_civilian, self.agency)
+
+    def sync(self, token):
+        return self.client.get(self.url, {'since': token}, **auth_header(self.officer))
+
+    def age_assignments(self, minutes=10):
+        AlertAssignment.objects.update(updated_at=timezone.now() - timedelta(minutes=minutes))
+
+    def test_first_sync_is_a_full_snapshot(self):
+        response = self.sync('0')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['full'])
+        self.assertEqual(len(response.data['assignments']), 2)
+        self.assertTrue(response.data['sync_token'])
+
+    def test_delta_contains_only_changed_assignments(self):
+        self.age_assignments()
+        token = self.sync('0').data['sync_token']
+        self.assertEqual(self.sync(token).data['assignments'], [])
+
+        with patch('agencies.views.NotificationDispatcher'):
+            self.client.post(
+                reverse('agency-alert-acknowledge', args=[self.assignment.assignment_id]),
+                {'acknowledged_by': 'Officer Bello'},
+                **auth_header(self.officer),
+            )
+
+        response = self.sync(token)
+        self.assertFalse(response.data['full'])
+        self.assertEqual(
+            [a['assignment_id'] for a in response.data['assignments']],
+            [self.assignment.assignment_id],
+        )
+
+    def test_deleted_account_produces_tombstones(self):
+        self.age_assignments()
+        token = self.sync('0').data['sync_token']
+        self.client.delete(
+            reverse('auth-delete-account'), {'password': 'testpass123'}, **auth_header(self.civilian)
+        )
+        response = self.sync(token)
+        self.assertEqual(response.data['removed'], [self.assignment.assignment_id])
+        self.assertEqual(response.data['assignments'], [])
+
+    def test_invalid_token_returns_400(self):
+        self.assertEqual(self.sync('abc').status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unchanged_list_returns_304(self):
+        etag = self.client.get(self.url, **auth_header(self.officer))['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        touch_assignments(pk=self.assignment.pk)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class AgencyAlertHistoryTests(APITestCase):
+    list_url = reverse('agency-alert-list')
+    history_url = reverse('agency-alert-history')
+
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        self.alert, self.assignment = make_alert_with_assignment(
+            self.civilian, self.agency, alert_status='RESPONDING'
+        )
+
+    def make_closed(self, count):
+        base = timezone.now() - timedelta(days=30)
+        closed = []
+        for i in range(count):
+            _, assignment = make_alert_with_assignment(self.civilian, self.agency, alert_status='RESOLVED')
+            AlertAssignment.objects.filter(pk=assignment.pk).update(assigned_at=base + timedelta(hours=i))
+            closed.append(assignment.assignment_id)
+        return closed
+
+    def test_default_list_only_contains_active_assignments(self):
+        self.make_closed(2)
+        response = self.client.get(self.list_url, **auth_header(self.officer))
+        self.assertEqual([a['assignment_id'] for a in response.data], [self.assignment.assignment_id])
+
+        full = self.client.get(self.list_url, {'since': '0'}, **auth_header(self.officer))
+        self.assertEqual(
+            [a['assignment_id'] for a in full.data['assignments']], [self.assignment.assignment_id]
+        )
+
+    @patch('agencies.views.NotificationDispatcher')
+    def test_resolving_moves_assignment_to_history(self, mock_dispatcher):
+        token = self.client.get(self.list_url, {'since': '0'}, **auth_header(self.officer)).data['sync_token']
+        self.client.put(
+            reverse('agency-alert-status', args=[self.assignment.assignment_id]),
+            {'status': 'RESOLVED'}, **auth_header(self.officer),
+        )
+
+        # The delta still carries the closing change so clients see it.
+        delta = self.client.get(self.list_url, {'since': token}, **auth_header(self.officer))
+        self.assertEqual(delta.data['assignments'][0]['alert_status'], 'RESOLVED')
+        self.assertEqual(self.client.get(self.list_url, **auth_header(self.officer)).data, [])
+
+        history = self.client.get(self.history_url, **auth_header(self.officer))
+        self.assertEqual(
+            [a['assignment_id'] for a in history.data['results']], [self.assignment.assignment_id]
+        )
+
+    def test_cancelled_alert_moves_to_history(self):
+        alert, assignment = make_alert_with_assignment(self.civilian, self.agency)
+        with patch('alerts.views.NotificationDispatcher'):
+            self.client.put(reverse('alert-cancel', args=[alert.alert_id]), **auth_header(self.civilian))
+        assignment.refresh_from_db()
+        self.assertFalse(assignment.is_active)
+
+    def test_history_pages_follow_keyset_cursor(self):
+        closed = self.make_closed(5)
+        seen = []
+        response = self.client.get(self.history_url, {'page_size': 2}, **auth_header(self.officer))
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            seen += [a['assignment_id'] for a in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'], **auth_header(self.officer))
+
+        self.assertEqual(seen, list(reversed(closed)))
+
+    def test_history_is_scoped_to_agency(self):
+        self.make_closed(1)
+        other_agency = create_agency('Fire', 'FIRE', 'fire@test.com', '+2348044444444')
+        other_officer = create_agency_user(other_agency, 'fire@officer.com', '+2348055555555')
+        response = self.client.get(self.history_url, **auth_header(other_officer))
+        self.assertEqual(response.data['results'], [])
+
+
+class AssignmentProjectionTests(APITestCase):
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        _, self.acknowledged = make_alert_with_assignment(self.civilian, self.agency, alert_status='ACKNOWLEDGED')
+        _, self.fresh = make_alert_with_assignment(self.civilian, self.agency)
+        for channel, delivery_status in (('PUSH', 'FAILED'), ('SMS', 'SENT'), ('PUSH', 'SENT')):
+            NotificationLog.objects.create(
+                assignment=self.acknowledged, channel_type=channel, recipient='x',
+                delivery_status=delivery_status, error_message='boom' if delivery_status == 'FAILED' else None,
+            )
+
+    def test_projection_matches_serializer(self):
+        queryset = AlertAssignment.objects.order_by('-assigned_at')
+        expected = AlertAssignmentSerializer(queryset, many=True).data
+        self.assertEqual(assignment_rows(queryset), expected)
+
+    def test_projection_uses_four_queries(self):
+        with self.assertNumQueries(4):
+            rows = assignment_rows(AlertAssignment.objects.all())
+        self.assertEqual(len(rows), 2)
+        with self.assertNumQueries(1):
+            self.assertEqual(assignment_rows(AlertAssignment.objects.filter(pk=0)), [])
+
+    def test_delivery_is_summarized_per_channel(self):
+        row = next(
+            r for r in assignment_rows(AlertAssignment.objects.all())
+            if r['assignment_id'] == self.acknowledged.assignment_id
+        )
+        self.assertEqual(
+            [(d['channel_type'], d['delivery_status'], d['attempts']) for d in row['delivery']],
+            [('PUSH', 'SENT', 2), ('SMS', 'SENT', 1)],
+        )
+        self.assertIsNone(row['delivery'][0]['error_message'])
+        self.assertNotIn('notification_logs', row)
+
+    def test_full_logs_on_demand(self):
+        url = reverse('agency-alert-notifications', args=[self.acknowledged.assignment_id])
+        response = self.client.get(url, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([log['delivery_status'] for log in response.data], ['FAILED', 'SENT', 'SENT'])
+        self.assertEqual(response.data[0]['error_message'], 'boom')
+
+        other_agency = create_agency('Fire', 'FIRE', 'fire@test.com', '+2348044444444')
+        outsider = create_agency_user(other_agency, 'fire@officer.com', '+2348055555555')
+        self.assertEqual(self.client.get(url, **auth_header(outsider)).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_standby_assignment_logs_are_hidden(self):
+        AlertAssignment.objects.filter(pk=self.acknowledged.pk).update(is_standby=True)
+        url = reverse('agency-alert-notifications', args=[self.acknowledged.assignment_id])
+        response = self.client.get(url, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_does_not_expose_reporter_password(self):
+        response = self.client.get(reverse('agency-alert-list'), **auth_header(self.officer))
+        self.assertNotIn('password', json.dumps(response.json()))
+        self.assertEqual(response.json()[0]['reporter_name'], self.civilian.full_name)
+
+
+class ResponseEncodingTests(APITestCase):
+    url = reverse('agency-alert-list')
+
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        for _ in range(3):
+            make_alert_with_assignment(self.civilian, self.agency)
+        self.headers = auth_header(self.officer)
+
+    def test_msgpack_list_matches_json(self):
+        as_json = self.client.get(self.url, **self.headers)
+        as_msgpack = self.client.get(self.url, HTTP_ACCEPT='application/msgpack', **self.headers)
+        self.assertEqual(as_msgpack['Content-Type'], 'application/msgpack')
+        self.assertIn('Accept', as_msgpack['Vary'])
+        self.assertEqual(msgpack.unpackb(as_msgpack.content), as_json.json())
+        self.assertLess(len(as_msgpack.content), len(as_json.content))
+
+    @patch('agencies.views.NotificationDispatcher')
+    def test_msgpack_request_body(self, mock_dispatcher):
+        assignment = AlertAssignment.objects.first()
+        response = self.client.post(
+            reverse('agency-alert-acknowledge', args=[assignment.assignment_id]),
+            msgpack.packb({'acknowledged_by': 'Officer Bello', 'estimated_arrival': 15}),
+            content_type='application/msgpack', **self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['estimated_arrival'], 15)
+
+    def test_malformed_msgpack_is_a_bad_request(self):
+        assignment = AlertAssignment.objects.first()
+        response = self.client.post(
+            reverse('agency-alert-acknowledge', args=[assignment.assignment_id]),
+            b'\xc1', content_type='application/msgpack', **self.headers,
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=256)
+    def test_large_responses_are_gzipped(self):
+        plain = self.client.get(self.url, **self.headers)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br;q=0', **self.headers)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024 * 1024)
+    def test_small_responses_are_not_compressed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', **self.headers)
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertIsInstance(response.json(), list)
+
+
 class UpdateAlertStatusTests(APITestCase):
     def setUp(self):
         self.civilian = create_user()
@@ -144,6 +424,17 @@ class UpdateAlertStatusTests(APITestCase):
     def status_url(self):
         return reverse('agency-alert-status', args=[self.assignment.assignment_id])
 
+    def test_standby_agency_cannot_update_or_locate(self):
+        AlertAssignment.objects.filter(pk=self.assignment.pk).update(is_standby=True)
+        response = self.client.put(self.status_url(), {'status': 'RESPONDING'}, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.get(
+            reverse('agency-alert-location', args=[self.assignment.assignment_id]), **auth_header(self.officer)
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.alert.refresh_from_db()
+        self.assertEqual(self.alert.status, 'ACKNOWLEDGED')
+
     @patch('agencies.views.NotificationDispatcher')
     def test_update_to_responding(self, mock_dispatcher):
         response = self.client.put(
@@ -192,6 +483,47 @@ class UpdateAlertStatusTests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
 
+class AlertTrackTests(APITestCase):
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        self.alert, self.assignment = make_alert_with_assignment(self.civilian, self.agency)
+        start = timezone.now() - timedelta(minutes=10)
+        LocationPing.objects.bulk_create([
+            LocationPing(
+                alert=self.alert, lat_e7=65244000 + i * 1000, lng_e7=33792000,
+                recorded_at=start + timedelta(seconds=30 * i),
+            )
+            for i in range(10)
+        ])
+
+    def url(self):
+        return reverse('agency-alert-track', args=[self.assignment.assignment_id])
+
+    def test_track_is_simplified(self):
+        response = self.client.get(self.url(), **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['raw_count'], 10)
+        # A straight walk collapses to its two end points.
+        self.assertEqual(len(response.data['points']), 2)
+        self.assertAlmostEqual(response.data['points'][0][0], 6.5244)
+
+    def test_track_without_simplification(self):
+        response = self.client.get(self.url(), {'tolerance_m': 0}, **auth_header(self.officer))
+        self.assertEqual(len(response.data['points']), 10)
+
+    def test_other_agency_gets_404(self):
+        other = create_agency('Fire', 'FIRE_SERVICE', 'f@test.com', '+2348023456789')
+        officer = create_agency_user(other, 'fire@test.com', '+2348031111111')
+        response = self.client.get(self.url(), **auth_header(officer))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_invalid_tolerance_returns_400(self):
+        response = self.client.get(self.url(), {'tolerance_m': 'x'}, **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class RegisterAgencyDeviceTests(APITestCase):
     url = reverse('agency-register-device')
 
@@ -229,3 +561,139 @@ class RegisterAgencyDeviceTests(APITestCase):
     def test_unauthenticated_returns_401(self):
         response = self.client.post(self.url, {'push_token': 'some-token'})
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class AgencyEventStreamTests(APITestCase):
+    def setUp(self):
+        self.civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        self.alert, self.assignment = make_alert_with_assignment(self.civilian, self.agency)
+
+    @patch('agencies.views.NotificationDispatcher')
+    def test_acknowledge_publishes_status_event(self, mock_dispatcher):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse('agency-alert-acknowledge', args=[self.assignment.assignment_id]),
+                {'acknowledged_by': 'Officer Bello'},
+                **auth_header(self.officer),
+            )
+        event = AgencyEvent.objects.get(agency=self.agency)
+        self.assertEqual(event.kind, 'alert.status')
+        self.assertEqual(json.loads(event.payload), {
+            'assignment_id': self.assignment.assignment_id,
+            'alert_id': self.alert.alert_id,
+            'status': 'ACKNOWLEDGED',
+        })
+
+    @patch('agencies.views.NotificationDispatcher')
+    def test_status_event_is_written_with_the_change(self, mock_dispatcher):
+        # The row exists before any on-commit callback runs ...
+        with self.captureOnCommitCallbacks(execute=False):
+            self.client.post(
+                reverse('agency-alert-acknowledge', args=[self.assignment.assignment_id]),
+                {'acknowledged_by': 'Officer Bello'},
+                **auth_header(self.officer),
+            )
+        self.assertEqual(AgencyEvent.objects.filter(agency=self.agency).count(), 1)
+
+        # ... and rolls back with it.
+        try:
+            with transaction.atomic():
+                emit(ALERT_STATUS_CHANGED, self.alert.alert_id, status='RESPONDING')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        self.assertEqual(AgencyEvent.objects.filter(agency=self.agency).count(), 1)
+
+    def test_hub_fans_out_by_agency_and_holds_cursor_until_settled(self):
+        hub = EventHub()
+        hub._cursor = 0
+        mine, other = asyncio.Queue(maxsize=10), asyncio.Queue(maxsize=10)
+        hub._subscribers = {self.agency.agency_id: {mine}, 999: {other}}
+
+        now = timezone.now()
+        old, fresh = now - timedelta(seconds=10), now
+        rows = [
+            (1, self.agency.agency_id, 'alert.status', '{}', old),
+            (2, 999, 'alert.status', '{}', fresh),
+            (3, self.agency.agency_id, 'alert.location', '{}', fresh),
+        ]
+        hub.dispatch(rows, now=now.timestamp())
+        self.assertEqual([mine.get_nowait()[0], mine.get_nowait()[0]], [1, 3])
+        self.assertEqual(other.get_nowait()[0], 2)
+        self.assertEqual(hub._cursor, 1)
+
+        # Unsettled rows are read again on the next poll but not re-delivered.
+        hub.dispatch(rows[1:], now=now.timestamp() + 60)
+        self.assertTrue(mine.empty())
+        self.assertEqual(hub._cursor, 3)
+
+    def test_prune_command_drops_expired_events(self):
+        AgencyEvent.objects.create(agency=self.agency, kind='alert.status', payload='{}')
+        AgencyEvent.objects.create(agency=self.agency, kind='alert.status', payload='{}')
+        AgencyEvent.objects.filter(pk=AgencyEvent.objects.first().pk).update(
+            created_at=timezone.now() - timedelta(days=2),
+        )
+        call_command('prune_events', stdout=io.StringIO())
+        self.assertEqual(AgencyEvent.objects.count(), 1)
+
+    def test_stream_requires_asgi(self):
+        response = self.client.get(reverse('agency-stream'), **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+    def test_ticket_is_single_use(self):
+        response = self.client.post(reverse('agency-stream-ticket'), **auth_header(self.officer))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(redeem_ticket(response.data['ticket']), self.agency.agency_id)
+        self.assertIsNone(redeem_ticket(response.data['ticket']))
+        self.assertIsNone(redeem_ticket('made-up'))
+
+    def test_civilian_cannot_get_ticket(self):
+        response = self.client.post(reverse('agency-stream-ticket'), **auth_header(self.civilian))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class AgencyEventStreamASGITests(TransactionTestCase):
+    def setUp(self):
+        civilian = create_user()
+        self.agency = create_agency()
+        self.officer = create_agency_user(self.agency)
+        self.alert, self.assignment = make_alert_with_assignment(civilian, self.agency)
+        self.token = str(RefreshToken.for_user(self.officer).access_token)
+
+    def test_civilian_token_is_rejected(self):
+        civilian_token = str(RefreshToken.for_user(self.alert.user).access_token)
+        response = async_to_sync(AsyncClient().get)(
+            reverse('agency-stream'), headers={'Authorization': f'Bearer {civilian_token}'},
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_access_token_in_query_string_is_not_accepted(self):
+        response = async_to_sync(AsyncClient().get)(reverse('agency-stream'), {'token': self.token})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_spent_ticket_is_rejected(self):
+        ticket = issue_ticket(self.agency.agency_id)
+        redeem_ticket(ticket)
+        response = async_to_sync(AsyncClient().get)(reverse('agency-stream'), {'ticket': ticket})
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_reconnect_replays_missed_events(self):
+        first = AgencyEvent.objects.create(agency=self.agency, kind='alert.status', payload='{"n": 1}')
+        AgencyEvent.objects.create(agency=self.agency, kind='alert.status', payload='{"n": 2}')
+
+        async def read_stream():
+            response = await AsyncClient().get(
+                reverse('agency-stream'), {'ticket': issue_ticket(self.agency.agency_id)},
+                headers={'Last-Event-ID': str(first.event_id)},
+            )
+            chunks = response.streaming_content
+            received = [await anext(chunks), await anext(chunks)]
+            await chunks.aclose()
+            return response, received
+
+        response, received = async_to_sync(read_stream)()
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(received[0].startswith(b'retry:'))
+        self.assertIn(b'data: {"n": 2}', received[1])
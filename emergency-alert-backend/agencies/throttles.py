@@ -1,4 +1,4 @@
-from rest_framework.throttling import UserRateThrottle
+from alert_system.throttles import UserRateThrottle
 
 
 class AgencyPollingThrottle(UserRateThrottle):
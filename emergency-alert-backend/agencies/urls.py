@@ -1,16 +1,26 @@
 from django.urls import path
 from .views import (
     AgencyAlertListView,
+    AgencyAlertHistoryView,
     AcknowledgeAlertView,
     UpdateAlertStatusView,
     AlertLocationView,
+    AlertTrackView,
+    AssignmentNotificationsView,
+    AgencyStreamTicketView,
     RegisterAgencyDeviceView,
 )
+from .stream import agency_stream
 
 urlpatterns = [
     path('alerts/', AgencyAlertListView.as_view(), name='agency-alert-list'),
+    path('alerts/history/', AgencyAlertHistoryView.as_view(), name='agency-alert-history'),
     path('alerts/<int:assignment_id>/acknowledge/', AcknowledgeAlertView.as_view(), name='agency-alert-acknowledge'),
     path('alerts/<int:assignment_id>/status/', UpdateAlertStatusView.as_view(), name='agency-alert-status'),
     path('alerts/<int:assignment_id>/location/', AlertLocationView.as_view(), name='agency-alert-location'),
+    path('alerts/<int:assignment_id>/notifications/', AssignmentNotificationsView.as_view(), name='agency-alert-notifications'),
+    path('alerts/<int:assignment_id>/track/', AlertTrackView.as_view(), name='agency-alert-track'),
+    path('stream/', agency_stream, name='agency-stream'),
+    path('stream/ticket/', AgencyStreamTicketView.as_view(), name='agency-stream-ticket'),
     path('register-device/', RegisterAgencyDeviceView.as_view(), name='agency-register-device'),
 ]
@@ -1,35 +1,150 @@
+from django.db.models import Max
 from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 from rest_framework import status
+from rest_framework.pagination import CursorPagination
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 
-from alerts.models import AlertAssignment, Acknowledgment
-from alerts.serializers import AlertAssignmentSerializer, AcknowledgmentSerializer
+from alerts.models import AlertAssignment, Acknowledgment, LocationPing
+from alerts.tracks import bucket_by_time, douglas_peucker, track_writer
+from alerts.sync import (
+    TOMBSTONE_RETENTION,
+    SYNC_OVERLAP,
+    close_assignments,
+    latest_removal,
+    make_sync_token,
+    parse_sync_token,
+    removed_since,
+    touch_assignments,
+)
+from alerts.correlation import propagate_to_linked_reports
+from alerts.projections import assignment_rows
+from alerts.serializers import AcknowledgmentSerializer, NotificationLogLiteSerializer
+from alerts.lifecycle import ALERT_STATUS_CHANGED, emit
 from .serializers import AcknowledgeAlertSerializer
+from .stream import TICKET_TTL_S, issue_ticket
 from .throttles import AgencyPollingThrottle
+from notifications.models import NotificationLog
 from notifications.services import NotificationDispatcher
+from notifications.escalation import cancel_escalation
+from admin_panel import sketches
 from alert_system.permissions import IsAgencyUser
 from alert_system.api_responses import error_response, derive_detail_from_errors
+from alert_system.conditional import is_not_modified, make_etag, not_modified_response, with_etag
 
 
 class AgencyAlertListView(APIView):
+    """
+    GET /api/agency/alerts/
+    Without parameters: the agency's active assignments (alert dispatched,
+    acknowledged or responding).  Resolved and cancelled work is served page
+    by page from /api/agency/alerts/history/, so a poll costs the same after
+    years of operation as on day one.
+
+    Delta mode: ?since=<sync_token> (use 0 for the first poll) returns
+      {sync_token, full, assignments, removed}
+    where assignments holds only rows changed since the token (including
+    assignments that have just been closed, so clients see the transition)
+    and removed the ids of deleted assignments.  full=true means the token
+    was too old (or 0) and assignments is a snapshot of the active
+    assignments that replaces the client cache.
+
+    Both modes send an ETag derived from the active count, the newest
+    updated_at and the newest deletion; a matching If-None-Match gets 304
+    without serialization.
+    """
     permission_classes = [IsAuthenticated, IsAgencyUser]
     throttle_classes = [AgencyPollingThrottle]
 
     def get(self, request):
         agency = request.user.agency_profile.agency
-        assignments = (
-            AlertAssignment.objects
-            .filter(agency=agency)
-            .select_related('alert__location', 'alert__user', 'agency')
-            .prefetch_related('acknowledgment', 'notifications')
-            .order_by('-assigned_at')
+        started = timezone.now()
+        visible = AlertAssignment.objects.filter(agency=agency, is_standby=False)
+        active = visible.filter(is_active=True)
+
+        # Each part is a single index probe or short range scan.
+        etag = make_etag(
+            'agency-alerts', agency.agency_id, request.query_params.get('since'),
+            active.count(),
+            visible.aggregate(latest=Max('updated_at'))['latest'],
+            latest_removal(agency),
         )
-        return Response(
-            AlertAssignmentSerializer(assignments, many=True, context={'request': request}).data,
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
+        # Serialized through the flat values_list() projection (same JSON as
+        # AlertAssignmentSerializer, a fraction of the CPU).
+        assignments = visible.order_by('-assigned_at')
+
+        if 'since' not in request.query_params:
+            return with_etag(Response(
+                assignment_rows(assignments.filter(is_active=True)),
+                status=status.HTTP_200_OK,
+            ), etag)
+
+        try:
+            since = parse_sync_token(request.query_params['since'])
+        except (TypeError, ValueError, OverflowError, OSError):
+            return error_response(
+                detail='Invalid sync token.',
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        full = since is None or since < started - TOMBSTONE_RETENTION
+        removed = []
+        if full:
+            assignments = assignments.filter(is_active=True)
+        else:
+            assignments = assignments.filter(updated_at__gt=since - SYNC_OVERLAP)
+            removed = removed_since(agency, since)
+
+        return with_etag(Response(
+            {
+                'sync_token': make_sync_token(started),
+                'full': full,
+                'assignments': assignment_rows(assignments),
+                'removed': removed,
+            },
             status=status.HTTP_200_OK,
+        ), etag)
+
+
+class AgencyAlertHistoryPagination(CursorPagination):
+    page_size = 25
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-assigned_at', '-assignment_id')
+
+
+class AgencyAlertHistoryView(APIView):
+    """
+    GET /api/agency/alerts/history/
+    The agency's resolved and cancelled assignments, newest first:
+      {next, previous, results}
+    Keyset pagination on assigned_at: follow `next` for older pages.  Every
+    page is one range read of the (agency, is_active, assigned_at) index, so
+    deep pages cost the same as the first.
+    """
+    permission_classes = [IsAuthenticated, IsAgencyUser]
+
+    def get(self, request):
+        agency = request.user.agency_profile.agency
+        # Paginate on the key columns only, then project the page.
+        keys = (
+            AlertAssignment.objects
+            .filter(agency=agency, is_standby=False, is_active=False)
+            .only('assignment_id', 'assigned_at')
+        )
+        paginator = AgencyAlertHistoryPagination()
+        page = paginator.paginate_queryset(keys, request, view=self)
+        rows = assignment_rows(
+            AlertAssignment.objects
+            .filter(assignment_id__in=[a.assignment_id for a in page])
+            .order_by(*AgencyAlertHistoryPagination.ordering)
         )
+        return paginator.get_paginated_response(rows)
 
 
 class AcknowledgeAlertView(APIView):
@@ -41,7 +156,7 @@ class AcknowledgeAlertView(APIView):
         try:
             assignment = AlertAssignment.objects.select_related(
                 'alert__user', 'agency'
-            ).get(assignment_id=assignment_id, agency=agency)
+            ).get(assignment_id=assignment_id, agency=agency, is_standby=False)
         except AlertAssignment.DoesNotExist:
             return error_response(
                 detail='Assignment not found.',
@@ -76,11 +191,19 @@ class AcknowledgeAlertView(APIView):
 
         assignment.notification_status = 'DELIVERED'
         assignment.response_time = timezone.now()
-        assignment.save(update_fields=['notification_status', 'response_time'])
+        assignment.save(update_fields=['notification_status', 'response_time', 'updated_at'])
+        sketches.record(
+            sketches.RESPONSE, assignment.agency_id,
+            (assignment.response_time - assignment.assigned_at).total_seconds(), assignment.response_time,
+        )
 
         alert = assignment.alert
         alert.status = 'ACKNOWLEDGED'
-        alert.save(update_fields=['status'])
+        alert.escalation_due_at = None
+        alert.save(update_fields=['status', 'escalation_due_at', 'updated_at'])
+        cancel_escalation(alert.alert_id)
+        propagate_to_linked_reports(alert, ['status'])
+        emit(ALERT_STATUS_CHANGED, alert.alert_id, status=alert.status)
 
         dispatcher = NotificationDispatcher()
         dispatcher.send_user_acknowledgment(
@@ -117,7 +240,7 @@ class UpdateAlertStatusView(APIView):
         try:
             assignment = AlertAssignment.objects.select_related(
                 'alert__user'
-            ).prefetch_related('acknowledgment').get(assignment_id=assignment_id, agency=agency)
+            ).prefetch_related('acknowledgment').get(assignment_id=assignment_id, agency=agency, is_standby=False)
         except AlertAssignment.DoesNotExist:
             return error_response(
                 detail='Assignment not found.',
@@ -139,12 +262,18 @@ class UpdateAlertStatusView(APIView):
             )
 
         alert.status = new_status
-        update_fields = ['status']
+        update_fields = ['status', 'updated_at']
         if new_status == 'RESOLVED':
             alert.resolved_at = timezone.now()
             alert.resolved_by = request.user.full_name
             update_fields += ['resolved_at', 'resolved_by']
         alert.save(update_fields=update_fields)
+        if new_status == 'RESOLVED':
+            close_assignments(alert=alert)
+        else:
+            touch_assignments(alert=alert)
+        propagate_to_linked_reports(alert, update_fields)
+        emit(ALERT_STATUS_CHANGED, alert.alert_id, status=alert.status)
 
         NotificationDispatcher().send_status_update(assignment, new_status)
 
@@ -163,7 +292,7 @@ class AlertLocationView(APIView):
         try:
             assignment = AlertAssignment.objects.select_related(
                 'alert__location'
-            ).get(assignment_id=assignment_id, agency=agency)
+            ).get(assignment_id=assignment_id, agency=agency, is_standby=False)
         except AlertAssignment.DoesNotExist:
             return error_response(
                 detail='Assignment not found.',
@@ -192,6 +321,113 @@ class AlertLocationView(APIView):
         )
 
 
+class AssignmentNotificationsView(APIView):
+    """
+    GET /api/agency/alerts/{assignment_id}/notifications/
+    Every delivery attempt for one assignment, oldest first.  List payloads
+    only carry the per-channel `delivery` summary.
+    """
+    permission_classes = [IsAuthenticated, IsAgencyUser]
+
+    def get(self, request, assignment_id):
+        agency = request.user.agency_profile.agency
+        if not AlertAssignment.objects.filter(assignment_id=assignment_id, agency=agency, is_standby=False).exists():
+            return error_response(
+                detail='Assignment not found.',
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+        logs = NotificationLog.objects.filter(assignment_id=assignment_id).order_by('log_id')
+        return Response(NotificationLogLiteSerializer(logs, many=True).data, status=status.HTTP_200_OK)
+
+
+class AlertTrackView(APIView):
+    """
+    GET /api/agency/alerts/{assignment_id}/track/
+    Movement history of the civilian, oldest first, as compact
+    [latitude, longitude, recorded_at, accuracy] rows.
+    Optional query params:
+      ?since=<ISO datetime>   only pings recorded after this time
+      ?tolerance_m=<metres>   Douglas-Peucker tolerance (default 10, 0 = off)
+      ?bucket_s=<seconds>     keep one ping per time bucket (default 0 = off)
+    """
+    permission_classes = [IsAuthenticated, IsAgencyUser]
+    throttle_classes = [AgencyPollingThrottle]
+
+    DEFAULT_TOLERANCE_M = 10.0
+
+    def get(self, request, assignment_id):
+        agency = request.user.agency_profile.agency
+
+        alert_id = (
+            AlertAssignment.objects
+            .filter(assignment_id=assignment_id, agency=agency, is_standby=False)
+            .values_list('alert_id', flat=True)
+            .first()
+        )
+        if alert_id is None:
+            return error_response(
+                detail='Assignment not found.',
+                status_code=status.HTTP_404_NOT_FOUND,
+            )
+
+        try:
+            tolerance_m = float(request.query_params.get('tolerance_m', self.DEFAULT_TOLERANCE_M))
+            bucket_s = int(request.query_params.get('bucket_s', 0))
+            if tolerance_m < 0 or bucket_s < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            return error_response(
+                detail='tolerance_m and bucket_s must be non-negative numbers.',
+                status_code=status.HTTP_400_BAD_REQUEST,
+            )
+
+        pings = LocationPing.objects.filter(alert_id=alert_id)
+        if raw_since := request.query_params.get('since'):
+            since = parse_datetime(raw_since)
+            if since is None:
+                return error_response(
+                    detail='since must be an ISO 8601 datetime.',
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                )
+            pings = pings.filter(recorded_at__gt=since)
+
+        # Make this process's buffered pings visible before reading.
+        track_writer.flush()
+        rows = list(
+            pings.order_by('recorded_at', 'ping_id')
+            .values_list('lat_e7', 'lng_e7', 'recorded_at', 'accuracy')
+        )
+        raw_count = len(rows)
+        rows = douglas_peucker(bucket_by_time(rows, bucket_s), tolerance_m)
+
+        scale = LocationPing.SCALE
+        return Response(
+            {
+                'alert_id': alert_id,
+                'raw_count': raw_count,
+                'fields': ['latitude', 'longitude', 'recorded_at', 'accuracy'],
+                'points': [
+                    [lat / scale, lng / scale, recorded_at, accuracy]
+                    for lat, lng, recorded_at, accuracy in rows
+                ],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AgencyStreamTicketView(APIView):
+    """
+    POST /api/agency/stream/ticket/
+    A single-use ticket for opening /api/agency/stream/?ticket=<ticket>
+    (see agencies.stream), so the access token never appears in a URL.
+    """
+    permission_classes = [IsAuthenticated, IsAgencyUser]
+
+    def post(self, request):
+        ticket = issue_ticket(request.user.agency_profile.agency_id)
+        return Response({'ticket': ticket, 'expires_in': TICKET_TTL_S}, status=status.HTTP_201_CREATED)
+
+
 class RegisterAgencyDeviceView(APIView):
     """
     POST /api/agency/register-device/
@@ -0,0 +1,96 @@
+"""
+Response compression for API payloads.
+
+Assignment lists and alert histories are large, repetitive JSON (or
+MessagePack) documents that clients on mobile networks download on every
+poll.  This middleware compresses them with brotli when the client accepts
+`br` and the brotli module is installed, otherwise with gzip, and leaves
+small bodies alone: below RESPONSE_COMPRESSION_MIN_BYTES the framing costs
+more than it saves.  Streams (the SSE endpoint) are never buffered.
+
+API responses are negotiated on Accept as well as Accept-Encoding, so both
+are added to Vary.
+"""
+import gzip
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ('application/json', 'application/msgpack', 'text/')
+
+GZIP_LEVEL = 6
+# Quality 5 is the usual choice for dynamic content: most of the ratio of the
+# higher levels at a fraction of the CPU.
+BROTLI_QUALITY = 5
+
+
+def accepted_encodings(header):
+    """Encodings named in Accept-Encoding with a non-zero q-value."""
+    accepted = set()
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding and q > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def choose_encoding(header):
+    accepted = accepted_encodings(header or '')
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(content, encoding):
+    if encoding == 'br':
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL)
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    # MiddlewareMixin keeps the chain async-capable for the ASGI-only views.
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith(('application/json', 'application/msgpack')):
+            patch_vary_headers(response, ('Accept',))
+        if (
+            response.streaming
+            or response.has_header('Content-Encoding')
+            or not content_type.startswith(COMPRESSIBLE_TYPES)
+        ):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        if len(response.content) < settings.RESPONSE_COMPRESSION_MIN_BYTES:
+            return response
+        encoding = choose_encoding(request.headers.get('Accept-Encoding'))
+        if encoding is None:
+            return response
+
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            # The bytes changed, so a strong validator no longer matches them.
+            response['ETag'] = 'W/' + etag
+        return response
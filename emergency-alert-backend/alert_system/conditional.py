@@ -0,0 +1,45 @@
+import hashlib
+
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def make_etag(*parts):
+    """
+    Weak ETag from a version tuple (ids, max updated_at, row counts, ...).
+
+    Views build the tuple from cheap aggregate queries, so an unchanged poll
+    is answered without loading or serializing the payload.
+    """
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _opaque(tag):
+    tag = tag.strip()
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def is_not_modified(request, etag):
+    """True when the request's If-None-Match already names this ETag."""
+    header = request.META.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return _opaque(etag) in {_opaque(tag) for tag in header.split(',')}
+
+
+def with_etag(response, etag):
+    """
+    Attach the ETag to a 200 response.  no-cache lets browsers keep the body
+    but forces them to revalidate on every poll, so a browser client gets the
+    304 savings without any code of its own.
+    """
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified_response(etag):
+    return with_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
@@ -0,0 +1,69 @@
+"""
+Query plans of ORM querysets, for regression checks on the hot queries.
+
+plan() returns the backend's plan as text lines; full_scans(), index_scans()
+and sorts() pick out the regressions that matter once tables grow:
+
+  - a table read in full instead of through an index
+    (SQLite "SCAN <table>" without an index, MySQL access type ALL);
+  - a whole index walked instead of a range of it
+    (SQLite "SCAN <table> USING INDEX", MySQL access type index) --
+    fine for an unfiltered page read in index order, a scan otherwise;
+  - an ORDER BY that no index satisfies
+    (SQLite "USE TEMP B-TREE FOR ORDER BY", MySQL "Using filesort").
+
+SQLite plans come from the schema alone, so they are stable on the tiny
+test tables.  MySQL's optimizer also weighs table statistics and may
+prefer a scan while a table is nearly empty; check it on realistic data.
+"""
+import re
+
+from django.db import connections
+
+_SQLITE_FULL_SCAN = re.compile(r'^SCAN (\w+)$')
+_SQLITE_INDEX_SCAN = re.compile(r'^SCAN (\w+) USING (?:COVERING )?INDEX ')
+
+
+def _explain(queryset):
+    connection = connections[queryset.db]
+    sql, params = queryset.query.sql_with_params()
+    prefix = 'EXPLAIN QUERY PLAN ' if connection.vendor == 'sqlite' else 'EXPLAIN '
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + sql, params)
+        columns = [column[0] for column in cursor.description]
+        return connection.vendor, [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def plan(queryset):
+    """The plan as one line per step."""
+    vendor, rows = _explain(queryset)
+    if vendor == 'sqlite':
+        return [row['detail'] for row in rows]
+    return [
+        f"{row.get('table')}: {row.get('type')} key={row.get('key')} {row.get('Extra') or ''}".rstrip()
+        for row in rows
+    ]
+
+
+def full_scans(queryset):
+    """Tables the plan reads in full."""
+    vendor, rows = _explain(queryset)
+    if vendor == 'sqlite':
+        return [match[1] for row in rows if (match := _SQLITE_FULL_SCAN.match(row['detail']))]
+    return [row['table'] for row in rows if row.get('type') == 'ALL']
+
+
+def index_scans(queryset):
+    """Tables the plan reads by walking a whole index."""
+    vendor, rows = _explain(queryset)
+    if vendor == 'sqlite':
+        return [match[1] for row in rows if (match := _SQLITE_INDEX_SCAN.match(row['detail']))]
+    return [row['table'] for row in rows if row.get('type') == 'index']
+
+
+def sorts(queryset):
+    """Plan steps that sort rows instead of reading them in index order."""
+    vendor, rows = _explain(queryset)
+    if vendor == 'sqlite':
+        return [row['detail'] for row in rows if row['detail'].endswith('FOR ORDER BY')]
+    return [row['table'] for row in rows if 'Using filesort' in (row.get('Extra') or '')]
@@ -0,0 +1,48 @@
+"""
+Shared plumbing for the async realtime endpoints (agency SSE stream, civilian
+status long-poll).  These are plain Django async views rather than DRF
+APIViews, so they authenticate and report errors themselves.
+"""
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import JsonResponse
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken, TokenError
+
+
+def json_error(detail, status_code):
+    """error_response() envelope for plain Django (non-DRF) views."""
+    return JsonResponse({'detail': detail, 'error': detail}, status=status_code)
+
+
+def authenticate_jwt(request):
+    """
+    JWT authentication (Authorization header) for the async (non-DRF)
+    realtime views.  Returns (user, None) or (None, error response).
+    Synchronous: call it through sync_to_async.
+    """
+    header = request.headers.get('Authorization', '')
+    raw = header[len('Bearer '):] if header.startswith('Bearer ') else None
+    if not raw:
+        return None, json_error('Authentication credentials were not provided.', 401)
+
+    auth = JWTAuthentication()
+    try:
+        return auth.get_user(auth.get_validated_token(raw)), None
+    except (InvalidToken, AuthenticationFailed, TokenError):
+        return None, json_error('Given token not valid for any token type', 401)
+
+
+def db_sync(fn):
+    """
+    sync_to_async for ORM work from long-lived coroutines.  Not
+    thread-sensitive, so a hub task can outlive the request that started it;
+    stale connections of the worker thread are recycled around each call.
+    """
+    def run(*args):
+        close_old_connections()
+        try:
+            return fn(*args)
+        finally:
+            close_old_connections()
+    return sync_to_async(run, thread_sensitive=False)
@@ -53,6 +53,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'alert_system.compression.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -96,6 +97,42 @@ DATABASES = {
     }
 }
 
+# Cache shared by every worker process.  The cross-process report
+# single-flight, location update coalescing, status payload cache and agency
+# stream tickets all assume one cache per deployment, so the per-process
+# LocMemCache default is not enough.  Production runs on Redis (REDIS_URL).
+# Without it, tables in the main database are used: create them once with
+# `python manage.py createcachetable`.  The database cache counts its rows
+# on every write and culls a third of them past MAX_ENTRIES, so the limit is
+# set far above the live key count, and the throttle histories (written on
+# every request) get an alias of their own so they never evict the rest.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+        'throttle': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'throttle',
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100_000},
+        },
+        'throttle': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_throttle_cache',
+            'OPTIONS': {'MAX_ENTRIES': 100_000},
+        },
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -142,11 +179,23 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ],
     'EXCEPTION_HANDLER': 'alert_system.exceptions.custom_exception_handler',
+    # JSON stays the default; clients may ask for MessagePack instead.
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'alert_system.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'alert_system.renderers.MessagePackParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.UserRateThrottle',
+        'alert_system.throttles.UserRateThrottle',
     ],
     'DEFAULT_THROTTLE_RATES': {
         'user': '100/hour',
@@ -166,6 +215,63 @@ REST_FRAMEWORK = {
 # Dispatch notifications asynchronously after alert creation commit.
 ALERT_DISPATCH_ASYNC = config('ALERT_DISPATCH_ASYNC', cast=bool, default=True)
 
+# Tiered escalation: notify the closest N agencies of each type first and
+# release the next ring only if nobody acknowledges within the timeout.
+# A ring size of 0 notifies every matching agency at once.
+# The timeout can be overridden at runtime via SystemSetting 'escalation_timeout_s'.
+ALERT_ESCALATION_RING_SIZE = config('ALERT_ESCALATION_RING_SIZE', cast=int, default=1)
+ALERT_ESCALATION_TIMEOUT_S = config('ALERT_ESCALATION_TIMEOUT_S', cast=int, default=90)
+
+# Incident correlation: reports of these types filed within the radius and
+# time window of an active alert are linked to it instead of re-dispatched.
+ALERT_CORRELATION_TYPES = [
+    t.strip() for t in config(
+        'ALERT_CORRELATION_TYPES', default='FIRE_INCIDENCE,ACCIDENT'
+    ).split(',') if t.strip()
+]
+ALERT_CORRELATION_RADIUS_M = config('ALERT_CORRELATION_RADIUS_M', cast=int, default=300)
+ALERT_CORRELATION_WINDOW_MIN = config('ALERT_CORRELATION_WINDOW_MIN', cast=int, default=30)
+
+# Offline reverse geocoding: compiled gazetteer file (manage.py build_gazetteer).
+# Leave empty to disable; lookups beyond the max distance return no place.
+GAZETTEER_PATH = config('GAZETTEER_PATH', default='')
+GAZETTEER_MAX_DISTANCE_KM = config('GAZETTEER_MAX_DISTANCE_KM', cast=float, default=25.0)
+
+# Location tracks: pings are buffered in memory and bulk-inserted once the
+# batch fills up or the flush interval elapses (batch size 1 = write-through).
+LOCATION_TRACK_BATCH_SIZE = config('LOCATION_TRACK_BATCH_SIZE', cast=int, default=50)
+LOCATION_TRACK_FLUSH_INTERVAL_S = config('LOCATION_TRACK_FLUSH_INTERVAL_S', cast=float, default=5.0)
+
+# Location PATCHes closer together than this many seconds, or moving less
+# than this many metres from the last accepted position, are coalesced.
+# The interval is returned to the app as update_interval_s.
+LOCATION_UPDATE_MIN_INTERVAL_S = config('LOCATION_UPDATE_MIN_INTERVAL_S', cast=int, default=10)
+LOCATION_UPDATE_MIN_DISTANCE_M = config('LOCATION_UPDATE_MIN_DISTANCE_M', cast=float, default=10.0)
+
+# Agency SSE stream (/api/agency/stream/, ASGI only): how often each ASGI
+# process polls the event table, and the keep-alive comment interval.
+AGENCY_STREAM_POLL_INTERVAL_S = config('AGENCY_STREAM_POLL_INTERVAL_S', cast=float, default=0.5)
+AGENCY_STREAM_HEARTBEAT_S = config('AGENCY_STREAM_HEARTBEAT_S', cast=float, default=15.0)
+
+# Full civilian status payloads are cached per alert and served while their
+# version (ETag) is current; the TTL only bounds memory use.
+ALERT_STATUS_CACHE_TTL_S = config('ALERT_STATUS_CACHE_TTL_S', cast=int, default=300)
+
+# Civilian status long-poll (/api/alerts/<id>/status/wait/, ASGI only): the
+# longest a request is parked, and how often parked alerts are re-checked.
+ALERT_STATUS_WAIT_TIMEOUT_S = config('ALERT_STATUS_WAIT_TIMEOUT_S', cast=float, default=25.0)
+ALERT_STATUS_WAIT_POLL_INTERVAL_S = config('ALERT_STATUS_WAIT_POLL_INTERVAL_S', cast=float, default=1.0)
+
+# Admin analytics payloads (admin_panel.report_cache) are served from the
+# cache for ADMIN_REPORT_CACHE_TTL_S, then served stale while one background
+# refresh runs for up to ADMIN_REPORT_STALE_S more.
+ADMIN_REPORT_CACHE_TTL_S = config('ADMIN_REPORT_CACHE_TTL_S', cast=int, default=60)
+ADMIN_REPORT_STALE_S = config('ADMIN_REPORT_STALE_S', cast=int, default=300)
+
+# Responses at least this large are gzip/brotli compressed when the client
+# accepts it (alert_system.compression).
+RESPONSE_COMPRESSION_MIN_BYTES = config('RESPONSE_COMPRESSION_MIN_BYTES', cast=int, default=1024)
+
 # Simple JWT
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
@@ -10,6 +10,17 @@ DATABASES = {
     }
 }
 
+# Tests run in one process, so a local cache behaves like the shared one.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'throttle': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'throttle',
+    },
+}
+
 # Speed up password hashing in tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
@@ -29,6 +40,7 @@ REST_FRAMEWORK = {
 
 # Keep tests deterministic and avoid thread timing issues under SQLite.
 ALERT_DISPATCH_ASYNC = False
+LOCATION_TRACK_BATCH_SIZE = 1
 
 # Suppress expected DB-fallback warning from AlertCreationThrottle (SystemSetting
 # row does not exist in the test DB, so the warning fires on every throttle check).
@@ -0,0 +1,12 @@
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework import throttling
+
+
+class UserRateThrottle(throttling.UserRateThrottle):
+    """
+    DRF's per-user throttle, kept on the 'throttle' cache alias: its request
+    histories are rewritten on every call and must not evict (or be evicted
+    by) the application's cache entries.
+    """
+    cache = ConnectionProxy(caches, 'throttle')
@@ -3,3 +3,10 @@ from django.apps import AppConfig
 
 class AlertsConfig(AppConfig):
     name = 'alerts'
+
+    def ready(self):
+        from .lifecycle import ALERT_STATUS_CHANGED, subscribe
+        from .status_payload import on_alert_event
+        from .views import on_alert_status_changed
+        subscribe(on_alert_event, ALERT_STATUS_CHANGED)
+        subscribe(on_alert_status_changed, ALERT_STATUS_CHANGED)
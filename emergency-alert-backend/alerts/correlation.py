@@ -0,0 +1,137 @@
+"""
+Spatio-temporal incident correlation.
+
+During a market fire or a highway pile-up many civilians report the same
+incident within minutes.  Instead of dispatching every report, a new alert
+of a correlated type is linked to an active alert of the same type reported
+within ALERT_CORRELATION_RADIUS_M metres and ALERT_CORRELATION_WINDOW_MIN
+minutes.  The linked report is stored (so every reporter is recorded) but
+creates no assignments and sends no agency notifications.
+
+Lookup cost: the (alert_type, created_at) index narrows the search to the
+few recent alerts of one type, a latitude/longitude bounding box trims
+them further, and only the survivors get an exact haversine check.
+"""
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.utils import timezone
+
+from .geo import bounding_box, haversine_km
+from .models import EmergencyAlert
+from .sync import touch_assignments
+
+# Statuses in which an incident is still being handled and can absorb reports.
+ACTIVE_INCIDENT_STATUSES = ('PENDING', 'DISPATCHED', 'ACKNOWLEDGED', 'RESPONDING')
+
+PRIORITY_RANK = {'LOW': 0, 'MEDIUM': 1, 'HIGH': 2, 'CRITICAL': 3}
+
+
+def _coord(value):
+    return Decimal(str(round(value, 7)))
+
+
+def find_parent_incident(alert_type, latitude, longitude, now=None):
+    """
+    Return the closest active root alert that the new report duplicates,
+    or None when the report starts a new incident.
+    """
+    if alert_type not in settings.ALERT_CORRELATION_TYPES:
+        return None
+
+    radius_m = settings.ALERT_CORRELATION_RADIUS_M
+    if radius_m <= 0:
+        return None
+
+    lat, lng = float(latitude), float(longitude)
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_m)
+    since = (now or timezone.now()) - timedelta(minutes=settings.ALERT_CORRELATION_WINDOW_MIN)
+
+    candidates = (
+        EmergencyAlert.objects
+        .filter(
+            alert_type=alert_type,
+            created_at__gte=since,
+            parent_alert__isnull=True,
+            status__in=ACTIVE_INCIDENT_STATUSES,
+            location__latitude__range=(_coord(min_lat), _coord(max_lat)),
+            location__longitude__range=(_coord(min_lng), _coord(max_lng)),
+        )
+        .select_related('location')
+        .order_by('created_at')
+    )
+
+    best, best_km = None, None
+    for candidate in candidates:
+        dist_km = haversine_km(
+            lat, lng,
+            float(candidate.location.latitude), float(candidate.location.longitude),
+        )
+        if dist_km * 1000 <= radius_m and (best_km is None or dist_km < best_km):
+            best, best_km = candidate, dist_km
+    return best
+
+
+def link_to_incident(alert, parent):
+    """
+    Attach a freshly created report to its parent incident.
+    The report mirrors the incident status, and a more severe report raises
+    the incident's priority so responders see the worst reported picture.
+    """
+    alert.parent_alert = parent
+    alert.status = parent.status
+    alert.save(update_fields=['parent_alert', 'status', 'updated_at'])
+
+    if PRIORITY_RANK.get(alert.priority_level, 0) > PRIORITY_RANK.get(parent.priority_level, 0):
+        parent.priority_level = alert.priority_level
+        parent.save(update_fields=['priority_level', 'updated_at'])
+        touch_assignments(alert=parent)
+
+
+def propagate_to_linked_reports(alert, update_fields):
+    """
+    Copy lifecycle fields from an incident to its still-open linked reports,
+    so every reporter sees the progress of the one dispatch.
+    """
+    values = {field: getattr(alert, field) for field in update_fields}
+    values['updated_at'] = timezone.now()
+    return (
+        EmergencyAlert.objects
+        .filter(parent_alert=alert)
+        .exclude(status__in=('RESOLVED', 'CANCELLED'))
+        .update(**values)
+    )
+
+
+def hand_over_incident(alert, escalation_due_at=None):
+    """
+    Called when the reporter who owns an incident cancels it.  If other
+    reports are still linked, the earliest open one becomes the new incident
+    root and takes over the assignments, so agencies keep responding.
+    escalation_due_at is the cancelled root's pending deadline, which the
+    successor inherits (the caller has already cleared it on the root).
+
+    Returns the new root alert, or None when there is nobody to hand over to.
+    """
+    from .models import AlertAssignment
+
+    successor = (
+        EmergencyAlert.objects
+        .filter(parent_alert=alert)
+        .exclude(status__in=('RESOLVED', 'CANCELLED'))
+        .order_by('created_at')
+        .first()
+    )
+    if successor is None:
+        return None
+
+    AlertAssignment.objects.filter(alert=alert).update(alert=successor, updated_at=timezone.now())
+    EmergencyAlert.objects.filter(parent_alert=alert).exclude(pk=successor.pk).update(
+        parent_alert=successor,
+    )
+    successor.parent_alert = None
+    successor.priority_level = alert.priority_level
+    successor.escalation_due_at = escalation_due_at
+    successor.save(update_fields=['parent_alert', 'priority_level', 'escalation_due_at', 'updated_at'])
+    return successor
@@ -0,0 +1,26 @@
+import math
+
+EARTH_RADIUS_KM = 6371.0
+
+# Length of one degree of latitude in metres (close enough everywhere for
+# bounding-box prefilters; exact distances use haversine_km).
+METRES_PER_DEGREE_LAT = 111_320.0
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in kilometres (Haversine formula)."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return EARTH_RADIUS_KM * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bounding_box(lat, lng, radius_m):
+    """
+    Return (min_lat, max_lat, min_lng, max_lng) of a box that contains every
+    point within radius_m of (lat, lng).  Used as an index-friendly prefilter.
+    """
+    dlat = radius_m / METRES_PER_DEGREE_LAT
+    dlng = radius_m / (METRES_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
@@ -0,0 +1,239 @@
+"""
+Offline reverse geocoding from a memory-mapped gazetteer.
+
+Agency SMS/email used to read "Address unavailable" whenever the civilian app
+sent no address, and an online geocoder is too slow and unreliable to call on
+the alert-creation path.  Instead, a local gazetteer (GeoNames or a plain CSV
+of places) is compiled once by `manage.py build_gazetteer` into a compact
+binary grid, and every worker maps that file read-only.  The OS page cache
+shares the pages between processes, nothing is copied into Python objects up
+front, and a lookup touches only the few grid cells around the point.
+
+File layout (little-endian):
+
+    header   MAGIC, version, min_lat, min_lng, cell_deg, rows, cols,
+             record_count, strings_offset
+    cells    (rows * cols + 1) uint32 record offsets (CSR layout: the records
+             of cell i are records[cells[i]:cells[i + 1]])
+    records  record_count x (lat_e6 int32, lng_e6 int32, name_off uint32,
+             state_off uint32)
+    strings  uint16 length-prefixed UTF-8 strings
+"""
+import csv
+import logging
+import math
+import mmap
+import struct
+import threading
+from collections import namedtuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'LGGZ'
+VERSION = 1
+HEADER = struct.Struct('<4sHHdddIIII')
+CELL = struct.Struct('<I')
+RECORD = struct.Struct('<iiII')
+STRLEN = struct.Struct('<H')
+
+Place = namedtuple('Place', ['name', 'state', 'distance_km'])
+
+
+class Gazetteer:
+    """Read-only view over a compiled gazetteer file."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic, version, _, self.min_lat, self.min_lng, self.cell_deg,
+            self.rows, self.cols, self.record_count, self._strings_offset,
+        ) = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} gazetteer file.')
+        self._cells_offset = HEADER.size
+        self._records_offset = self._cells_offset + (self.rows * self.cols + 1) * CELL.size
+
+    def _string(self, offset):
+        (length,) = STRLEN.unpack_from(self._mm, self._strings_offset + offset)
+        start = self._strings_offset + offset + STRLEN.size
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _cell_range(self, row, col):
+        index = row * self.cols + col
+        (start,) = CELL.unpack_from(self._mm, self._cells_offset + index * CELL.size)
+        (end,) = CELL.unpack_from(self._mm, self._cells_offset + (index + 1) * CELL.size)
+        return start, end
+
+    def nearest(self, lat, lng, max_distance_km):
+        """
+        Return the nearest Place within max_distance_km, or None.
+
+        Cells are searched in growing square rings around the point and the
+        search stops as soon as the next ring cannot contain anything closer.
+        Distances use the equirectangular approximation, which is accurate to
+        well under a percent at gazetteer search radii.
+        """
+        row = int((lat - self.min_lat) // self.cell_deg)
+        col = int((lng - self.min_lng) // self.cell_deg)
+        cos_lat = max(math.cos(math.radians(lat)), 0.01)
+        km_per_deg = 111.32
+        ring_km = self.cell_deg * km_per_deg * cos_lat
+        max_ring = int(max_distance_km / ring_km) + 1
+
+        best_d2, best = None, None
+        for ring in range(max_ring + 1):
+            # Anything in this ring is at least (ring - 1) cells away.
+            if best_d2 is not None and ((ring - 1) * ring_km) ** 2 > best_d2:
+                break
+            for r in range(row - ring, row + ring + 1):
+                if r < 0 or r >= self.rows:
+                    continue
+                for c in range(col - ring, col + ring + 1):
+                    if c < 0 or c >= self.cols:
+                        continue
+                    if max(abs(r - row), abs(c - col)) != ring:
+                        continue
+                    start, end = self._cell_range(r, c)
+                    for i in range(start, end):
+                        lat_e6, lng_e6, name_off, state_off = RECORD.unpack_from(
+                            self._mm, self._records_offset + i * RECORD.size
+                        )
+                        dy = (lat_e6 / 1e6 - lat) * km_per_deg
+                        dx = (lng_e6 / 1e6 - lng) * km_per_deg * cos_lat
+                        d2 = dx * dx + dy * dy
+                        if best_d2 is None or d2 < best_d2:
+                            best_d2, best = d2, (name_off, state_off)
+
+        if best is None or best_d2 > max_distance_km ** 2:
+            return None
+        name_off, state_off = best
+        return Place(self._string(name_off), self._string(state_off), math.sqrt(best_d2))
+
+
+def build_gazetteer(places, out_path, cell_deg=0.1):
+    """
+    Compile an iterable of (name, state, latitude, longitude) tuples into a
+    gazetteer file.  Returns the number of places written.
+    """
+    places = [
+        (name, state or '', float(lat), float(lng))
+        for name, state, lat, lng in places
+        if name
+    ]
+    if not places:
+        raise ValueError('Gazetteer source contains no places.')
+
+    min_lat = math.floor(min(p[2] for p in places) / cell_deg) * cell_deg
+    min_lng = math.floor(min(p[3] for p in places) / cell_deg) * cell_deg
+    rows = int((max(p[2] for p in places) - min_lat) // cell_deg) + 1
+    cols = int((max(p[3] for p in places) - min_lng) // cell_deg) + 1
+
+    strings = bytearray()
+    string_offsets = {}
+
+    def intern(value):
+        if value not in string_offsets:
+            # Cap at the length prefix, dropping any character the cut splits.
+            encoded = value.encode('utf-8')[:0xFFFF].decode('utf-8', 'ignore').encode('utf-8')
+            string_offsets[value] = len(strings)
+            strings.extend(STRLEN.pack(len(encoded)))
+            strings.extend(encoded)
+        return string_offsets[value]
+
+    buckets = {}
+    for name, state, lat, lng in places:
+        cell = int((lat - min_lat) // cell_deg) * cols + int((lng - min_lng) // cell_deg)
+        buckets.setdefault(cell, []).append(
+            (round(lat * 1e6), round(lng * 1e6), intern(name), intern(state))
+        )
+
+    cells = bytearray()
+    records = bytearray()
+    count = 0
+    for cell in range(rows * cols):
+        cells.extend(CELL.pack(count))
+        for record in buckets.get(cell, ()):
+            records.extend(RECORD.pack(*record))
+            count += 1
+    cells.extend(CELL.pack(count))
+
+    strings_offset = HEADER.size + len(cells) + len(records)
+    with open(out_path, 'wb') as fh:
+        fh.write(HEADER.pack(
+            MAGIC, VERSION, 0, min_lat, min_lng, cell_deg,
+            rows, cols, count, strings_offset,
+        ))
+        fh.write(cells)
+        fh.write(records)
+        fh.write(strings)
+    return count
+
+
+def read_csv_places(path):
+    """Read places from a CSV with name, state, latitude, longitude columns."""
+    with open(path, newline='', encoding='utf-8') as fh:
+        for row in csv.DictReader(fh):
+            yield row['name'].strip(), (row.get('state') or '').strip(), row['latitude'], row['longitude']
+
+
+def read_geonames_places(path, admin1_path=None):
+    """
+    Read places from a GeoNames dump (e.g. NG.txt or cities500.txt).
+    State names come from admin1CodesASCII.txt when admin1_path is given.
+    """
+    admin1 = {}
+    if admin1_path:
+        with open(admin1_path, encoding='utf-8') as fh:
+            for line in fh:
+                parts = line.rstrip('\n').split('\t')
+                if len(parts) >= 2:
+                    admin1[parts[0]] = parts[1]
+    with open(path, encoding='utf-8') as fh:
+        for line in fh:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) < 11 or parts[6] != 'P':  # populated places only
+                continue
+            state = admin1.get(f'{parts[8]}.{parts[10]}', '')
+            yield parts[1], state, parts[4], parts[5]
+
+
+_lock = threading.Lock()
+_gazetteers = {}
+
+
+def _get_gazetteer():
+    path = settings.GAZETTEER_PATH
+    if not path:
+        return None
+    gazetteer = _gazetteers.get(path)
+    if gazetteer is None:
+        with _lock:
+            gazetteer = _gazetteers.get(path)
+            if gazetteer is None:
+                try:
+                    gazetteer = Gazetteer(path)
+                except (OSError, ValueError) as exc:
+                    logger.warning(f"Gazetteer unavailable at {path}: {exc}")
+                    gazetteer = False
+                _gazetteers[path] = gazetteer
+    return gazetteer or None
+
+
+def reverse_geocode(latitude, longitude):
+    """Nearest gazetteer Place for a coordinate, or None if unknown/disabled."""
+    gazetteer = _get_gazetteer()
+    if gazetteer is None:
+        return None
+    return gazetteer.nearest(
+        float(latitude), float(longitude), settings.GAZETTEER_MAX_DISTANCE_KM,
+    )
+
+
+def describe_place(place):
+    """Human-readable address line used in agency notifications."""
+    if place.state and place.state != place.name:
+        return f"Near {place.name}, {place.state}"
+    return f"Near {place.name}"
@@ -0,0 +1,145 @@
+"""
+Alert lifecycle event bus.
+
+Code that changes an alert describes what happened with emit() instead of
+calling every interested party (dashboard stream, status cache, ...) itself:
+
+    emit(ALERT_STATUS_CHANGED, alert.alert_id, status=alert.status)
+
+Each event is
+  1. appended to the AlertEvent sequence table inside the caller's
+     transaction, so it exists exactly when the change it describes does,
+     and other processes can follow it with events_after(cursor); and
+  2. handed to the in-process subscribers after the transaction commits.
+     A rolled-back change reaches nobody.
+
+TRANSIENT_KINDS skip step 1: location changes arrive every few seconds per
+alert and are already kept as the track and as the agencies' AgencyEvent
+rows, so they are only delivered in-process (event_id None).
+
+Subscribers are registered from AppConfig.ready() with subscribe().  They
+run in the emitting thread after commit; an exception in one is logged and
+does not affect the others or the request.  Subscribers registered with
+atomic=True run inside emit() instead, in the caller's transaction, for
+writes that must commit or roll back with the change (outbox rows such as
+the agency dashboard events); an exception there propagates to the caller.
+
+event_ids are allocated at insert time, so a slower transaction can commit
+a lower id after a higher one became visible.  Followers should re-read a
+few seconds behind the newest id (see agencies.stream for the same scheme).
+"""
+import json
+import logging
+from collections import namedtuple
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AlertEvent
+
+logger = logging.getLogger(__name__)
+
+# A civilian alert was created and its first ring dispatched.
+#   data: alert_type, priority_level, status
+ALERT_CREATED = 'alert.created'
+# Assignments became visible to agencies after creation: an admin assignment
+# (data: assignment_id) or an escalation ring release (data: escalation_ring).
+#   data also: alert_type, priority_level, status
+ASSIGNMENTS_RELEASED = 'assignments.released'
+# status changed (acknowledged, responding, resolved, cancelled, or handed
+# over to a linked report: data: previous_alert_id).
+#   data: status
+ALERT_STATUS_CHANGED = 'alert.status_changed'
+# The civilian moved.
+#   data: latitude, longitude, accuracy, address, maps_url
+ALERT_LOCATION_CHANGED = 'alert.location_changed'
+
+KINDS = (ALERT_CREATED, ASSIGNMENTS_RELEASED, ALERT_STATUS_CHANGED, ALERT_LOCATION_CHANGED)
+# Delivered after commit but not recorded in AlertEvent.
+TRANSIENT_KINDS = (ALERT_LOCATION_CHANGED,)
+
+# Followers further behind than this have to resynchronize from the models.
+EVENT_RETENTION = timedelta(days=7)
+
+LifecycleEvent = namedtuple('LifecycleEvent', ['event_id', 'kind', 'alert_id', 'data', 'created_at'])
+
+_subscribers = {kind: [] for kind in KINDS}
+_atomic_subscribers = {kind: [] for kind in KINDS}
+
+
+def subscribe(handler, *kinds, atomic=False):
+    """
+    Call handler(event) for every event of the given kinds (default: all):
+    after commit, or with atomic=True inside the emitting transaction.
+    """
+    registry = _atomic_subscribers if atomic else _subscribers
+    for kind in kinds or KINDS:
+        if kind not in registry:
+            raise ValueError(f"Unknown alert event kind: {kind!r}")
+        if handler not in registry[kind]:
+            registry[kind].append(handler)
+
+
+def unsubscribe(handler, *kinds):
+    for registry in (_subscribers, _atomic_subscribers):
+        for kind in kinds or KINDS:
+            if handler in registry.get(kind, ()):
+                registry[kind].remove(handler)
+
+
+def _deliver(event):
+    for handler in list(_subscribers[event.kind]):
+        try:
+            handler(event)
+        except Exception:
+            logger.exception(f"Alert event subscriber {handler!r} failed for {event.kind} #{event.event_id}")
+
+
+def _deliver_atomic(event):
+    for handler in list(_atomic_subscribers[event.kind]):
+        handler(event)
+
+
+def emit(kind, alert_id, **data):
+    """Record an event in the current transaction and deliver it on commit."""
+    if kind not in _subscribers:
+        raise ValueError(f"Unknown alert event kind: {kind!r}")
+    payload = json.dumps(data, default=str)
+    if kind in TRANSIENT_KINDS:
+        event = LifecycleEvent(None, kind, alert_id, json.loads(payload), timezone.now())
+        _deliver_atomic(event)
+    else:
+        # One unit with the atomic subscribers' writes, even in autocommit.
+        with transaction.atomic():
+            row = AlertEvent.objects.create(alert_id=alert_id, kind=kind, payload=payload)
+            event = LifecycleEvent(row.event_id, kind, alert_id, json.loads(row.payload), row.created_at)
+            _deliver_atomic(event)
+    transaction.on_commit(lambda: _deliver(event))
+    return event
+
+
+def _to_event(event_id, kind, alert_id, payload, created_at):
+    return LifecycleEvent(event_id, kind, alert_id, json.loads(payload), created_at)
+
+
+def events_after(cursor, kinds=None, limit=500):
+    """Events with event_id > cursor, oldest first (for other processes)."""
+    events = AlertEvent.objects.filter(event_id__gt=cursor)
+    if kinds is not None:
+        events = events.filter(kind__in=kinds)
+    return [
+        _to_event(*row)
+        for row in events.order_by('event_id')
+        .values_list('event_id', 'kind', 'alert_id', 'payload', 'created_at')[:limit]
+    ]
+
+
+def latest_event_id():
+    return AlertEvent.objects.order_by('-event_id').values_list('event_id', flat=True).first() or 0
+
+
+def prune_events(now=None):
+    return AlertEvent.objects.filter(
+        created_at__lt=(now or timezone.now()) - EVENT_RETENTION,
+    ).delete()[0]
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from alerts.geocoder import build_gazetteer, read_csv_places, read_geonames_places
+
+
+class Command(BaseCommand):
+    help = (
+        'Compile a place list into the memory-mapped gazetteer used for offline '
+        'reverse geocoding. Point GAZETTEER_PATH at the output file.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', help='CSV (name,state,latitude,longitude) or GeoNames dump.')
+        parser.add_argument('output', help='Path of the compiled gazetteer file.')
+        parser.add_argument(
+            '--geonames', action='store_true',
+            help='Read the source as a GeoNames tab-separated dump.',
+        )
+        parser.add_argument(
+            '--admin1-codes',
+            help='GeoNames admin1CodesASCII.txt used to resolve state names.',
+        )
+        parser.add_argument(
+            '--cell-deg', type=float, default=0.1,
+            help='Grid cell size in degrees (default: 0.1).',
+        )
+
+    def handle(self, *args, **options):
+        if options['geonames']:
+            places = read_geonames_places(options['source'], options['admin1_codes'])
+        else:
+            places = read_csv_places(options['source'])
+        try:
+            count = build_gazetteer(places, options['output'], cell_deg=options['cell_deg'])
+        except (OSError, KeyError, ValueError) as exc:
+            raise CommandError(f'Could not build gazetteer: {exc}') from exc
+        self.stdout.write(self.style.SUCCESS(f"Wrote {count} places to {options['output']}."))
@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0005_add_resolved_at_resolved_by'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emergencyalert',
+            name='escalation_due_at',
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='alertassignment',
+            name='escalation_ring',
+            field=models.IntegerField(default=1),
+        ),
+        migrations.AddField(
+            model_name='alertassignment',
+            name='is_standby',
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0006_escalation_rings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emergencyalert',
+            name='parent_alert',
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name='linked_reports',
+                to='alerts.emergencyalert',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='emergencyalert',
+            index=models.Index(fields=['alert_type', 'created_at'], name='alert_type_created_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0007_emergencyalert_parent_alert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationPing',
+            fields=[
+                ('ping_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('lat_e7', models.IntegerField()),
+                ('lng_e7', models.IntegerField()),
+                ('accuracy', models.FloatField(blank=True, null=True)),
+                ('recorded_at', models.DateTimeField()),
+                ('alert', models.ForeignKey(
+                    db_index=False,
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='location_pings',
+                    to='alerts.emergencyalert',
+                )),
+            ],
+            options={
+                'indexes': [models.Index(fields=['alert', 'recorded_at'], name='ping_alert_time_idx')],
+            },
+        ),
+    ]
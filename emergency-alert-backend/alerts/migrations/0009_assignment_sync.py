@@ -0,0 +1,41 @@
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('agencies', '0001_initial'),
+        ('alerts', '0008_locationping'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertassignment',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='alertassignment',
+            index=models.Index(fields=['agency', 'updated_at'], name='assign_agency_updated_idx'),
+        ),
+        migrations.CreateModel(
+            name='AssignmentTombstone',
+            fields=[
+                ('tombstone_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('assignment_id', models.IntegerField()),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+                ('agency', models.ForeignKey(
+                    db_index=False,
+                    on_delete=django.db.models.deletion.CASCADE,
+                    related_name='+',
+                    to='agencies.securityagency',
+                )),
+            ],
+            options={
+                'indexes': [models.Index(fields=['agency', 'deleted_at'], name='tombstone_agency_time_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+def close_finished_assignments(apps, schema_editor):
+    AlertAssignment = apps.get_model('alerts', 'AlertAssignment')
+    AlertAssignment.objects.filter(
+        alert__status__in=('RESOLVED', 'CANCELLED'),
+    ).update(is_active=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0009_assignment_sync'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='alertassignment',
+            name='is_active',
+            field=models.BooleanField(default=True),
+        ),
+        migrations.RunPython(close_finished_assignments, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='alertassignment',
+            index=models.Index(fields=['agency', 'is_active', 'assigned_at'], name='assign_agency_active_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0011_alertevent'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertassignment',
+            index=models.Index(fields=['response_time'], name='assign_response_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emergencyalert',
+            index=models.Index(fields=['created_at'], name='alert_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emergencyalert',
+            index=models.Index(fields=['updated_at'], name='alert_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,53 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    table = apps.get_model('alerts', 'AlertSearchDocument')._meta.db_table
+    schema_editor.execute(
+        f'CREATE FULLTEXT INDEX alert_search_body_ft ON {schema_editor.quote_name(table)} (body)'
+    )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'mysql':
+        return
+    table = apps.get_model('alerts', 'AlertSearchDocument')._meta.db_table
+    schema_editor.execute(f'DROP INDEX alert_search_body_ft ON {schema_editor.quote_name(table)}')
+
+
+def index_existing_alerts(apps, schema_editor):
+    EmergencyAlert = apps.get_model('alerts', 'EmergencyAlert')
+    AlertSearchDocument = apps.get_model('alerts', 'AlertSearchDocument')
+    rows = EmergencyAlert.objects.values_list(
+        'alert_id', 'user__full_name', 'location__address', 'location__city',
+        'location__state', 'description',
+    ).order_by('alert_id')
+    batch = []
+    for alert_id, *text in rows.iterator(chunk_size=2000):
+        batch.append(AlertSearchDocument(alert_id=alert_id, body='\n'.join(part for part in text if part)))
+        if len(batch) == 2000:
+            AlertSearchDocument.objects.bulk_create(batch)
+            batch = []
+    AlertSearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0012_reporting_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AlertSearchDocument',
+            fields=[
+                ('alert', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='alerts.emergencyalert')),
+                ('body', models.TextField()),
+            ],
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+        migrations.RunPython(index_existing_alerts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('alerts', '0013_alertsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='alertassignment',
+            index=models.Index(fields=['agency', '-assigned_at'], name='assign_agency_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emergencyalert',
+            index=models.Index(fields=['status', 'created_at'], name='alert_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emergencyalert',
+            index=models.Index(fields=['user', '-created_at'], name='alert_user_created_idx'),
+        ),
+    ]
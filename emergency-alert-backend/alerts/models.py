@@ -1,7 +1,7 @@
 from django.db import models
 from django.db.models import (
-    AutoField, CharField, TextField, IntegerField, FloatField,
-    ForeignKey, OneToOneField, CASCADE, DateTimeField, DecimalField
+    AutoField, BigAutoField, CharField, TextField, IntegerField, FloatField, BooleanField,
+    ForeignKey, OneToOneField, CASCADE, SET_NULL, DateTimeField, DecimalField
 )
 
 
@@ -40,12 +40,36 @@ class EmergencyAlert(models.Model):
     rating = IntegerField(null=True, blank=True)  # 1–5 stars, submitted once after resolution
     resolved_at = DateTimeField(null=True, blank=True)
     resolved_by = CharField(max_length=150, blank=True, null=True)
+    # When the next standby ring is released if nobody has acknowledged yet.
+    escalation_due_at = DateTimeField(null=True, blank=True, db_index=True)
+    # Set when this report was merged into an earlier alert for the same incident.
+    parent_alert = ForeignKey(
+        'self', on_delete=SET_NULL, null=True, blank=True, related_name='linked_reports'
+    )
     created_at = DateTimeField(auto_now_add=True)
     updated_at = DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [
+            # Incident correlation looks up recent alerts of one type.
+            models.Index(fields=['alert_type', 'created_at'], name='alert_type_created_idx'),
+            # Admin list by status in keyset order, and a reporter's history.
+            models.Index(fields=['status', 'created_at'], name='alert_status_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='alert_user_created_idx'),
+            # Reporting: the live tail after the daily rollups, and the
+            # compactor's scan for alerts changed since its last run.
+            models.Index(fields=['created_at'], name='alert_created_idx'),
+            models.Index(fields=['updated_at'], name='alert_updated_idx'),
+        ]
+
     def __str__(self):
         return f"Alert #{self.alert_id} - {self.alert_type} ({self.status})"
 
+    @property
+    def incident(self):
+        """The alert that owns dispatch for this report (itself unless merged)."""
+        return self.parent_alert or self
+
 
 class Location(models.Model):
     location_id = AutoField(primary_key=True)
@@ -63,6 +87,43 @@ class Location(models.Model):
         return f"Location for Alert #{self.alert_id}"
 
 
+class AlertSearchDocument(models.Model):
+    """
+    Denormalized text of an alert for the admin search (see alerts.search):
+    reporter name, address, city, state and description in one column,
+    behind a FULLTEXT index on MySQL.  Rewritten whenever one of them changes.
+    """
+    alert = OneToOneField(EmergencyAlert, on_delete=CASCADE, primary_key=True, related_name='search_document')
+    body = TextField()
+
+    def __str__(self):
+        return f"Search document for Alert #{self.alert_id}"
+
+
+class LocationPing(models.Model):
+    """
+    Append-only movement history of an alert.  Coordinates are stored as
+    integers in units of 1e-7 degrees (the precision of Location), which keeps
+    rows small and avoids Decimal handling on the write path.
+    """
+    SCALE = 10_000_000
+
+    ping_id = BigAutoField(primary_key=True)
+    alert = ForeignKey(EmergencyAlert, on_delete=CASCADE, related_name='location_pings', db_index=False)
+    lat_e7 = IntegerField()
+    lng_e7 = IntegerField()
+    accuracy = FloatField(null=True, blank=True)
+    recorded_at = DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['alert', 'recorded_at'], name='ping_alert_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Ping #{self.ping_id} for Alert #{self.alert_id}"
+
+
 class AlertAssignment(models.Model):
     NOTIFICATION_STATUSES = [
         ('PENDING', 'Pending'),
@@ -78,11 +139,67 @@ class AlertAssignment(models.Model):
     notification_status = CharField(max_length=10, choices=NOTIFICATION_STATUSES, default='PENDING')
     response_time = DateTimeField(null=True, blank=True)
     assignment_priority = IntegerField(default=1)
+    # Escalation ring (1 = closest agencies, notified immediately).  Later rings
+    # stay on standby until the escalation timeout passes without an acknowledgment.
+    escalation_ring = IntegerField(default=1)
+    is_standby = BooleanField(default=False)
+    # Cleared when the alert is resolved or cancelled, so an agency's open work
+    # is one index range no matter how much history it has accumulated.
+    is_active = BooleanField(default=True)
+    # Change marker for the agency delta feed: bumped whenever the assignment,
+    # its alert, acknowledgment or notification logs change (see alerts.sync).
+    updated_at = DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['agency', 'updated_at'], name='assign_agency_updated_idx'),
+            # Active list and history pages: (agency, is_active) ordered by assigned_at.
+            models.Index(fields=['agency', 'is_active', 'assigned_at'], name='assign_agency_active_idx'),
+            # Agency polling and history: all of an agency's assignments, newest first.
+            models.Index(fields=['agency', '-assigned_at'], name='assign_agency_recent_idx'),
+            # Reporting: responses since the last compacted rollup day.
+            models.Index(fields=['response_time'], name='assign_response_idx'),
+        ]
 
     def __str__(self):
         return f"Assignment #{self.assignment_id} - Alert #{self.alert_id} to {self.agency}"
 
 
+class AssignmentTombstone(models.Model):
+    """
+    Record of an assignment that was deleted (e.g. with the civilian's
+    account), so delta-syncing agency clients can drop it from their cache.
+    """
+    tombstone_id = BigAutoField(primary_key=True)
+    assignment_id = IntegerField()
+    agency = ForeignKey('agencies.SecurityAgency', on_delete=CASCADE, related_name='+', db_index=False)
+    deleted_at = DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['agency', 'deleted_at'], name='tombstone_agency_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Tombstone for Assignment #{self.assignment_id}"
+
+
+class AlertEvent(models.Model):
+    """
+    Sequence table of alert lifecycle events (see alerts.lifecycle).  Rows
+    are written in the same transaction as the change they describe, and
+    event_id is the cursor other processes follow.  payload is JSON text.
+    """
+    event_id = BigAutoField(primary_key=True)
+    alert_id = IntegerField()
+    kind = CharField(max_length=40)
+    payload = TextField()
+    created_at = DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return f"Event #{self.event_id} {self.kind} for Alert #{self.alert_id}"
+
+
 class Acknowledgment(models.Model):
     ack_id = AutoField(primary_key=True)
     assignment = OneToOneField(AlertAssignment, on_delete=CASCADE, related_name='acknowledgment')
@@ -0,0 +1,155 @@
+"""
+Flat read path for agency assignment lists.
+
+AlertAssignmentSerializer resolves about ten `source=` paths per row through
+model instances, and feeding it meant loading whole User rows (password hash
+included) just for a name and a phone number.  assignment_rows() reads only
+the columns the payload needs with values_list(), fetches acknowledgments and
+per-channel delivery summaries in a few set-based queries, and builds each
+dict from a fixed column tuple.  The output is identical to
+AlertAssignmentSerializer's, which the tests check, so clients cannot tell
+the two paths apart.
+"""
+from django.db.models import Count, Max
+from rest_framework import serializers
+
+from notifications.models import NotificationLog
+
+from .models import Acknowledgment
+
+# Column order is the unpacking order in _assignment_dict().
+ASSIGNMENT_COLUMNS = (
+    'assignment_id', 'alert_id', 'alert__alert_type', 'alert__priority_level',
+    'alert__status', 'alert__updated_at', 'alert__description',
+    'alert__user__full_name', 'alert__user__phone_number',
+    'agency__agency_name', 'agency__agency_type', 'agency__contact_phone',
+    'assigned_at', 'notification_status', 'response_time', 'assignment_priority',
+)
+ACK_COLUMNS = (
+    'assignment_id', 'ack_id', 'acknowledged_by', 'ack_timestamp',
+    'estimated_arrival', 'response_message', 'responder_contact',
+)
+
+# DRF's own field, so timestamps are rendered exactly as the serializer does.
+_datetime_field = serializers.DateTimeField()
+
+
+def _dt(value):
+    return None if value is None else _datetime_field.to_representation(value)
+
+
+def _acknowledgments(assignment_ids):
+    return {
+        assignment_id: {
+            'ack_id': ack_id,
+            'acknowledged_by': acknowledged_by,
+            'ack_timestamp': _dt(ack_timestamp),
+            'estimated_arrival': estimated_arrival,
+            'response_message': response_message,
+            'responder_contact': responder_contact,
+        }
+        for (
+            assignment_id, ack_id, acknowledged_by, ack_timestamp,
+            estimated_arrival, response_message, responder_contact,
+        ) in Acknowledgment.objects.filter(assignment_id__in=assignment_ids).values_list(*ACK_COLUMNS)
+    }
+
+
+def _delivery(channel_type, delivery_status, attempts, sent_at, error_message):
+    return {
+        'channel_type': channel_type,
+        'delivery_status': delivery_status,
+        'attempts': attempts,
+        'last_attempt_at': _dt(sent_at),
+        'error_message': error_message,
+    }
+
+
+def summarize_logs(logs):
+    """The delivery summary of already loaded NotificationLog objects."""
+    latest, attempts = {}, {}
+    for log in sorted(logs, key=lambda log: log.log_id):
+        latest[log.channel_type] = log
+        attempts[log.channel_type] = attempts.get(log.channel_type, 0) + 1
+    return [
+        _delivery(channel, log.delivery_status, attempts[channel], log.sent_at, log.error_message)
+        for channel, log in sorted(latest.items())
+    ]
+
+
+def delivery_summaries(assignment_ids):
+    """
+    {assignment_id: [per-channel summary]} where each summary carries the
+    channel's latest delivery_status, sent_at and error_message plus the
+    number of attempts (one NotificationLog row per attempt).  The database
+    groups the logs, so retries never reach Python; the full rows are served
+    on demand by /api/agency/alerts/<id>/notifications/.
+    """
+    groups = list(
+        NotificationLog.objects
+        .filter(assignment_id__in=assignment_ids)
+        .values('assignment_id', 'channel_type')
+        .annotate(attempts=Count('log_id'), latest_id=Max('log_id'))
+        .order_by()
+    )
+    if not groups:
+        return {}
+    latest = {
+        log_id: (delivery_status, sent_at, error_message)
+        for log_id, delivery_status, sent_at, error_message in NotificationLog.objects.filter(
+            log_id__in=[group['latest_id'] for group in groups],
+        ).values_list('log_id', 'delivery_status', 'sent_at', 'error_message')
+    }
+    summaries = {}
+    for group in sorted(groups, key=lambda g: g['channel_type']):
+        delivery_status, sent_at, error_message = latest[group['latest_id']]
+        summaries.setdefault(group['assignment_id'], []).append(_delivery(
+            group['channel_type'], delivery_status, group['attempts'], sent_at, error_message,
+        ))
+    return summaries
+
+
+def _assignment_dict(row, acknowledgments, deliveries):
+    (
+        assignment_id, alert_id, alert_type, priority_level,
+        alert_status, alert_updated_at, description,
+        reporter_name, reporter_phone,
+        agency_name, agency_type, agency_phone,
+        assigned_at, notification_status, response_time, assignment_priority,
+    ) = row
+    return {
+        'assignment_id': assignment_id,
+        'alert_id': alert_id,
+        'alert_type': alert_type,
+        'alert_priority_level': priority_level,
+        'alert_status': alert_status,
+        'alert_updated_at': _dt(alert_updated_at),
+        'alert_description': description,
+        'reporter_name': reporter_name,
+        'reporter_phone': reporter_phone,
+        'agency': {
+            'agency_name': agency_name,
+            'agency_type': agency_type,
+            'contact_phone': agency_phone,
+        },
+        'assigned_at': _dt(assigned_at),
+        'notification_status': notification_status,
+        'response_time': _dt(response_time),
+        'assignment_priority': assignment_priority,
+        'acknowledgment': acknowledgments.get(assignment_id),
+        'delivery': deliveries.get(assignment_id, []),
+    }
+
+
+def assignment_rows(assignments):
+    """
+    Serialize an AlertAssignment queryset (filtered and ordered by the
+    caller) in the AlertAssignmentSerializer shape, in at most four queries.
+    """
+    rows = list(assignments.values_list(*ASSIGNMENT_COLUMNS))
+    if not rows:
+        return []
+    ids = [row[0] for row in rows]
+    acknowledgments = _acknowledgments(ids)
+    deliveries = delivery_summaries(ids)
+    return [_assignment_dict(row, acknowledgments, deliveries) for row in rows]
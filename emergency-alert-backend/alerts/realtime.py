@@ -0,0 +1,132 @@
+"""
+GET /api/alerts/{alert_id}/status/wait/ — long-poll status channel for the
+civilian app.
+
+The app sends the ETag of the status it already has (If-None-Match).  The
+request returns at once with the full status payload when that ETag is stale;
+otherwise it is parked until the alert changes (200) or
+ALERT_STATUS_WAIT_TIMEOUT_S passes (304), and the app immediately asks again.
+A terminal alert (RESOLVED/CANCELLED) is never parked: the app has the final
+state and closes the channel.
+
+Parked requests are coroutines on the ASGI event loop.  A single
+AlertWatchHub task per process re-reads the status version (the ETag: alert
+row, location and incident assignments) of every watched alert with one
+query per ALERT_STATUS_WAIT_POLL_INTERVAL_S and wakes the waiters of alerts
+whose version moved, so location updates and ring releases wake them too.
+Under WSGI nothing is parked and the endpoint behaves like a conditional GET.
+"""
+import asyncio
+import logging
+
+from django.conf import settings
+from django.http import HttpResponseNotModified, JsonResponse
+
+from alert_system.conditional import is_not_modified, with_etag
+from alert_system.realtime import authenticate_jwt, db_sync, json_error
+
+from .status_payload import (
+    TERMINAL_STATUSES,
+    cached_alert_status,
+    can_view_alert_status,
+    get_alert_status_etags,
+    get_alert_status_version,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AlertWatchHub:
+    """Per-process registry of parked status requests."""
+
+    def __init__(self):
+        self._waiters = {}
+        self._task = None
+
+    def watch(self, alert_id, seen_etag):
+        """Return an asyncio.Event set once the alert's status version moves on."""
+        event = asyncio.Event()
+        self._waiters.setdefault(alert_id, {})[event] = seen_etag
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+        return event
+
+    def unwatch(self, alert_id, event):
+        waiters = self._waiters.get(alert_id)
+        if waiters is not None:
+            waiters.pop(event, None)
+            if not waiters:
+                del self._waiters[alert_id]
+
+    def waiter_count(self):
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def notify(self, current):
+        """current maps alert_id -> etag (missing = deleted)."""
+        for alert_id, waiters in list(self._waiters.items()):
+            etag = current.get(alert_id)
+            for event, seen in waiters.items():
+                if etag != seen:
+                    event.set()
+
+    async def _run(self):
+        interval = settings.ALERT_STATUS_WAIT_POLL_INTERVAL_S
+        while self._waiters:
+            await asyncio.sleep(interval)
+            try:
+                current = await db_sync(get_alert_status_etags)(list(self._waiters))
+                self.notify(current)
+            except Exception:
+                logger.exception('Alert status watch poll failed')
+
+
+hub = AlertWatchHub()
+
+
+def _not_modified(etag):
+    return with_etag(HttpResponseNotModified(), etag)
+
+
+async def alert_status_wait(request, alert_id):
+    if request.method != 'GET':
+        return json_error(f'Method "{request.method}" not allowed.', 405)
+
+    user, error = await db_sync(authenticate_jwt)(request)
+    if error is not None:
+        return error
+
+    version = await db_sync(get_alert_status_version)(alert_id)
+    if version is None:
+        return json_error('Alert not found.', 404)
+    if not await db_sync(can_view_alert_status)(user, version.owner_id):
+        return json_error('Permission denied.', 403)
+
+    if is_not_modified(request, version.etag):
+        if version.status in TERMINAL_STATUSES or not hasattr(request, 'scope'):
+            return _not_modified(version.etag)
+
+        try:
+            timeout = float(request.GET.get('timeout', settings.ALERT_STATUS_WAIT_TIMEOUT_S))
+        except ValueError:
+            return json_error('timeout must be a number of seconds.', 400)
+        timeout = max(0.0, min(timeout, settings.ALERT_STATUS_WAIT_TIMEOUT_S))
+
+        event = hub.watch(alert_id, version.etag)
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            hub.unwatch(alert_id, event)
+
+        version = await db_sync(get_alert_status_version)(alert_id)
+        if version is None:
+            return json_error('Alert not found.', 404)
+        if is_not_modified(request, version.etag):
+            return _not_modified(version.etag)
+
+    data = await db_sync(cached_alert_status)(alert_id, version, request)
+    if data is None:
+        return json_error('Alert not found.', 404)
+    return with_etag(JsonResponse(data), version.etag)
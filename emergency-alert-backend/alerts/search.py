@@ -0,0 +1,116 @@
+"""
+Admin alert search.
+
+The admin list used to OR four icontains filters across the user and
+location joins, i.e. a LIKE '%x%' scan of every alert.  Each alert now has
+an AlertSearchDocument holding the text worth searching (reporter name,
+address, city, state, description), written by index_alerts() whenever
+that text changes: on creation, on a geocoded location update and on a
+profile rename.
+
+On MySQL the document has a FULLTEXT index and a search is
+
+    MATCH (body) AGAINST ('+term1* +term2*' IN BOOLEAN MODE)
+
+so every word of the query must prefix-match a word of the document.
+Words shorter than FULLTEXT_MIN_TOKEN (InnoDB's innodb_ft_min_token_size)
+are not in the index and are matched with LIKE on the documents the index
+already selected.  Other databases (SQLite in tests) have no FULLTEXT
+index; there every word is matched with LIKE on the single document
+column, which returns the same alerts for ordinary queries.
+
+alert_type and status are short enumerations and are matched against
+their choices in Python, then filtered on with IN.
+"""
+import re
+
+from django.db.models import Lookup, Q
+
+from .models import AlertSearchDocument, EmergencyAlert
+
+FULLTEXT_MIN_TOKEN = 3
+# Longer queries are cut to their first words.
+MAX_TERMS = 8
+
+WORD = re.compile(r'\w+')
+
+
+def search_terms(text):
+    return [term.lower() for term in WORD.findall(text)][:MAX_TERMS]
+
+
+def _like(lhs, terms, connection):
+    # Backslash is already MySQL's LIKE escape character.
+    escape = '' if connection.vendor == 'mysql' else " ESCAPE '\\'"
+    sql = ' AND '.join(f'{lhs} LIKE %s{escape}' for _ in terms)
+    return sql, [f'%{connection.ops.prep_for_like_query(term)}%' for term in terms]
+
+
+class FullTextMatch(Lookup):
+    """body__match='words': every word of the query occurs in the document."""
+    lookup_name = 'match'
+
+    def process_rhs(self, compiler, connection):
+        return '', search_terms(self.rhs)
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        _, terms = self.process_rhs(compiler, connection)
+        sql, params = _like(lhs, terms, connection)
+        return sql, [*lhs_params * len(terms), *params]
+
+    def as_mysql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        _, terms = self.process_rhs(compiler, connection)
+        indexed = [term for term in terms if len(term) >= FULLTEXT_MIN_TOKEN]
+        short = [term for term in terms if len(term) < FULLTEXT_MIN_TOKEN]
+        if not indexed:
+            return self.as_sql(compiler, connection)
+        sql = f'MATCH ({lhs}) AGAINST (%s IN BOOLEAN MODE)'
+        params = [*lhs_params, ' '.join(f'+{term}*' for term in indexed)]
+        if short:
+            like_sql, like_params = _like(lhs, short, connection)
+            sql = f'{sql} AND {like_sql}'
+            params += [*lhs_params * len(short), *like_params]
+        return sql, params
+
+
+AlertSearchDocument._meta.get_field('body').register_lookup(FullTextMatch)
+
+
+def document_text(full_name, address, city, state, description):
+    return '\n'.join(part for part in (full_name, address, city, state, description) if part)
+
+
+def index_alerts(alert_ids):
+    """(Re)write the search documents of the given alerts: two queries."""
+    rows = EmergencyAlert.objects.filter(alert_id__in=alert_ids).values_list(
+        'alert_id', 'user__full_name', 'location__address', 'location__city',
+        'location__state', 'description',
+    )
+    AlertSearchDocument.objects.bulk_create(
+        [AlertSearchDocument(alert_id=alert_id, body=document_text(*text)) for alert_id, *text in rows],
+        update_conflicts=True, unique_fields=['alert'], update_fields=['body'],
+    )
+
+
+def index_user_alerts(user):
+    """After a rename: rewrite the documents of every alert the user reported."""
+    alert_ids = list(EmergencyAlert.objects.filter(user=user).values_list('alert_id', flat=True))
+    for start in range(0, len(alert_ids), 1000):
+        index_alerts(alert_ids[start:start + 1000])
+
+
+def _choices_matching(choices, text):
+    return [value for value, _ in choices if text.upper() in value]
+
+
+def search_filter(text):
+    """Q over EmergencyAlert for the admin search box."""
+    query = Q(search_document__body__match=text) if search_terms(text) else Q(pk__in=[])
+    for field, choices in (('alert_type', EmergencyAlert.ALERT_TYPES), ('status', EmergencyAlert.STATUSES)):
+        if matching := _choices_matching(choices, text):
+            query |= Q(**{f'{field}__in': matching})
+    if text.isdigit():
+        query |= Q(alert_id=int(text))
+    return query
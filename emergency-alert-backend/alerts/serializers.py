@@ -1,8 +1,12 @@
 import re
 from decimal import Decimal
 from rest_framework import serializers
-from .models import EmergencyAlert, Location, AlertAssignment, Acknowledgment
+from .models import EmergencyAlert, Location, AlertAssignment, Acknowledgment, AlertSearchDocument
 from notifications.models import NotificationLog
+from .geocoder import describe_place, reverse_geocode
+from .projections import summarize_logs
+from .search import document_text
+from .tracks import record_ping
 from .priority_engine import (
     RiskAnswerValidationError,
     compute_priority,
@@ -60,7 +64,7 @@ class AlertAssignmentSerializer(serializers.ModelSerializer):
     alert_description = serializers.CharField(source='alert.description', read_only=True, allow_null=True)
     reporter_name = serializers.CharField(source='alert.user.full_name', read_only=True, allow_null=True)
     reporter_phone = serializers.CharField(source='alert.user.phone_number', read_only=True, allow_null=True)
-    notification_logs = NotificationLogLiteSerializer(source='notifications', many=True, read_only=True)
+    delivery = serializers.SerializerMethodField()
 
     class Meta:
         model = AlertAssignment
@@ -70,10 +74,13 @@ class AlertAssignmentSerializer(serializers.ModelSerializer):
             'alert_description', 'reporter_name', 'reporter_phone',
             'agency', 'assigned_at',
             'notification_status', 'response_time',
-            'assignment_priority', 'acknowledgment', 'notification_logs',
+            'assignment_priority', 'acknowledgment', 'delivery',
         ]
         read_only_fields = ['assignment_id', 'assigned_at']
 
+    def get_delivery(self, obj):
+        return summarize_logs(obj.notifications.all())
+
 
 class EmergencyAlertCreateSerializer(serializers.ModelSerializer):
     latitude = serializers.DecimalField(max_digits=10, decimal_places=7, write_only=True)
@@ -134,15 +141,23 @@ class EmergencyAlertCreateSerializer(serializers.ModelSerializer):
         alert = EmergencyAlert.objects.create(**validated_data)
         alert.priority_assessment = priority_assessment
 
-        Location.objects.create(
+        # Offline gazetteer lookup so agencies always get a human-readable place.
+        place = reverse_geocode(latitude, longitude)
+
+        location = Location.objects.create(
             alert=alert,
             latitude=latitude,
             longitude=longitude,
             accuracy=accuracy,
             altitude=altitude,
-            city=city,
-            state=state,
+            address=describe_place(place) if place else None,
+            city=city or (place.name if place else None),
+            state=state or (place.state if place else None) or None,
         )
+        record_ping(alert.alert_id, latitude, longitude, accuracy)
+        AlertSearchDocument.objects.create(alert=alert, body=document_text(
+            alert.user.full_name, location.address, location.city, location.state, alert.description,
+        ))
 
         return alert
 
@@ -152,16 +167,26 @@ class EmergencyAlertCreateSerializer(serializers.ModelSerializer):
 
 class EmergencyAlertDetailSerializer(serializers.ModelSerializer):
     location = LocationSerializer(read_only=True)
-    assignments = AlertAssignmentSerializer(many=True, read_only=True)
+    # Linked duplicate reports show the dispatch of the incident they joined.
+    assignments = serializers.SerializerMethodField()
 
     class Meta:
         model = EmergencyAlert
         fields = [
             'alert_id', 'alert_type', 'priority_level', 'description',
-            'status', 'rating', 'resolved_at', 'resolved_by',
+            'status', 'rating', 'resolved_at', 'resolved_by', 'parent_alert',
             'created_at', 'updated_at', 'location', 'assignments',
         ]
-        read_only_fields = ['alert_id', 'status', 'rating', 'resolved_at', 'resolved_by', 'created_at', 'updated_at']
+        read_only_fields = [
+            'alert_id', 'status', 'rating', 'resolved_at', 'resolved_by', 'parent_alert',
+            'created_at', 'updated_at',
+        ]
+
+    def get_assignments(self, obj):
+        # Filtered in Python so a prefetched incident.assignments is reused;
+        # standby rings were never alerted and are not shown.
+        assignments = [a for a in obj.incident.assignments.all() if not a.is_standby]
+        return AlertAssignmentSerializer(assignments, many=True, context=self.context).data
 
 
 class EmergencyAlertListSerializer(serializers.ModelSerializer):
@@ -0,0 +1,131 @@
+"""
+The civilian alert status payload and its version.
+
+Polling clients mostly want to know whether anything changed.  The version
+of an alert's status payload (its ETag) is computed by one indexed query over
+the alert row, its location and its incident's assignments, so /status/probe/
+and conditional requests never touch the five-query prefetch.  When the full
+payload is needed it is served from the cache while the version matches;
+status changes also drop the cached entry explicitly (on_alert_event).
+"""
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from alert_system.conditional import make_etag
+
+from .models import EmergencyAlert, AlertAssignment
+from .serializers import EmergencyAlertDetailSerializer
+
+TERMINAL_STATUSES = ('RESOLVED', 'CANCELLED')
+
+StatusVersion = namedtuple('StatusVersion', ['etag', 'status', 'owner_id', 'updated_at'])
+
+CACHE_KEY = 'alert_status_payload:{}'
+
+# Every payload field that can change without the others must be here (or
+# move updated_at), or a cached payload outlives the change.
+VERSION_FIELDS = (
+    'user_id', 'status', 'parent_alert_id', 'rating', 'updated_at',
+    'location__latitude', 'location__longitude', 'location__accuracy',
+    'location__address', 'location__city', 'location__state',
+    'assignment_count', 'assignments_updated_at',
+)
+
+
+def _incident_assignments():
+    # Linked reports show the dispatch of the incident they joined.
+    return (
+        AlertAssignment.objects
+        .filter(alert_id=Coalesce(OuterRef('parent_alert_id'), OuterRef('alert_id')), is_standby=False)
+        .order_by()
+        .values('alert_id')
+    )
+
+
+def _with_version_fields(alerts):
+    return alerts.annotate(
+        assignment_count=Subquery(
+            _incident_assignments().annotate(n=Count('assignment_id')).values('n')
+        ),
+        assignments_updated_at=Subquery(
+            _incident_assignments().annotate(latest=Max('updated_at')).values('latest')
+        ),
+    )
+
+
+def get_alert_status_version(alert_id):
+    """
+    Version of an alert's status payload from a single query (primary key
+    lookup plus two correlated aggregates on the assignment alert index).
+    Returns a StatusVersion, or None when the alert does not exist.
+    """
+    version = (
+        _with_version_fields(EmergencyAlert.objects.filter(alert_id=alert_id))
+        .values(*VERSION_FIELDS)
+        .first()
+    )
+    if version is None:
+        return None
+    etag = make_etag('alert-status', alert_id, *version.values())
+    return StatusVersion(etag, version['status'], version['user_id'], version['updated_at'])
+
+
+def get_alert_status_etags(alert_ids):
+    """{alert_id: etag} for the alerts that exist, in one query."""
+    rows = _with_version_fields(EmergencyAlert.objects.filter(alert_id__in=alert_ids)).values_list(
+        'alert_id', *VERSION_FIELDS,
+    )
+    return {row[0]: make_etag('alert-status', *row) for row in rows}
+
+
+def can_view_alert_status(user, owner_id):
+    return owner_id == user.pk or hasattr(user, 'agency_profile')
+
+
+def serialize_alert_status(alert_id, request):
+    """Full status payload, or None if the alert disappeared meanwhile."""
+    alert = (
+        EmergencyAlert.objects
+        .select_related('location', 'parent_alert')
+        .prefetch_related(
+            'assignments__agency',
+            'assignments__acknowledgment',
+            'assignments__notifications',
+            'parent_alert__assignments__agency',
+            'parent_alert__assignments__acknowledgment',
+            'parent_alert__assignments__notifications',
+        )
+        .filter(alert_id=alert_id)
+        .first()
+    )
+    if alert is None:
+        return None
+    return EmergencyAlertDetailSerializer(alert, context={'request': request}).data
+
+
+def cached_alert_status(alert_id, version, request):
+    """
+    Full status payload for `version`.  One cache entry per alert holds
+    (etag, payload); it is only served while the etag still matches, so an
+    entry missed by explicit invalidation can never be returned stale.
+    """
+    key = CACHE_KEY.format(alert_id)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == version.etag:
+        return cached[1]
+    data = serialize_alert_status(alert_id, request)
+    if data is not None:
+        cache.set(key, (version.etag, dict(data)), settings.ALERT_STATUS_CACHE_TTL_S)
+    return data
+
+
+def on_alert_event(event):
+    """Lifecycle subscriber: drop the cached payloads a status change affects."""
+    alert_ids = [event.alert_id]
+    if 'previous_alert_id' in event.data:
+        alert_ids.append(event.data['previous_alert_id'])
+    cache.delete_many([CACHE_KEY.format(alert_id) for alert_id in alert_ids])
@@ -0,0 +1,86 @@
+"""
+Delta sync for the agency assignment feed.
+
+The agency dashboard polls GET /api/agency/alerts/ every 30 seconds.  Instead
+of re-sending an agency's whole assignment history each time, a client can
+pass back the sync token of its previous poll (?since=<token>) and receive
+only the assignments that changed after it, plus the ids of assignments that
+were deleted (tombstones).
+
+AlertAssignment.updated_at is the single change marker: it is bumped whenever
+the assignment itself, its alert, its acknowledgment or its notification logs
+change, so one index range scan on (agency, updated_at) finds every change.
+
+Sync tokens are opaque to clients.  They encode the server time at which the
+poll started; each delta re-reads a short overlap window before the token so
+that rows committed late by a slower transaction are not missed.  Clients
+merge assignments by id, so re-sent rows are harmless.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.utils import timezone
+
+from .models import AlertAssignment, AssignmentTombstone
+
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# Tombstones older than this are pruned; tokens older than this get a full
+# snapshot instead of a delta.
+TOMBSTONE_RETENTION = timedelta(days=7)
+
+
+def make_sync_token(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def parse_sync_token(token):
+    """
+    Return the datetime encoded in a sync token, or None for an empty/"0"
+    token (which asks for a full snapshot).  Raises ValueError when malformed.
+    """
+    if token in (None, '', '0'):
+        return None
+    micros = int(token)
+    if micros < 0:
+        raise ValueError('negative sync token')
+    return datetime.fromtimestamp(micros / 1_000_000, tz=dt_timezone.utc)
+
+
+def touch_assignments(**filters):
+    """Bump updated_at on the matching assignments (e.g. alert=alert)."""
+    return AlertAssignment.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+def close_assignments(**filters):
+    """Move the matching assignments to history (alert resolved or cancelled)."""
+    return AlertAssignment.objects.filter(**filters).update(is_active=False, updated_at=timezone.now())
+
+
+def record_tombstones(assignments):
+    """
+    Remember the assignments in a queryset before it is deleted (directly or
+    by cascade), and prune tombstones past their retention.
+    """
+    AssignmentTombstone.objects.bulk_create([
+        AssignmentTombstone(assignment_id=assignment_id, agency_id=agency_id)
+        for assignment_id, agency_id in assignments.values_list('assignment_id', 'agency_id')
+    ])
+    AssignmentTombstone.objects.filter(
+        deleted_at__lt=timezone.now() - TOMBSTONE_RETENTION,
+    ).delete()
+
+
+def latest_removal(agency):
+    return (
+        AssignmentTombstone.objects.filter(agency=agency)
+        .order_by('-deleted_at').values_list('deleted_at', flat=True).first()
+    )
+
+
+def removed_since(agency, since):
+    return list(
+        AssignmentTombstone.objects
+        .filter(agency=agency, deleted_at__gt=since - SYNC_OVERLAP)
+        .values_list('assignment_id', flat=True)
+        .distinct()
+    )
@@ -1,13 +1,25 @@
+import asyncio
+from datetime import timedelta
 from unittest.mock import patch
+from asgiref.sync import async_to_sync
+from django.db import IntegrityError, transaction
+from django.test import AsyncClient, TransactionTestCase, override_settings
 from django.urls import reverse
-from django.core.cache import cache
+from django.utils import timezone
+from django.core.cache import cache, caches
 from rest_framework import status
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models import User
 from agencies.models import SecurityAgency, AgencyUser
-from alerts.models import EmergencyAlert, Location, AlertAssignment
+from alerts.models import (
+    EmergencyAlert, Location, AlertAssignment, Acknowledgment, LocationPing, AlertSearchDocument,
+)
+from alerts import lifecycle
+from alerts.realtime import AlertWatchHub
+from alerts.status_payload import CACHE_KEY as STATUS_CACHE_KEY, get_alert_status_version
+from alerts.tracks import LocationTrackWriter, bucket_by_time, douglas_peucker, record_ping
 
 
 def create_user(email='user@test.com', password='testpass123', phone='+2348011111111'):
@@ -155,6 +167,312 @@ class CreateAlertTests(APITestCase):
         self.assertIn('longitude', response.data)
 
 
+@override_settings(ALERT_ESCALATION_RING_SIZE=1, ALERT_ESCALATION_TIMEOUT_S=60)
+class EscalationTests(APITestCase):
+    url = reverse('alert-create')
+
+    def setUp(self):
+        self.user = create_user()
+        self.near = create_agency('Near Police', 'POLICE', 'near@test.com', '+2348012345670')
+        self.far = create_agency('Far Police', 'POLICE', 'far@test.com', '+2348012345671')
+        SecurityAgency.objects.filter(pk=self.near.pk).update(latitude='6.5250', longitude='3.3800')
+        SecurityAgency.objects.filter(pk=self.far.pk).update(latitude='9.0765', longitude='7.3986')
+
+    def _create(self):
+        with patch('alerts.views.NotificationDispatcher.dispatch_alert') as mock_dispatch, \
+                patch('alerts.views.schedule_escalation') as self.mock_schedule, \
+                self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(self.url, ALERT_PAYLOAD, format='json', **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return EmergencyAlert.objects.get(alert_id=response.data['alert_id']), mock_dispatch
+
+    def _expire(self, alert):
+        EmergencyAlert.objects.filter(pk=alert.pk).update(
+            escalation_due_at=timezone.now() - timedelta(seconds=1)
+        )
+
+    def test_only_closest_ring_is_dispatched(self):
+        alert, mock_dispatch = self._create()
+        self.assertEqual(mock_dispatch.call_count, 1)
+        self.assertEqual(mock_dispatch.call_args[0][0].agency, self.near)
+
+        far = AlertAssignment.objects.get(alert=alert, agency=self.far)
+        self.assertTrue(far.is_standby)
+        self.assertEqual(far.escalation_ring, 2)
+        self.assertIsNotNone(alert.escalation_due_at)
+
+    def test_unacknowledged_alert_escalates_to_next_ring(self):
+        from notifications.escalation import escalate_alert
+
+        alert, _ = self._create()
+        self._expire(alert)
+        with patch('notifications.services.NotificationDispatcher.dispatch_alert') as mock_dispatch:
+            with self.captureOnCommitCallbacks() as callbacks:
+                released = escalate_alert(alert.alert_id)
+            # Nothing is sent while the alert row is still locked.
+            mock_dispatch.assert_not_called()
+            for callback in callbacks:
+                callback()
+
+        self.assertEqual(released, 2)
+        mock_dispatch.assert_called_once()
+        self.assertEqual(mock_dispatch.call_args[0][0].agency, self.far)
+        self.assertFalse(AlertAssignment.objects.get(alert=alert, agency=self.far).is_standby)
+        alert.refresh_from_db()
+        self.assertIsNone(alert.escalation_due_at)
+
+    def test_status_lists_only_alerted_agencies(self):
+        from notifications.escalation import escalate_alert
+
+        alert, _ = self._create()
+        url = reverse('alert-status', args=[alert.alert_id])
+        response = self.client.get(url, **auth_header(self.user))
+        self.assertEqual([a['agency']['agency_name'] for a in response.data['assignments']], [self.near.agency_name])
+
+        self._expire(alert)
+        with patch('notifications.services.NotificationDispatcher.dispatch_alert'):
+            escalate_alert(alert.alert_id)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'], **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['assignments']), 2)
+
+    def test_deadline_is_scheduled_in_sync_mode(self):
+        alert, _ = self._create()
+        self.mock_schedule.assert_called_once_with(alert.alert_id, alert.escalation_due_at)
+
+    def test_escalation_not_released_before_deadline(self):
+        from notifications.escalation import escalate_alert
+
+        alert, _ = self._create()
+        self.assertIsNone(escalate_alert(alert.alert_id))
+        self.assertTrue(AlertAssignment.objects.get(alert=alert, agency=self.far).is_standby)
+
+    def test_acknowledged_alert_does_not_escalate(self):
+        from notifications.escalation import escalate_due_alerts
+
+        alert, _ = self._create()
+        near = AlertAssignment.objects.get(alert=alert, agency=self.near)
+        Acknowledgment.objects.create(assignment=near, acknowledged_by='Officer')
+        EmergencyAlert.objects.filter(pk=alert.pk).update(status='ACKNOWLEDGED')
+        self._expire(alert)
+
+        with patch('notifications.services.NotificationDispatcher.dispatch_alert') as mock_dispatch:
+            self.assertEqual(escalate_due_alerts(), 0)
+
+        mock_dispatch.assert_not_called()
+        self.assertTrue(AlertAssignment.objects.get(alert=alert, agency=self.far).is_standby)
+        alert.refresh_from_db()
+        self.assertIsNone(alert.escalation_due_at)
+
+    @override_settings(ALERT_ESCALATION_RING_SIZE=0)
+    def test_ring_size_zero_dispatches_everyone(self):
+        alert, mock_dispatch = self._create()
+        self.assertEqual(mock_dispatch.call_count, 2)
+        self.assertIsNone(alert.escalation_due_at)
+
+
+FIRE_PAYLOAD = {
+    'alert_type': 'FIRE_INCIDENCE',
+    'latitude': '6.5244',
+    'longitude': '3.3792',
+    'risk_answers': {
+        'buildings_affected': 'ONE',
+        'people_trapped': False,
+        'spread_rate': 'CONTAINED',
+        'hazardous_materials': False,
+        'injury_severity': 'NONE',
+    },
+}
+
+
+class IncidentCorrelationTests(APITestCase):
+    url = reverse('alert-create')
+
+    def setUp(self):
+        self.first = create_user()
+        self.second = create_user(email='second@test.com', phone='+2348022222222')
+        self.fire = create_agency('Fire Service', 'FIRE', 'fire@test.com', '+2348012345672')
+
+    def _post(self, user, payload):
+        response = self.client.post(self.url, payload, format='json', **auth_header(user))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_nearby_duplicate_is_linked_without_dispatch(self, mock_dispatch):
+        first = self._post(self.first, FIRE_PAYLOAD)
+        second = self._post(self.second, {**FIRE_PAYLOAD, 'latitude': '6.5250'})
+
+        self.assertEqual(mock_dispatch.call_count, 1)
+        self.assertEqual(second.data['parent_alert'], first.data['alert_id'])
+        self.assertEqual(len(second.data['assignments']), 1)
+        self.assertFalse(AlertAssignment.objects.filter(alert_id=second.data['alert_id']).exists())
+        self.assertEqual(EmergencyAlert.objects.filter(alert_type='FIRE_INCIDENCE').count(), 2)
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_distant_report_starts_new_incident(self, mock_dispatch):
+        self._post(self.first, FIRE_PAYLOAD)
+        second = self._post(self.second, {**FIRE_PAYLOAD, 'latitude': '6.6000'})
+
+        self.assertEqual(mock_dispatch.call_count, 2)
+        self.assertIsNone(second.data['parent_alert'])
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_old_incident_is_not_reused(self, mock_dispatch):
+        first = self._post(self.first, FIRE_PAYLOAD)
+        EmergencyAlert.objects.filter(alert_id=first.data['alert_id']).update(
+            created_at=timezone.now() - timedelta(hours=3)
+        )
+        second = self._post(self.second, FIRE_PAYLOAD)
+        self.assertIsNone(second.data['parent_alert'])
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_uncorrelated_type_is_always_dispatched(self, mock_dispatch):
+        self._post(self.first, ALERT_PAYLOAD)
+        second = self._post(self.second, ALERT_PAYLOAD)
+        self.assertIsNone(second.data['parent_alert'])
+
+    @patch('agencies.views.NotificationDispatcher')
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_acknowledgment_propagates_to_linked_reports(self, mock_dispatch, mock_agency_dispatcher):
+        officer = create_user(email='fireman@test.com', phone='+2348077777777')
+        AgencyUser.objects.create(user=officer, agency=self.fire, role='DISPATCHER')
+        first = self._post(self.first, FIRE_PAYLOAD)
+        second = self._post(self.second, FIRE_PAYLOAD)
+
+        assignment = AlertAssignment.objects.get(alert_id=first.data['alert_id'])
+        url = reverse('agency-alert-acknowledge', args=[assignment.assignment_id])
+        response = self.client.post(url, {'estimated_arrival': 5}, **auth_header(officer))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        linked = EmergencyAlert.objects.get(alert_id=second.data['alert_id'])
+        self.assertEqual(linked.status, 'ACKNOWLEDGED')
+
+    @patch('alerts.views.NotificationDispatcher.send_cancellation_notice')
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_cancelling_root_hands_incident_to_linked_report(self, mock_dispatch, mock_cancel):
+        first = self._post(self.first, FIRE_PAYLOAD)
+        second = self._post(self.second, FIRE_PAYLOAD)
+
+        url = reverse('alert-cancel', args=[first.data['alert_id']])
+        response = self.client.put(url, **auth_header(self.first))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        mock_cancel.assert_not_called()
+        successor = EmergencyAlert.objects.get(alert_id=second.data['alert_id'])
+        self.assertIsNone(successor.parent_alert_id)
+        self.assertEqual(successor.assignments.count(), 1)
+
+    @override_settings(ALERT_ESCALATION_RING_SIZE=1, ALERT_ESCALATION_TIMEOUT_S=60)
+    @patch('alerts.views.schedule_escalation')
+    @patch('alerts.views.NotificationDispatcher.send_cancellation_notice')
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_handed_over_incident_keeps_escalating(self, mock_dispatch, mock_cancel, mock_schedule):
+        from notifications.escalation import escalate_alert
+
+        far = create_agency('Far Fire', 'FIRE', 'farfire@test.com', '+2348012345673')
+        SecurityAgency.objects.filter(pk=self.fire.pk).update(latitude='6.5250', longitude='3.3800')
+        SecurityAgency.objects.filter(pk=far.pk).update(latitude='9.0765', longitude='7.3986')
+        first = self._post(self.first, FIRE_PAYLOAD)
+        second = self._post(self.second, FIRE_PAYLOAD)
+        due_at = EmergencyAlert.objects.get(alert_id=first.data['alert_id']).escalation_due_at
+        self.assertIsNotNone(due_at)
+
+        url = reverse('alert-cancel', args=[first.data['alert_id']])
+        self.assertEqual(self.client.put(url, **auth_header(self.first)).status_code, status.HTTP_200_OK)
+
+        successor = EmergencyAlert.objects.get(alert_id=second.data['alert_id'])
+        self.assertEqual(successor.escalation_due_at, due_at)
+        mock_schedule.assert_called_with(successor.alert_id, due_at)
+
+        EmergencyAlert.objects.filter(pk=successor.pk).update(escalation_due_at=timezone.now() - timedelta(seconds=1))
+        with patch('notifications.services.NotificationDispatcher.dispatch_alert'):
+            self.assertEqual(escalate_alert(successor.alert_id), 2)
+        self.assertFalse(AlertAssignment.objects.get(alert=successor, agency=far).is_standby)
+
+
+GAZETTEER_PLACES = [
+    ('Ikeja', 'Lagos', '6.6018', '3.3515'),
+    ('Lagos Island', 'Lagos', '6.4541', '3.3947'),
+    ('Yaba', 'Lagos', '6.5095', '3.3711'),
+    ('Abuja', 'FCT', '9.0765', '7.3986'),
+]
+
+
+class ReverseGeocoderTests(APITestCase):
+    def setUp(self):
+        import os
+        import tempfile
+        from alerts.geocoder import build_gazetteer
+
+        tmpdir = tempfile.mkdtemp()
+        self.path = os.path.join(tmpdir, 'gazetteer.bin')
+        build_gazetteer(GAZETTEER_PLACES, self.path)
+        self.user = create_user()
+        create_agency()
+
+    def test_nearest_place_is_returned(self):
+        from alerts.geocoder import Gazetteer
+
+        place = Gazetteer(self.path).nearest(6.5244, 3.3792, max_distance_km=25)
+        self.assertEqual(place.name, 'Yaba')
+        self.assertEqual(place.state, 'Lagos')
+        self.assertLess(place.distance_km, 3)
+
+    def test_overlong_name_is_cut_on_a_character_boundary(self):
+        from alerts.geocoder import Gazetteer, build_gazetteer
+
+        name = 'é' * 0x8000  # 0x10000 bytes: the 0xFFFF cap falls inside a character
+        build_gazetteer([(name, 'Lagos', '6.5244', '3.3792')], self.path)
+        place = Gazetteer(self.path).nearest(6.5244, 3.3792, max_distance_km=25)
+        self.assertEqual(place.name, name[:0x7FFF])
+
+    def test_point_beyond_max_distance_returns_none(self):
+        from alerts.geocoder import Gazetteer
+
+        self.assertIsNone(Gazetteer(self.path).nearest(12.0, 8.5, max_distance_km=25))
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_alert_location_is_filled_from_gazetteer(self, mock_dispatch):
+        with override_settings(GAZETTEER_PATH=self.path):
+            response = self.client.post(
+                reverse('alert-create'), ALERT_PAYLOAD, format='json', **auth_header(self.user),
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        location = response.data['location']
+        self.assertEqual(location['address'], 'Near Yaba, Lagos')
+        self.assertEqual(location['city'], 'Yaba')
+        self.assertEqual(location['state'], 'Lagos')
+        body = AlertSearchDocument.objects.get(alert_id=response.data['alert_id']).body
+        self.assertEqual(body.split('\n'), [self.user.full_name, 'Near Yaba, Lagos', 'Yaba', 'Lagos', 'Robbery in progress'])
+
+    def test_location_update_refreshes_address(self):
+        alert = EmergencyAlert.objects.create(
+            user=self.user, alert_type='KIDNAPPING', priority_level='HIGH', status='DISPATCHED',
+        )
+        Location.objects.create(alert=alert, latitude='6.5244', longitude='3.3792')
+
+        url = reverse('alert-update-location', args=[alert.alert_id])
+        with override_settings(GAZETTEER_PATH=self.path):
+            response = self.client.patch(
+                url, {'latitude': '6.6000', 'longitude': '3.3500'}, format='json', **auth_header(self.user),
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        alert.location.refresh_from_db()
+        self.assertEqual(alert.location.city, 'Ikeja')
+        self.assertEqual(alert.location.address, 'Near Ikeja, Lagos')
+        self.assertIn('Near Ikeja, Lagos', AlertSearchDocument.objects.get(alert=alert).body)
+
+    @patch('alerts.views.NotificationDispatcher.dispatch_alert')
+    def test_missing_gazetteer_leaves_address_empty(self, mock_dispatch):
+        with override_settings(GAZETTEER_PATH='/nonexistent/gazetteer.bin'):
+            response = self.client.post(
+                reverse('alert-create'), ALERT_PAYLOAD, format='json', **auth_header(self.user),
+            )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertIsNone(response.data['location']['address'])
+
+
 class PriorityQuestionsTests(APITestCase):
     url = reverse('alert-priority-questions')
 
@@ -308,6 +626,291 @@ class AlertStatusViewTests(APITestCase):
         response = self.client.get(url, **auth_header(self.other_user))
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
 
+    def test_unchanged_status_returns_304(self):
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        first = self.client.get(url, **auth_header(self.user))
+        etag = first['ETag']
+
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.user))
+        self.assertEqual(second.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertFalse(second.content)
+
+    def test_status_change_invalidates_etag(self):
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        etag = self.client.get(url, **auth_header(self.user))['ETag']
+
+        self.client.put(reverse('alert-cancel', args=[self.alert.alert_id]), **auth_header(self.user))
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'CANCELLED')
+
+    def test_rating_invalidates_etag(self):
+        EmergencyAlert.objects.filter(pk=self.alert.pk).update(status='RESOLVED')
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        etag = self.client.get(url, **auth_header(self.user))['ETag']
+
+        rate = self.client.patch(
+            reverse('alert-rate', args=[self.alert.alert_id]), {'rating': 4}, format='json',
+            **auth_header(self.user),
+        )
+        self.assertEqual(rate.status_code, status.HTTP_200_OK)
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['rating'], 4)
+
+    def test_rating_changes_probe_version_and_cached_payload(self):
+        cache.clear()
+        EmergencyAlert.objects.filter(pk=self.alert.pk).update(status='RESOLVED')
+        probe_url = reverse('alert-status-probe', args=[self.alert.alert_id])
+        before = self.client.get(probe_url, **auth_header(self.user)).data['version']
+        self.assertIsNone(self.client.get(reverse('alert-status', args=[self.alert.alert_id]), **auth_header(self.user)).data['rating'])
+
+        self.client.patch(
+            reverse('alert-rate', args=[self.alert.alert_id]), {'rating': 5}, format='json',
+            **auth_header(self.user),
+        )
+
+        after = self.client.get(probe_url, HTTP_IF_NONE_MATCH=before, **auth_header(self.user))
+        self.assertEqual(after.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(after.data['version'], before)
+        detail = self.client.get(reverse('alert-status', args=[self.alert.alert_id]), **auth_header(self.user))
+        self.assertEqual(detail.data['rating'], 5)
+
+    def test_probe_reports_status_and_version(self):
+        detail = self.client.get(reverse('alert-status', args=[self.alert.alert_id]), **auth_header(self.user))
+        url = reverse('alert-status-probe', args=[self.alert.alert_id])
+        probe = self.client.get(url, **auth_header(self.user))
+        self.assertEqual(probe.status_code, status.HTTP_200_OK)
+        self.assertEqual(probe.data['status'], 'PENDING')
+        self.assertEqual(probe.data['version'], detail['ETag'])
+
+        again = self.client.get(url, HTTP_IF_NONE_MATCH=probe.data['version'], **auth_header(self.user))
+        self.assertEqual(again.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_version_is_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertIsNotNone(get_alert_status_version(self.alert.alert_id))
+
+    def test_version_follows_incident_assignments(self):
+        agency = create_agency()
+        parent = EmergencyAlert.objects.create(
+            user=self.other_user, alert_type='BANDITRY', priority_level='HIGH', status='DISPATCHED',
+        )
+        self.alert.parent_alert = parent
+        self.alert.save(update_fields=['parent_alert', 'updated_at'])
+        before = get_alert_status_version(self.alert.alert_id).etag
+        AlertAssignment.objects.create(alert=parent, agency=agency)
+        self.assertNotEqual(get_alert_status_version(self.alert.alert_id).etag, before)
+
+    def test_detail_is_served_from_cache_while_version_matches(self):
+        cache.clear()
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        headers = auth_header(self.user)
+        first = self.client.get(url, **headers)
+        # JWT user lookup + version query; no prefetch or serialization.
+        with self.assertNumQueries(2):
+            second = self.client.get(url, **headers)
+        self.assertEqual(second.data, first.data)
+
+    def test_cancel_invalidates_cached_detail(self):
+        cache.clear()
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        self.client.get(url, **auth_header(self.user))
+        self.assertIsNotNone(cache.get(STATUS_CACHE_KEY.format(self.alert.alert_id)))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.put(reverse('alert-cancel', args=[self.alert.alert_id]), **auth_header(self.user))
+        self.assertIsNone(cache.get(STATUS_CACHE_KEY.format(self.alert.alert_id)))
+        self.assertEqual(self.client.get(url, **auth_header(self.user)).data['status'], 'CANCELLED')
+
+    def test_other_user_cannot_probe_etag(self):
+        url = reverse('alert-status', args=[self.alert.alert_id])
+        etag = self.client.get(url, **auth_header(self.user))['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.other_user))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+@override_settings(ALERT_STATUS_WAIT_POLL_INTERVAL_S=0.05)
+class AlertStatusWaitTests(TransactionTestCase):
+    # The view reads the database from worker threads, so the rows must be
+    # committed rather than held in a per-test transaction.
+    def setUp(self):
+        self.user = create_user()
+        self.other_user = create_user(email='other@test.com', phone='+2348022222222')
+        self.alert = EmergencyAlert.objects.create(
+            user=self.user, alert_type='BANDITRY', priority_level='HIGH', status='PENDING',
+        )
+        Location.objects.create(alert=self.alert, latitude='6.5', longitude='3.3')
+        self.url = reverse('alert-status-wait', args=[self.alert.alert_id])
+        self.headers = {'Authorization': auth_header(self.user)['HTTP_AUTHORIZATION']}
+
+    def test_stale_etag_returns_status_immediately(self):
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH='W/"stale"', **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['alert_id'], self.alert.alert_id)
+        self.assertEqual(
+            response['ETag'],
+            self.client.get(reverse('alert-status', args=[self.alert.alert_id]), **auth_header(self.user))['ETag'],
+        )
+
+    def test_current_etag_is_not_parked_under_wsgi(self):
+        etag = self.client.get(self.url, **auth_header(self.user))['ETag']
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag, **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_terminal_alert_closes_channel(self):
+        self.client.put(reverse('alert-cancel', args=[self.alert.alert_id]), **auth_header(self.user))
+        first = self.client.get(self.url, **auth_header(self.user))
+        self.assertEqual(first.json()['status'], 'CANCELLED')
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=first['ETag'], **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_other_user_is_forbidden(self):
+        response = self.client.get(self.url, **auth_header(self.other_user))
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_requires_authentication(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_hub_wakes_only_changed_alerts(self):
+        async def run():
+            hub = AlertWatchHub()
+            seen = timezone.now()
+            changed = hub.watch(1, seen)
+            unchanged = hub.watch(2, seen)
+            hub.notify({1: seen + timedelta(seconds=1), 2: seen})
+            result = changed.is_set(), unchanged.is_set()
+            hub.unwatch(1, changed)
+            hub.unwatch(2, unchanged)
+            return result, hub.waiter_count()
+
+        (changed, unchanged), remaining = async_to_sync(run)()
+        self.assertTrue(changed)
+        self.assertFalse(unchanged)
+        self.assertEqual(remaining, 0)
+
+    def _etag(self):
+        return self.client.get(self.url, HTTP_AUTHORIZATION=self.headers['Authorization'])['ETag']
+
+    def test_unchanged_alert_times_out_with_304(self):
+        etag = self._etag()
+        response = async_to_sync(AsyncClient().get)(
+            self.url, {'timeout': '0.2'}, headers={**self.headers, 'If-None-Match': etag},
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_status_change_releases_parked_request(self):
+        etag = self._etag()
+
+        def acknowledge():
+            self.alert.status = 'ACKNOWLEDGED'
+            self.alert.save(update_fields=['status', 'updated_at'])
+
+        async def wait_and_change():
+            request = asyncio.ensure_future(AsyncClient().get(
+                self.url, {'timeout': '10'}, headers={**self.headers, 'If-None-Match': etag},
+            ))
+            await asyncio.sleep(0.2)
+            await asyncio.get_running_loop().run_in_executor(None, acknowledge)
+            return await asyncio.wait_for(request, timeout=5)
+
+        response = async_to_sync(wait_and_change)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['status'], 'ACKNOWLEDGED')
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_location_change_releases_parked_request(self):
+        etag = self._etag()
+
+        def move():
+            # Only the location row changes; the alert's updated_at does not.
+            Location.objects.filter(alert=self.alert).update(latitude='6.7000')
+
+        async def wait_and_move():
+            request = asyncio.ensure_future(AsyncClient().get(
+                self.url, {'timeout': '10'}, headers={**self.headers, 'If-None-Match': etag},
+            ))
+            await asyncio.sleep(0.2)
+            await asyncio.get_running_loop().run_in_executor(None, move)
+            return await asyncio.wait_for(request, timeout=5)
+
+        response = async_to_sync(wait_and_move)()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()['location']['latitude'], '6.7000000')
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class AlertLifecycleTests(APITestCase):
+    def setUp(self):
+        self.received = []
+        lifecycle.subscribe(self.received.append, lifecycle.ALERT_STATUS_CHANGED)
+        self.addCleanup(lifecycle.unsubscribe, self.received.append)
+        self.alert = EmergencyAlert.objects.create(
+            user=create_user(), alert_type='FIRE_INCIDENT', priority_level='HIGH', status='PENDING'
+        )
+
+    def test_emit_records_event_and_delivers_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            event = lifecycle.emit(lifecycle.ALERT_STATUS_CHANGED, self.alert.alert_id, status='RESOLVED')
+            self.assertEqual(self.received, [])
+
+        self.assertEqual(self.received, [event])
+        self.assertEqual(event.data, {'status': 'RESOLVED'})
+        self.assertEqual(lifecycle.events_after(event.event_id - 1), [event])
+
+    def test_rolled_back_event_is_neither_recorded_nor_delivered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    lifecycle.emit(lifecycle.ALERT_STATUS_CHANGED, self.alert.alert_id, status='RESOLVED')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(self.received, [])
+        self.assertEqual(lifecycle.latest_event_id(), 0)
+
+    def test_other_kinds_are_not_delivered(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            lifecycle.emit(lifecycle.ALERT_LOCATION_CHANGED, self.alert.alert_id, latitude='6.5')
+        self.assertEqual(self.received, [])
+
+    def test_location_change_is_delivered_without_a_row(self):
+        lifecycle.subscribe(self.received.append, lifecycle.ALERT_LOCATION_CHANGED)
+        with self.assertNumQueries(0), self.captureOnCommitCallbacks() as callbacks:
+            event = lifecycle.emit(lifecycle.ALERT_LOCATION_CHANGED, self.alert.alert_id, latitude='6.5')
+        for callback in callbacks:
+            callback()
+
+        self.assertIsNone(event.event_id)
+        self.assertEqual(self.received, [event])
+        self.assertEqual(lifecycle.latest_event_id(), 0)
+
+    def test_failing_subscriber_does_not_affect_others(self):
+        def broken(event):
+            raise RuntimeError('boom')
+
+        lifecycle.subscribe(broken, lifecycle.ALERT_STATUS_CHANGED)
+        self.addCleanup(lifecycle.unsubscribe, broken)
+        with self.assertLogs('alerts.lifecycle', 'ERROR'), self.captureOnCommitCallbacks(execute=True):
+            lifecycle.emit(lifecycle.ALERT_STATUS_CHANGED, self.alert.alert_id, status='RESOLVED')
+        self.assertEqual(len(self.received), 1)
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            lifecycle.emit('alert.exploded', self.alert.alert_id)
+
+    def test_status_change_drops_cached_status_payload(self):
+        cache.set(STATUS_CACHE_KEY.format(self.alert.alert_id), ('etag', {}))
+        with self.captureOnCommitCallbacks(execute=True):
+            lifecycle.emit(lifecycle.ALERT_STATUS_CHANGED, self.alert.alert_id, status='RESOLVED')
+        self.assertIsNone(cache.get(STATUS_CACHE_KEY.format(self.alert.alert_id)))
+
 
 class AlertHistoryTests(APITestCase):
     url = reverse('alert-history')
@@ -417,6 +1020,7 @@ class UpdateAlertLocationTests(APITestCase):
             priority_level='HIGH', status='DISPATCHED',
         )
         Location.objects.create(alert=self.alert, latitude='6.5244', longitude='3.3792')
+        cache.clear()
 
     def url(self):
         return reverse('alert-update-location', args=[self.alert.alert_id])
@@ -479,6 +1083,172 @@ class UpdateAlertLocationTests(APITestCase):
         response = self.client.patch(self.url(), {}, **auth_header(self.user))
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @override_settings(LOCATION_UPDATE_MIN_INTERVAL_S=0, LOCATION_UPDATE_MIN_DISTANCE_M=0)
+    def test_accepted_update_is_a_single_update_statement(self):
+        headers = auth_header(self.user)
+        # User lookup (JWT auth), the conditional UPDATE and, with no last
+        # write cached, the read of the stored accuracy and address.
+        with self.assertNumQueries(3):
+            self.client.patch(self.url(), {'latitude': '6.6000', 'longitude': '3.4000'}, **headers)
+        # Afterwards just the user lookup and the UPDATE; the track ping and
+        # the dashboard events are written once the request commits.
+        with self.assertNumQueries(2):
+            response = self.client.patch(
+                self.url(), {'latitude': '6.7000', 'longitude': '3.5000'}, **headers
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(LOCATION_UPDATE_MIN_INTERVAL_S=30)
+    def test_rapid_updates_are_coalesced(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first = self.client.patch(
+                self.url(), {'latitude': '6.6000', 'longitude': '3.4000'}, **auth_header(self.user)
+            )
+            second = self.client.patch(
+                self.url(), {'latitude': '6.7000', 'longitude': '3.5000'}, **auth_header(self.user)
+            )
+        self.assertFalse(first.data['coalesced'])
+        self.assertTrue(second.data['coalesced'])
+        self.assertEqual(second.data['update_interval_s'], 30)
+        self.assertEqual(second.data['latitude'], '6.6000')
+
+        self.alert.location.refresh_from_db()
+        self.assertAlmostEqual(float(self.alert.location.latitude), 6.6000, places=3)
+        self.assertEqual(LocationPing.objects.filter(alert=self.alert).count(), 1)
+
+    @override_settings(LOCATION_UPDATE_MIN_INTERVAL_S=0, LOCATION_UPDATE_MIN_DISTANCE_M=20)
+    def test_small_moves_are_coalesced(self):
+        self.client.patch(
+            self.url(), {'latitude': '6.6000', 'longitude': '3.4000'}, **auth_header(self.user)
+        )
+        # ~5 m north: coalesced.  ~110 m north: written.
+        nudge = self.client.patch(
+            self.url(), {'latitude': '6.6000450', 'longitude': '3.4000'}, **auth_header(self.user)
+        )
+        move = self.client.patch(
+            self.url(), {'latitude': '6.6010', 'longitude': '3.4000'}, **auth_header(self.user)
+        )
+        self.assertTrue(nudge.data['coalesced'])
+        self.assertFalse(move.data['coalesced'])
+        self.alert.location.refresh_from_db()
+        self.assertAlmostEqual(float(self.alert.location.latitude), 6.6010, places=4)
+
+    @override_settings(LOCATION_UPDATE_MIN_INTERVAL_S=30)
+    def test_cancelled_alert_is_not_coalesced(self):
+        data = {'latitude': '6.6000', 'longitude': '3.4000'}
+        self.client.patch(self.url(), data, **auth_header(self.user))
+        with self.captureOnCommitCallbacks(execute=True):
+            cancel = self.client.put(reverse('alert-cancel', args=[self.alert.alert_id]), **auth_header(self.user))
+        self.assertEqual(cancel.status_code, status.HTTP_200_OK)
+
+        response = self.client.patch(self.url(), data, **auth_header(self.user))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(LOCATION_UPDATE_MIN_INTERVAL_S=0, LOCATION_UPDATE_MIN_DISTANCE_M=0)
+    def test_omitted_fields_keep_and_report_stored_values(self):
+        Location.objects.filter(alert=self.alert).update(address='12 Marina Road, Lagos')
+        self.client.patch(
+            self.url(), {'latitude': '6.6000', 'longitude': '3.4000', 'accuracy': 5},
+            format='json', **auth_header(self.user),
+        )
+        for clear_cache in (False, True):
+            if clear_cache:
+                cache.clear()
+            with patch('alerts.views.reverse_geocode', return_value=None):
+                response = self.client.patch(
+                    self.url(), {'latitude': '6.7000', 'longitude': '3.5000'},
+                    format='json', **auth_header(self.user),
+                )
+            self.alert.location.refresh_from_db()
+            self.assertEqual(self.alert.location.accuracy, 5)
+            self.assertEqual(response.data['accuracy'], 5)
+            self.assertEqual(response.data['address'], self.alert.location.address)
+
+    def test_coalescing_does_not_skip_ownership_check(self):
+        self.client.patch(
+            self.url(), {'latitude': '6.6000', 'longitude': '3.4000'}, **auth_header(self.user)
+        )
+        response = self.client.patch(
+            self.url(), {'latitude': '6.6000', 'longitude': '3.4000'}, **auth_header(self.other_user)
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_location_appends_track_ping(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                self.url(), {'latitude': '6.6000', 'longitude': '3.4000', 'accuracy': 5},
+                **auth_header(self.user),
+            )
+        ping = LocationPing.objects.get(alert=self.alert)
+        self.assertEqual(ping.lat_e7, 66000000)
+        self.assertEqual(ping.lng_e7, 34000000)
+        self.assertEqual(ping.accuracy, 5)
+
+
+class LocationTrackTests(APITestCase):
+    def setUp(self):
+        self.alert = EmergencyAlert.objects.create(
+            user=create_user(), alert_type='BANDITRY', priority_level='HIGH', status='DISPATCHED',
+        )
+
+    def test_writer_buffers_until_batch_is_full(self):
+        writer = LocationTrackWriter(batch_size=3, flush_interval=60)
+        now = timezone.now()
+        writer.append(self.alert.alert_id, '6.5244', '3.3792', None, now)
+        writer.append(self.alert.alert_id, '6.5245', '3.3793', None, now)
+        self.assertEqual(writer.pending(), 2)
+        self.assertEqual(LocationPing.objects.count(), 0)
+
+        self.assertEqual(writer.flush(), 2)
+        self.assertEqual(writer.pending(), 0)
+        self.assertEqual(LocationPing.objects.count(), 2)
+
+    def test_rejected_ping_does_not_drop_the_batch(self):
+        other = EmergencyAlert.objects.create(
+            user=self.alert.user, alert_type='BANDITRY', priority_level='HIGH', status='DISPATCHED',
+        )
+        writer = LocationTrackWriter(batch_size=10, flush_interval=60)
+        now = timezone.now()
+        for alert_id in (self.alert.alert_id, 999999, other.alert_id, self.alert.alert_id):
+            writer.append(alert_id, '6.5244', '3.3792', None, now)
+        real_bulk_create = LocationPing.objects.bulk_create
+
+        def bulk_create(batch, **kwargs):
+            # SQLite defers FK checks inside the test transaction; reject like MySQL would.
+            if any(ping.alert_id == 999999 for ping in batch):
+                raise IntegrityError('FOREIGN KEY constraint failed')
+            return real_bulk_create(batch, **kwargs)
+
+        with patch.object(LocationPing.objects, 'bulk_create', side_effect=bulk_create):
+            self.assertEqual(writer.flush(), 3)
+        self.assertEqual(LocationPing.objects.filter(alert=self.alert).count(), 2)
+        self.assertEqual(LocationPing.objects.filter(alert=other).count(), 1)
+
+    def test_ping_waits_for_the_creating_transaction(self):
+        try:
+            with transaction.atomic():
+                record_ping(self.alert.alert_id, '6.5244', '3.3792')
+                raise RuntimeError('creation failed')
+        except RuntimeError:
+            pass
+        with self.captureOnCommitCallbacks(execute=True):
+            record_ping(self.alert.alert_id, '6.5245', '3.3793')
+        self.assertEqual(LocationPing.objects.filter(alert=self.alert).count(), 1)
+
+    def test_douglas_peucker_drops_collinear_points(self):
+        # Eleven pings along a straight line plus one 50 m detour.
+        points = [(65244000 + i * 1000, 33792000, i) for i in range(11)]
+        points[5] = (points[5][0], 33792000 + 4500, 5)
+        simplified = douglas_peucker(points, tolerance_m=35)
+        self.assertEqual([p[2] for p in simplified], [0, 5, 10])
+        self.assertEqual(len(douglas_peucker(points, tolerance_m=0)), 11)
+
+    def test_bucket_by_time_keeps_last_point_per_bucket(self):
+        start = timezone.now().replace(second=0, microsecond=0)
+        points = [(0, 0, start + timedelta(seconds=s)) for s in (0, 10, 20, 70, 80)]
+        kept = bucket_by_time(points, bucket_s=60)
+        self.assertEqual([p[2] for p in kept], [points[0][2], points[2][2], points[4][2]])
+
 
 # ─── Throttle fallback ────────────────────────────────────────────────────────
 
@@ -556,7 +1326,7 @@ class ThrottleResponseHeaderTests(APITestCase):
     url = reverse('alert-create')
 
     def setUp(self):
-        cache.clear()
+        caches['throttle'].clear()
         self.user = create_user(email='throttle@test.com', phone='+2348098888888')
         create_agency('Police Force', 'POLICE', 'p2@test.com', '+2348012340000')
 
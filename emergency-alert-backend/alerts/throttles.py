@@ -1,6 +1,6 @@
 import logging
 
-from rest_framework.throttling import UserRateThrottle
+from alert_system.throttles import UserRateThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -0,0 +1,194 @@
+"""
+Movement tracks for active alerts.
+
+UpdateAlertLocationView used to overwrite the single Location row, so the
+path of a moving victim was lost.  Every accepted position is now also
+appended to LocationPing through LocationTrackWriter, which buffers pings in
+memory and writes them with one bulk INSERT per batch, so a location update
+costs an in-memory append instead of an extra INSERT.
+
+Long tracks are downsampled on read with Douglas-Peucker (shape-preserving)
+and/or time bucketing (one ping per bucket).
+"""
+import atexit
+import logging
+import math
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from .geo import METRES_PER_DEGREE_LAT
+from .models import LocationPing
+
+logger = logging.getLogger(__name__)
+
+
+def to_e7(value):
+    """Degrees (Decimal, float or str) to scaled integer 1e-7 degrees."""
+    return int(round(float(value) * LocationPing.SCALE))
+
+
+class LocationTrackWriter:
+    """
+    Buffered, batched writer for LocationPing rows.
+
+    Pings are flushed with bulk_create when the buffer reaches batch_size or
+    when flush_interval seconds have passed, whichever comes first.  With
+    batch_size <= 1 every ping is written immediately (used by the tests and
+    by deployments that prefer durability over write amplification).
+    Pings still buffered when a process dies are lost, which is bounded by
+    flush_interval seconds of movement history.  A batch the database
+    rejects is split and retried, so one bad row costs only itself.
+    """
+
+    def __init__(self, batch_size=None, flush_interval=None):
+        self.batch_size = batch_size if batch_size is not None else settings.LOCATION_TRACK_BATCH_SIZE
+        self.flush_interval = (
+            flush_interval if flush_interval is not None else settings.LOCATION_TRACK_FLUSH_INTERVAL_S
+        )
+        self._buffer = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def append(self, alert_id, latitude, longitude, accuracy, recorded_at):
+        ping = LocationPing(
+            alert_id=alert_id,
+            lat_e7=to_e7(latitude),
+            lng_e7=to_e7(longitude),
+            accuracy=accuracy,
+            recorded_at=recorded_at,
+        )
+        if self.batch_size <= 1:
+            ping.save(force_insert=True)
+            return
+        with self._lock:
+            self._buffer.append(ping)
+            full = len(self._buffer) >= self.batch_size
+            self._ensure_flusher()
+        if full:
+            self._wakeup.set()
+
+    def pending(self):
+        with self._lock:
+            return len(self._buffer)
+
+    def flush(self):
+        """Write every buffered ping.  Returns the number of rows written."""
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        return self._write(batch)
+
+    def _write(self, batch):
+        """bulk_create the batch, bisecting it on failure down to single rows."""
+        try:
+            with transaction.atomic():
+                LocationPing.objects.bulk_create(batch, batch_size=500)
+        except Exception:
+            if len(batch) == 1:
+                logger.exception(f"Dropped location ping for alert_id={batch[0].alert_id}")
+                return 0
+            middle = len(batch) // 2
+            return self._write(batch[:middle]) + self._write(batch[middle:])
+        return len(batch)
+
+    def _ensure_flusher(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name='location-track-writer',
+            )
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(timeout=self.flush_interval)
+            self._wakeup.clear()
+            close_old_connections()
+            try:
+                self.flush()
+            finally:
+                close_old_connections()
+
+
+track_writer = LocationTrackWriter()
+atexit.register(track_writer.flush)
+
+
+def record_ping(alert_id, latitude, longitude, accuracy=None, recorded_at=None):
+    """
+    Append one position to an alert's track via the process-wide writer.
+    Buffered only once the caller's transaction commits, so a rolled-back
+    alert never leaves a ping pointing at a missing row.
+    """
+    recorded_at = recorded_at or timezone.now()
+    transaction.on_commit(
+        lambda: track_writer.append(alert_id, latitude, longitude, accuracy, recorded_at)
+    )
+
+
+# ─── Downsampling ─────────────────────────────────────────────────────────────
+
+def _project(points):
+    """Equirectangular projection to metres around the track's first point."""
+    if not points:
+        return []
+    lat0 = points[0][0] / LocationPing.SCALE
+    kx = METRES_PER_DEGREE_LAT * math.cos(math.radians(lat0)) / LocationPing.SCALE
+    ky = METRES_PER_DEGREE_LAT / LocationPing.SCALE
+    return [(p[1] * kx, p[0] * ky) for p in points]
+
+
+def _segment_distance(p, a, b):
+    (px, py), (ax, ay), (bx, by) = p, a, b
+    dx, dy = bx - ax, by - ay
+    if dx == 0 and dy == 0:
+        return math.hypot(px - ax, py - ay)
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / (dx * dx + dy * dy)))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def douglas_peucker(points, tolerance_m):
+    """
+    Simplify a track, keeping every point that deviates more than
+    tolerance_m from the simplified line.  points are tuples whose first two
+    items are lat_e7, lng_e7; the kept tuples are returned unchanged.
+    Iterative, so very long tracks cannot hit the recursion limit.
+    """
+    if tolerance_m <= 0 or len(points) < 3:
+        return list(points)
+    xy = _project(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        start, end = stack.pop()
+        max_dist, index = 0.0, None
+        for i in range(start + 1, end):
+            dist = _segment_distance(xy[i], xy[start], xy[end])
+            if dist > max_dist:
+                max_dist, index = dist, i
+        if index is not None and max_dist > tolerance_m:
+            keep[index] = True
+            stack.append((start, index))
+            stack.append((index, end))
+    return [p for p, kept in zip(points, keep) if kept]
+
+
+def bucket_by_time(points, bucket_s, time_index=2):
+    """Keep the last point of every bucket_s-second window (plus the first point)."""
+    if bucket_s <= 0 or not points:
+        return list(points)
+    result = [points[0]]
+    last_bucket = None
+    for point in points[1:]:
+        bucket = int(point[time_index].timestamp() // bucket_s)
+        if bucket == last_bucket:
+            result[-1] = point
+        else:
+            result.append(point)
+            last_bucket = bucket
+    return result
@@ -3,17 +3,21 @@ from .views import (
     CreateEmergencyAlertView,
     PriorityQuestionsView,
     AlertStatusView,
+    AlertStatusProbeView,
     UserAlertHistoryView,
     UpdateAlertLocationView,
     CancelAlertView,
     RateAlertView,
 )
+from .realtime import alert_status_wait
 
 urlpatterns = [
     path('priority-questions/', PriorityQuestionsView.as_view(), name='alert-priority-questions'),
     path('create/', CreateEmergencyAlertView.as_view(), name='alert-create'),
     path('history/', UserAlertHistoryView.as_view(), name='alert-history'),
     path('<int:alert_id>/status/', AlertStatusView.as_view(), name='alert-status'),
+    path('<int:alert_id>/status/probe/', AlertStatusProbeView.as_view(), name='alert-status-probe'),
+    path('<int:alert_id>/status/wait/', alert_status_wait, name='alert-status-wait'),
     path('<int:alert_id>/location/', UpdateAlertLocationView.as_view(), name='alert-update-location'),
     path('<int:alert_id>/cancel/', CancelAlertView.as_view(), name='alert-cancel'),
     path('<int:alert_id>/rate/', RateAlertView.as_view(), name='alert-rate'),
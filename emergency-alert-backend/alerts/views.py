@@ -1,24 +1,47 @@
-import math
 import logging
+import time
+from datetime import timedelta
 from decimal import Decimal, InvalidOperation
 
 from django.conf import settings
+from django.core.cache import cache
 from django.db import transaction
+from django.utils import timezone
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from .throttles import AlertCreationThrottle
+from alert_system.conditional import is_not_modified, not_modified_response, with_etag
 
-from .models import EmergencyAlert, AlertAssignment
+from .models import EmergencyAlert, AlertAssignment, Location
 from .serializers import (
     EmergencyAlertCreateSerializer,
     EmergencyAlertDetailSerializer,
     EmergencyAlertListSerializer,
 )
+from .status_payload import (
+    TERMINAL_STATUSES,
+    cached_alert_status,
+    can_view_alert_status,
+    get_alert_status_version,
+)
+from .lifecycle import ALERT_CREATED, ALERT_LOCATION_CHANGED, ALERT_STATUS_CHANGED, emit
 from .priority_engine import QUESTION_SCHEMA_VERSION, get_questions
+from .geo import haversine_km
+from .geocoder import describe_place, reverse_geocode
+from .tracks import record_ping
+from .search import index_alerts
+from .sync import close_assignments
+from .correlation import find_parent_incident, hand_over_incident, link_to_incident
 from agencies.models import SecurityAgency
 from notifications.services import NotificationDispatcher, enqueue_alert_dispatch
+from notifications.escalation import (
+    assign_escalation_rings,
+    cancel_escalation,
+    get_escalation_timeout,
+    schedule_escalation,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -34,16 +57,6 @@ ALERT_TYPE_AGENCY_MAP = {
 }
 
 
-def _haversine_km(lat1, lon1, lat2, lon2):
-    """Great-circle distance in kilometres (Haversine formula)."""
-    R = 6371.0
-    phi1, phi2 = math.radians(lat1), math.radians(lat2)
-    dphi = math.radians(lat2 - lat1)
-    dlambda = math.radians(lon2 - lon1)
-    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
-    return R * 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-
-
 def _rank_agencies(agencies, alert_lat, alert_lng):
     """
     Sort agencies by distance from the alert location.
@@ -58,7 +71,7 @@ def _rank_agencies(agencies, alert_lat, alert_lng):
     with_geo, without_geo = [], []
     for agency in agencies:
         if agency.latitude is not None and agency.longitude is not None:
-            dist = _haversine_km(
+            dist = haversine_km(
                 alert_lat, alert_lng,
                 float(agency.latitude), float(agency.longitude),
             )
@@ -86,8 +99,25 @@ class CreateEmergencyAlertView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
         with transaction.atomic():
+            parent = find_parent_incident(
+                serializer.validated_data['alert_type'],
+                serializer.validated_data['latitude'],
+                serializer.validated_data['longitude'],
+            )
             alert = serializer.save(user=request.user)
 
+            if parent is not None:
+                # Duplicate report of an incident that is already being handled:
+                # record the reporter but do not page the same agencies again.
+                link_to_incident(alert, parent)
+                logger.info(
+                    f"Alert #{alert.alert_id} linked to incident #{parent.alert_id}; dispatch suppressed"
+                )
+                return Response(
+                    EmergencyAlertDetailSerializer(alert, context={'request': request}).data,
+                    status=status.HTTP_201_CREATED,
+                )
+
             agency_types = ALERT_TYPE_AGENCY_MAP.get(alert.alert_type, ['POLICE'])
             agencies = list(SecurityAgency.objects.filter(
                 agency_type__in=agency_types, is_active=True
@@ -105,27 +135,54 @@ class CreateEmergencyAlertView(APIView):
                 # No location on alert ? fall back to type-only, all priority=1
                 ranked = [(a, None) for a in agencies]
 
+            # Only ring 1 is notified now; later rings wait on standby and are
+            # released by the escalation scheduler if nobody acknowledges.
+            rings = assign_escalation_rings(ranked, settings.ALERT_ESCALATION_RING_SIZE)
             assignments = [
-                AlertAssignment(alert=alert, agency=agency, assignment_priority=i + 1)
-                for i, (agency, _) in enumerate(ranked)
+                AlertAssignment(
+                    alert=alert,
+                    agency=agency,
+                    assignment_priority=i + 1,
+                    escalation_ring=ring,
+                    is_standby=ring > 1,
+                )
+                for i, (agency, ring) in enumerate(rings)
             ]
             AlertAssignment.objects.bulk_create(assignments)
 
             alert.status = 'DISPATCHED'
-            alert.save(update_fields=['status'])
+            if any(a.is_standby for a in assignments):
+                alert.escalation_due_at = timezone.now() + timedelta(seconds=get_escalation_timeout())
+            alert.save(update_fields=['status', 'escalation_due_at', 'updated_at'])
+            emit(
+                ALERT_CREATED, alert.alert_id,
+                alert_type=alert.alert_type, priority_level=alert.priority_level, status=alert.status,
+            )
+
+            # Standby rings are released by the scheduler in both dispatch modes.
+            if alert.escalation_due_at is not None:
+                alert_id, due_at = alert.alert_id, alert.escalation_due_at
+                transaction.on_commit(
+                    lambda alert_id=alert_id: schedule_escalation(alert_id, due_at)
+                )
 
             if settings.ALERT_DISPATCH_ASYNC:
                 alert_id = alert.alert_id
                 transaction.on_commit(
                     lambda alert_id=alert_id: enqueue_alert_dispatch(alert_id)
                 )
-            else:
-                dispatcher = NotificationDispatcher()
-                created_assignments = AlertAssignment.objects.filter(alert=alert).select_related(
-                    'alert__user', 'alert__location', 'agency'
-                )
-                for assignment in created_assignments:
-                    dispatcher.dispatch_alert(assignment)
+
+        # Sync mode sends after the transaction, so its network I/O does not
+        # hold the new rows (and their dashboard event ids) uncommitted.
+        if not settings.ALERT_DISPATCH_ASYNC:
+            dispatcher = NotificationDispatcher()
+            created_assignments = AlertAssignment.objects.filter(
+                alert=alert, is_standby=False,
+            ).select_related(
+                'alert__user', 'alert__location', 'agency'
+            )
+            for assignment in created_assignments:
+                dispatcher.dispatch_alert(assignment)
 
         return Response(
             EmergencyAlertDetailSerializer(alert, context={'request': request}).data,
@@ -161,28 +218,54 @@ class PriorityQuestionsView(APIView):
 
 
 class AlertStatusView(APIView):
+    """
+    GET /api/alerts/{alert_id}/status/
+    Full status payload.  Answered with 304 when If-None-Match carries the
+    current version, and otherwise served from the version-keyed cache.
+    """
     permission_classes = [IsAuthenticated]
 
     def get(self, request, alert_id):
-        try:
-            alert = EmergencyAlert.objects.select_related('location').prefetch_related(
-                'assignments__agency',
-                'assignments__acknowledgment',
-                'assignments__notifications',
-            ).get(alert_id=alert_id)
-        except EmergencyAlert.DoesNotExist:
+        version = get_alert_status_version(alert_id)
+        if version is None:
             return Response({'error': 'Alert not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if not can_view_alert_status(request.user, version.owner_id):
+            return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+        if is_not_modified(request, version.etag):
+            return not_modified_response(version.etag)
 
-        is_owner = alert.user_id == request.user.pk
-        is_agency_staff = hasattr(request.user, 'agency_profile')
+        data = cached_alert_status(alert_id, version, request)
+        if data is None:
+            return Response({'error': 'Alert not found.'}, status=status.HTTP_404_NOT_FOUND)
+        return with_etag(Response(data, status=status.HTTP_200_OK), version.etag)
 
-        if not (is_owner or is_agency_staff):
-            return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
 
-        return Response(
-            EmergencyAlertDetailSerializer(alert, context={'request': request}).data,
+class AlertStatusProbeView(APIView):
+    """
+    GET /api/alerts/{alert_id}/status/probe/
+    {alert_id, status, updated_at, version} from one indexed query.  version
+    is the ETag of /status/, so clients fetch the full payload only when it
+    changes.  Also honors If-None-Match.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, alert_id):
+        version = get_alert_status_version(alert_id)
+        if version is None:
+            return Response({'error': 'Alert not found.'}, status=status.HTTP_404_NOT_FOUND)
+        if not can_view_alert_status(request.user, version.owner_id):
+            return Response({'error': 'Permission denied.'}, status=status.HTTP_403_FORBIDDEN)
+        if is_not_modified(request, version.etag):
+            return not_modified_response(version.etag)
+        return with_etag(Response(
+            {
+                'alert_id': alert_id,
+                'status': version.status,
+                'updated_at': version.updated_at,
+                'version': version.etag,
+            },
             status=status.HTTP_200_OK,
-        )
+        ), version.etag)
 
 
 class UserAlertHistoryView(APIView):
@@ -199,30 +282,45 @@ class UserAlertHistoryView(APIView):
         )
 
 
+LAST_LOCATION_CACHE_KEY = 'alert_location:{}'
+
+
+def on_alert_status_changed(event):
+    """Lifecycle subscriber: a finished alert stops acknowledging coalesced updates."""
+    alert_ids = [event.alert_id] if event.data.get('status') in TERMINAL_STATUSES else []
+    if 'previous_alert_id' in event.data:
+        alert_ids.append(event.data['previous_alert_id'])
+    cache.delete_many([LAST_LOCATION_CACHE_KEY.format(alert_id) for alert_id in alert_ids])
+
+
 class UpdateAlertLocationView(APIView):
     """
     PATCH /api/alerts/{alert_id}/location/
     Called by the civilian app every ~15 seconds while the alert is active
     to stream real-time position updates to the assigned agencies.
+
+    Hot path: the ownership and non-terminal checks are folded into a single
+    conditional UPDATE, so in the request an accepted update costs that one
+    statement plus a cache get and set for the last write.  It also costs
+    one Location read when no last write is cached and the update leaves
+    accuracy or address unset.  A new address reindexes the alert for search
+    (two statements).  After commit the track ping is buffered for a batched
+    insert, and the dashboard fan-out writes AgencyEvent rows (a SELECT and
+    an INSERT).  Updates that arrive within LOCATION_UPDATE_MIN_INTERVAL_S of
+    the last write, or move less than LOCATION_UPDATE_MIN_DISTANCE_M from
+    it, are coalesced (acknowledged without touching the database).  Every
+    response carries update_interval_s, the interval the client should
+    honor, and the location as stored.
     """
     permission_classes = [IsAuthenticated]
 
-    TERMINAL_STATUSES = ('RESOLVED', 'CANCELLED')
+    TERMINAL_STATUSES = TERMINAL_STATUSES
+    # A coalesced write is remembered this long; past it the next update is
+    # written through even if the civilian has not moved (acts as a heartbeat).
+    # The entry is dropped as soon as the alert is resolved or cancelled.
+    LAST_WRITE_TTL_S = 300
 
     def patch(self, request, alert_id):
-        try:
-            alert = EmergencyAlert.objects.select_related('location').get(
-                alert_id=alert_id, user=request.user
-            )
-        except EmergencyAlert.DoesNotExist:
-            return Response({'error': 'Alert not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-        if alert.status in self.TERMINAL_STATUSES:
-            return Response(
-                {'error': 'Location cannot be updated for a resolved or cancelled alert.'},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
         raw_lat = request.data.get('latitude')
         raw_lng = request.data.get('longitude')
         if raw_lat is None or raw_lng is None:
@@ -244,24 +342,109 @@ class UpdateAlertLocationView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        location = alert.location
-        location.latitude = lat
-        location.longitude = lng
-        update_fields = ['latitude', 'longitude']
+        interval_s = settings.LOCATION_UPDATE_MIN_INTERVAL_S
+        # The entry records the owner a previous write has already verified.
+        cache_key = LAST_LOCATION_CACHE_KEY.format(alert_id)
+        now_ts = time.time()
+        last = cache.get(cache_key)
+        if last is not None and last['user_id'] != request.user.pk:
+            last = None
+        if last is not None and self._should_coalesce(last, lat, lng, now_ts):
+            return Response(
+                self._payload(last['latitude'], last['longitude'], last['accuracy'],
+                              last['address'], interval_s, coalesced=True),
+                status=status.HTTP_200_OK,
+            )
 
         accuracy = request.data.get('accuracy')
+        values = {'latitude': lat, 'longitude': lng}
         if accuracy is not None:
-            location.accuracy = accuracy
-            update_fields.append('accuracy')
+            values['accuracy'] = accuracy
+
+        address = None
+        place = reverse_geocode(lat, lng)
+        if place is not None:
+            address = describe_place(place)
+            values.update(address=address, city=place.name, state=place.state or None)
+
+        # The subquery targets emergency_alerts, so this stays one UPDATE
+        # statement on MySQL as well (no self-select fallback).
+        owned_active = (
+            EmergencyAlert.objects
+            .filter(alert_id=alert_id, user=request.user)
+            .exclude(status__in=self.TERMINAL_STATUSES)
+            .values('alert_id')
+        )
+        updated = Location.objects.filter(
+            alert_id=alert_id, alert_id__in=owned_active,
+        ).update(**values)
+
+        if not updated:
+            # Only failures pay for the lookup that tells 404 from 400.
+            alert_status = (
+                EmergencyAlert.objects
+                .filter(alert_id=alert_id, user=request.user)
+                .values_list('status', flat=True)
+                .first()
+            )
+            if alert_status in self.TERMINAL_STATUSES:
+                return Response(
+                    {'error': 'Location cannot be updated for a resolved or cancelled alert.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            return Response({'error': 'Alert not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-        location.save(update_fields=update_fields)
+        record_ping(alert_id, lat, lng, accuracy)
+        if address is not None and (last is None or last['address'] != address):
+            index_alerts([alert_id])
 
-        return Response({
-            'latitude':  str(location.latitude),
-            'longitude': str(location.longitude),
-            'accuracy':  location.accuracy,
-            'maps_url':  f"https://maps.google.com/?q={location.latitude},{location.longitude}",
-        }, status=status.HTTP_200_OK)
+        # Fields this update left alone are reported as stored, from the last
+        # write's cache entry or, without one, a lookup.
+        if accuracy is None or address is None:
+            if last is not None:
+                stored_accuracy, stored_address = last['accuracy'], last['address']
+            else:
+                stored_accuracy, stored_address = (
+                    Location.objects.filter(alert_id=alert_id)
+                    .values_list('accuracy', 'address').first() or (None, None)
+                )
+            accuracy = stored_accuracy if accuracy is None else accuracy
+            address = stored_address if address is None else address
+        payload = self._payload(str(lat), str(lng), accuracy, address, interval_s)
+        emit(ALERT_LOCATION_CHANGED, alert_id, **{
+            key: payload[key] for key in ('latitude', 'longitude', 'accuracy', 'address', 'maps_url')
+        })
+        cache.set(cache_key, {
+            'user_id': request.user.pk,
+            'ts': now_ts,
+            'latitude': str(lat),
+            'longitude': str(lng),
+            'accuracy': accuracy,
+            'address': address,
+        }, timeout=self.LAST_WRITE_TTL_S)
+
+        return Response(payload, status=status.HTTP_200_OK)
+
+    @staticmethod
+    def _should_coalesce(last, lat, lng, now_ts):
+        if now_ts - last['ts'] < settings.LOCATION_UPDATE_MIN_INTERVAL_S:
+            return True
+        moved_m = haversine_km(
+            float(last['latitude']), float(last['longitude']), float(lat), float(lng),
+        ) * 1000
+        return moved_m < settings.LOCATION_UPDATE_MIN_DISTANCE_M
+
+    @staticmethod
+    def _payload(latitude, longitude, accuracy, address, interval_s, coalesced=False):
+        return {
+            'latitude':  latitude,
+            'longitude': longitude,
+            'accuracy':  accuracy,
+            'address':   address,
+            'maps_url':  f"https://maps.google.com/?q={latitude},{longitude}",
+            'update_interval_s': interval_s,
+            'coalesced': coalesced,
+        }
 
 
 class RateAlertView(APIView):
@@ -281,7 +464,8 @@ class RateAlertView(APIView):
             return Response({'error': 'Already rated.'}, status=status.HTTP_400_BAD_REQUEST)
 
         alert.rating = rating
-        alert.save(update_fields=['rating'])
+        # updated_at is part of the status ETag; leaving it out kept 304s stale.
+        alert.save(update_fields=['rating', 'updated_at'])
         return Response({'rating': rating}, status=status.HTTP_200_OK)
 
 
@@ -300,12 +484,34 @@ class CancelAlertView(APIView):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+        escalation_due_at = alert.escalation_due_at
         alert.status = 'CANCELLED'
-        alert.save(update_fields=['status'])
+        alert.escalation_due_at = None
+        alert.save(update_fields=['status', 'escalation_due_at', 'updated_at'])
+        cancel_escalation(alert.alert_id)
+
+        # Other civilians still reporting this incident keep the dispatch alive
+        # (hand-over moves the assignments and bumps their updated_at).
+        successor = hand_over_incident(alert, escalation_due_at)
+        if successor is not None:
+            emit(
+                ALERT_STATUS_CHANGED, successor.alert_id,
+                status=successor.status, previous_alert_id=alert.alert_id,
+            )
+            if successor.escalation_due_at is not None:
+                schedule_escalation(successor.alert_id, successor.escalation_due_at)
+            return Response(
+                {'message': 'Alert cancelled.', 'alert_id': alert_id},
+                status=status.HTTP_200_OK,
+            )
+
+        close_assignments(alert=alert)
+        emit(ALERT_STATUS_CHANGED, alert.alert_id, status=alert.status)
 
+        # Standby rings were never notified, so they need no cancellation notice.
         assignments = (
             AlertAssignment.objects
-            .filter(alert=alert)
+            .filter(alert=alert, is_standby=False)
             .select_related('alert', 'agency')
         )
         dispatcher = NotificationDispatcher()
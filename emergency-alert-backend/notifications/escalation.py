@@ -0,0 +1,272 @@
+"""
+Tiered escalation dispatch.
+
+New alerts notify only escalation ring 1 (the closest agency of each required
+type).  Later rings stay on standby and are released one at a time when the
+escalation timeout passes without an acknowledgment.
+
+Pending deadlines live in two places:
+  - EmergencyAlert.escalation_due_at (indexed) is the source of truth, so any
+    process can sweep overdue escalations (`manage.py process_escalations`).
+  - EscalationScheduler keeps an in-process heap of the same deadlines so the
+    web process escalates on time without polling the database.  Deadlines
+    are scheduled whatever ALERT_DISPATCH_ASYNC says; only the notifications
+    of a released ring are sent inline in sync mode.
+
+The heap is lost when a process restarts, so run process_escalations from
+cron (every minute or so) as a backstop in every deployment.
+"""
+import heapq
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def get_escalation_timeout():
+    """
+    Read escalation_timeout_s from SystemSetting (DB).
+    Falls back to settings.ALERT_ESCALATION_TIMEOUT_S on any error so that
+    escalation is never silently disabled.
+    """
+    try:
+        from admin_panel.models import SystemSetting
+        setting = SystemSetting.objects.get(key='escalation_timeout_s')
+        value = int(setting.value.strip())
+        if value <= 0:
+            raise ValueError('timeout must be positive')
+        return value
+    except Exception as exc:
+        logger.warning(
+            f'get_escalation_timeout: could not read DB setting ({exc}); '
+            f'using default={settings.ALERT_ESCALATION_TIMEOUT_S}.'
+        )
+        return settings.ALERT_ESCALATION_TIMEOUT_S
+
+
+def assign_escalation_rings(ranked, ring_size):
+    """
+    Yield (agency, ring) pairs for agencies already ranked closest-first.
+
+    Rings are counted per agency type so that ring 1 always contains the
+    closest agency of every type the alert needs.  ring_size <= 0 disables
+    tiering and puts every agency in ring 1.
+    """
+    seen_per_type = {}
+    for agency, _ in ranked:
+        if ring_size <= 0:
+            yield agency, 1
+            continue
+        index = seen_per_type.get(agency.agency_type, 0)
+        seen_per_type[agency.agency_type] = index + 1
+        yield agency, index // ring_size + 1
+
+
+def escalate_alert(alert_id):
+    """
+    Release the next standby ring of an alert if its deadline has passed and
+    the alert is still unacknowledged.
+
+    Returns the ring number that was released, or None when nothing was due.
+    Safe to call repeatedly and from several processes: the alert row is
+    locked and the deadline re-checked before anything is released.
+    """
+    from alerts.models import EmergencyAlert, AlertAssignment
+    from alerts.lifecycle import ASSIGNMENTS_RELEASED, emit
+
+    now = timezone.now()
+    with transaction.atomic():
+        alert = (
+            EmergencyAlert.objects
+            .select_for_update()
+            .filter(alert_id=alert_id)
+            .first()
+        )
+        if alert is None or alert.escalation_due_at is None:
+            return None
+        if alert.escalation_due_at > now:
+            return None
+
+        standby = AlertAssignment.objects.filter(alert_id=alert_id, is_standby=True)
+        next_ring = standby.order_by('escalation_ring').values_list('escalation_ring', flat=True).first()
+
+        if alert.status != 'DISPATCHED' or next_ring is None:
+            alert.escalation_due_at = None
+            alert.save(update_fields=['escalation_due_at'])
+            return None
+
+        # Response times are measured from the moment a ring is notified.
+        standby.filter(escalation_ring=next_ring).update(
+            is_standby=False, assigned_at=now, updated_at=now,
+        )
+
+        emit(
+            ASSIGNMENTS_RELEASED, alert_id,
+            alert_type=alert.alert_type, priority_level=alert.priority_level, status=alert.status,
+            escalation_ring=next_ring,
+        )
+
+        more_rings = standby.filter(escalation_ring__gt=next_ring).exists()
+        alert.escalation_due_at = (
+            now + timedelta(seconds=get_escalation_timeout()) if more_rings else None
+        )
+        alert.save(update_fields=['escalation_due_at'])
+
+        logger.info(
+            f"Escalating alert_id={alert_id} to ring {next_ring} "
+            f"(more_rings={more_rings})"
+        )
+
+        due_at = alert.escalation_due_at
+        if due_at is not None:
+            transaction.on_commit(lambda: schedule_escalation(alert_id, due_at))
+
+        # Sent after commit, so SMS/email/push I/O never holds the alert row
+        # lock that acknowledgments need.
+        if settings.ALERT_DISPATCH_ASYNC:
+            from .services import enqueue_alert_dispatch
+            transaction.on_commit(
+                lambda: enqueue_alert_dispatch(alert_id, ring=next_ring)
+            )
+        else:
+            transaction.on_commit(lambda: _dispatch_ring(alert_id, next_ring))
+
+    return next_ring
+
+
+def _dispatch_ring(alert_id, ring):
+    """Notify a released ring in this thread (sync dispatch mode)."""
+    from alerts.models import AlertAssignment
+    from .services import NotificationDispatcher
+
+    dispatcher = NotificationDispatcher()
+    released = (
+        AlertAssignment.objects
+        .filter(alert_id=alert_id, escalation_ring=ring)
+        .select_related('alert__user', 'alert__location', 'agency')
+        .order_by('assignment_priority', 'assignment_id')
+    )
+    for assignment in released:
+        try:
+            dispatcher.dispatch_alert(assignment)
+        except Exception:
+            logger.exception(
+                f"Escalation dispatch failed for alert_id={alert_id}, "
+                f"assignment_id={assignment.assignment_id}"
+            )
+
+
+def escalate_due_alerts(now=None):
+    """
+    Sweep every alert whose escalation deadline has passed.
+    Uses the escalation_due_at index, so the cost is proportional to the
+    number of overdue alerts rather than the size of the alert table.
+    """
+    from alerts.models import EmergencyAlert
+
+    now = now or timezone.now()
+    due_ids = list(
+        EmergencyAlert.objects
+        .filter(escalation_due_at__lte=now)
+        .order_by('escalation_due_at')
+        .values_list('alert_id', flat=True)
+    )
+    released = 0
+    for alert_id in due_ids:
+        try:
+            if escalate_alert(alert_id) is not None:
+                released += 1
+        except Exception:
+            logger.exception(f"Escalation sweep failed for alert_id={alert_id}")
+    return released
+
+
+class EscalationScheduler:
+    """
+    In-process due-time index of pending escalations.
+
+    A binary heap ordered by deadline is served by a single daemon thread that
+    sleeps until the earliest deadline, so thousands of pending escalations
+    cost one thread and O(log n) per schedule.  Cancelled or rescheduled
+    entries are dropped lazily when they reach the top of the heap.
+    """
+
+    def __init__(self, callback=None):
+        self._callback = callback or escalate_alert
+        self._heap = []
+        self._due = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def schedule(self, alert_id, due_at):
+        """Register (or move) the escalation deadline of an alert."""
+        due_ts = due_at.timestamp()
+        with self._cond:
+            self._due[alert_id] = due_ts
+            heapq.heappush(self._heap, (due_ts, alert_id))
+            self._ensure_thread()
+            self._cond.notify()
+
+    def cancel(self, alert_id):
+        """Forget an alert's pending deadline (acknowledged or cancelled)."""
+        with self._cond:
+            self._due.pop(alert_id, None)
+
+    def pending(self):
+        with self._cond:
+            return len(self._due)
+
+    def _ensure_thread(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(
+                target=self._run, daemon=True, name='alert-escalation-scheduler',
+            )
+            self._thread.start()
+
+    def _next_due(self):
+        """Block until an entry is due, then pop and return its alert_id."""
+        with self._cond:
+            while True:
+                if not self._heap:
+                    self._cond.wait()
+                    continue
+                due_ts, alert_id = self._heap[0]
+                if self._due.get(alert_id) != due_ts:
+                    heapq.heappop(self._heap)
+                    continue
+                delay = due_ts - time.time()
+                if delay > 0:
+                    self._cond.wait(timeout=delay)
+                    continue
+                heapq.heappop(self._heap)
+                del self._due[alert_id]
+                return alert_id
+
+    def _run(self):
+        while True:
+            alert_id = self._next_due()
+            close_old_connections()
+            try:
+                self._callback(alert_id)
+            except Exception:
+                logger.exception(f"Scheduled escalation crashed for alert_id={alert_id}")
+            finally:
+                close_old_connections()
+
+
+scheduler = EscalationScheduler()
+
+
+def schedule_escalation(alert_id, due_at):
+    """Register an escalation deadline with the process-wide scheduler."""
+    scheduler.schedule(alert_id, due_at)
+
+
+def cancel_escalation(alert_id):
+    scheduler.cancel(alert_id)
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.escalation import escalate_due_alerts
+
+
+class Command(BaseCommand):
+    help = (
+        'Release the next escalation ring of every unacknowledged alert whose '
+        'escalation deadline has passed. Run from cron, or with --loop as a '
+        'standalone worker, so deadlines survive web-process restarts.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep sweeping instead of exiting after one pass.',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=5.0,
+            help='Seconds between sweeps when --loop is set (default: 5).',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            released = escalate_due_alerts()
+            if released:
+                self.stdout.write(self.style.SUCCESS(f'Escalated {released} alert(s).'))
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
@@ -24,5 +24,15 @@ class NotificationLog(models.Model):
     retry_count = IntegerField(default=0)
     error_message = TextField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            # Reporting: attempts since the last compacted rollup day.
+            models.Index(fields=['sent_at'], name='notif_sent_idx'),
+            # Admin log filtered by channel and status, newest first.
+            models.Index(fields=['channel_type', 'delivery_status', 'sent_at'], name='notif_channel_status_idx'),
+            # Assignment delivery status after each send.
+            models.Index(fields=['assignment', 'delivery_status'], name='notif_assign_status_idx'),
+        ]
+
     def __str__(self):
         return f"Notification #{self.log_id} - {self.channel_type} to {self.recipient} ({self.delivery_status})"
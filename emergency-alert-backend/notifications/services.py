@@ -30,20 +30,37 @@ def _get_max_retries():
         return _DEFAULT_MAX_RETRIES
 
 
-def dispatch_alert_assignments(alert_id):
+def _record_delivery_latency(assignment, log):
+    """Feed the admin delivery-latency sketch; never lets a failure reach the sender."""
+    try:
+        from admin_panel.sketches import DELIVERY, record
+        seconds = (log.sent_at - assignment.assigned_at).total_seconds()
+        record(DELIVERY, assignment.agency_id, seconds, log.sent_at)
+    except Exception as exc:
+        logger.warning(f'Could not record delivery latency for assignment {assignment.pk}: {exc}')
+
+
+def dispatch_alert_assignments(alert_id, ring=None):
     """
-    Background worker that dispatches all assignments for one alert.
+    Background worker that dispatches the assignments of one alert.
     Runs in a daemon thread so /api/alerts/create/ can return immediately.
+
+    ring=None dispatches every assignment that is not on escalation standby;
+    passing a ring number dispatches only that escalation ring.
     """
     close_old_connections()
-    logger.info(f"Async dispatch worker started for alert_id={alert_id}")
+    logger.info(f"Async dispatch worker started for alert_id={alert_id} ring={ring}")
 
     try:
         from alerts.models import AlertAssignment
 
+        assignments = AlertAssignment.objects.filter(alert_id=alert_id)
+        if ring is None:
+            assignments = assignments.filter(is_standby=False)
+        else:
+            assignments = assignments.filter(escalation_ring=ring)
         assignments = (
-            AlertAssignment.objects
-            .filter(alert_id=alert_id)
+            assignments
             .select_related('alert__user', 'alert__location', 'agency')
             .order_by('assignment_priority', 'assignment_id')
         )
@@ -73,17 +90,17 @@ def dispatch_alert_assignments(alert_id):
         close_old_connections()
 
 
-def enqueue_alert_dispatch(alert_id):
+def enqueue_alert_dispatch(alert_id, ring=None):
     """
-    Enqueue dispatch for all assignments of an alert in a daemon thread.
+    Enqueue dispatch for the assignments of an alert in a daemon thread.
     Safe to call inside transaction.on_commit().
     """
-    logger.info(f"Queueing async dispatch for alert_id={alert_id}")
+    logger.info(f"Queueing async dispatch for alert_id={alert_id} ring={ring}")
     thread = Thread(
         target=dispatch_alert_assignments,
-        args=(alert_id,),
+        args=(alert_id, ring),
         daemon=True,
-        name=f"alert-dispatch-{alert_id}",
+        name=f"alert-dispatch-{alert_id}" if ring is None else f"alert-dispatch-{alert_id}-ring{ring}",
     )
     thread.start()
     return thread
@@ -219,6 +236,9 @@ class NotificationDispatcher:
                 )
             logger.error(f"User ack SMS failed for {user.phone_number}: {e}")
 
+        if assignment:
+            self._touch_assignment(assignment)
+
     def send_cancellation_notice(self, assignment):
         """
         Notify the assigned agency that the civilian has cancelled their alert.
@@ -281,6 +301,7 @@ class NotificationDispatcher:
                 to=agency.contact_phone,
             )
         self._send_with_retry(_do_sms, assignment, 'SMS', agency.contact_phone)
+        self._touch_assignment(assignment)
 
     def send_status_update(self, assignment, new_status):
         """
@@ -371,6 +392,8 @@ class NotificationDispatcher:
             )
             logger.error(f"Status update SMS failed for {user.phone_number}: {e}")
 
+        self._touch_assignment(assignment)
+
     # ------------------------------------------------------------------
     # Push notification helpers
     # ------------------------------------------------------------------
@@ -405,12 +428,13 @@ class NotificationDispatcher:
     # Retry helper
     # ------------------------------------------------------------------
 
-    def _send_with_retry(self, send_fn, assignment, channel_type, recipient):
+    def _send_with_retry(self, send_fn, assignment, channel_type, recipient, dispatch=False):
         """
         Call send_fn() up to (_get_max_retries() + 1) times.
         The retry ceiling is read from SystemSetting DB on each dispatch call;
         falls back to _DEFAULT_MAX_RETRIES when the DB is unavailable.
         Persists one NotificationLog row per attempt with the correct retry_count.
+        With dispatch=True a delivered alert is added to the delivery-latency sketch.
         Returns True if any attempt succeeded; never raises an exception to the caller.
         One channel's failure does not affect sibling channels.
         """
@@ -418,13 +442,15 @@ class NotificationDispatcher:
         for attempt in range(max_retries + 1):
             try:
                 send_fn()
-                NotificationLog.objects.create(
+                log = NotificationLog.objects.create(
                     assignment=assignment,
                     channel_type=channel_type,
                     recipient=recipient,
                     delivery_status='SENT',
                     retry_count=attempt,
                 )
+                if dispatch:
+                    _record_delivery_latency(assignment, log)
                 logger.info(
                     f"{channel_type} delivered (attempt {attempt + 1}) to {recipient}"
                 )
@@ -487,7 +513,7 @@ class NotificationDispatcher:
 
             self._send_with_retry(
                 _do_web_push, assignment, 'PUSH',
-                agency.web_push_subscription[:50]
+                agency.web_push_subscription[:50], dispatch=True,
             )
             return
 
@@ -507,7 +533,7 @@ class NotificationDispatcher:
                     )
                     messaging.send(msg)
 
-            self._send_with_retry(_do_push, assignment, 'PUSH', agency.fcm_token[:50])
+            self._send_with_retry(_do_push, assignment, 'PUSH', agency.fcm_token[:50], dispatch=True)
             return
 
         # ── No token ────────────────────────────────────────────────────────────
@@ -547,7 +573,7 @@ class NotificationDispatcher:
                 to=agency.contact_phone,
             )
 
-        self._send_with_retry(_do_sms, assignment, 'SMS', agency.contact_phone)
+        self._send_with_retry(_do_sms, assignment, 'SMS', agency.contact_phone, dispatch=True)
 
     def _send_email(self, assignment, agency, alert_data):
         """Send email alert to agency (with retry)."""
@@ -584,7 +610,7 @@ class NotificationDispatcher:
                 fail_silently=False,
             )
 
-        self._send_with_retry(_do_email, assignment, 'EMAIL', agency.contact_email)
+        self._send_with_retry(_do_email, assignment, 'EMAIL', agency.contact_email, dispatch=True)
 
     def _update_assignment_status(self, assignment):
         """Update assignment notification_status based on channel results."""
@@ -593,4 +619,9 @@ class NotificationDispatcher:
             assignment.notification_status = 'SENT'
         elif logs.filter(delivery_status='FAILED').count() == logs.count():
             assignment.notification_status = 'FAILED'
-        assignment.save(update_fields=['notification_status'])
+        assignment.save(update_fields=['notification_status', 'updated_at'])
+
+    def _touch_assignment(self, assignment):
+        """Mark the assignment changed so delta-syncing dashboards see new logs."""
+        from django.utils import timezone
+        type(assignment).objects.filter(pk=assignment.pk).update(updated_at=timezone.now())
@@ -171,3 +171,49 @@ class RetrySettingFallbackTests(TestCase):
             defaults={'value': '0', 'description': 'test'},
         )
         self.assertEqual(_get_max_retries(), 0)
+
+
+class EscalationSchedulerTests(TestCase):
+    def _scheduler(self):
+        import threading
+        from notifications.escalation import EscalationScheduler
+
+        fired = []
+        done = threading.Event()
+
+        def callback(alert_id):
+            fired.append(alert_id)
+            done.set()
+
+        return EscalationScheduler(callback=callback), fired, done
+
+    def test_due_entry_fires_callback(self):
+        from django.utils import timezone
+
+        scheduler, fired, done = self._scheduler()
+        scheduler.schedule(7, timezone.now())
+        self.assertTrue(done.wait(timeout=2))
+        self.assertEqual(fired, [7])
+        self.assertEqual(scheduler.pending(), 0)
+
+    def test_cancelled_entry_is_skipped(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        scheduler, fired, done = self._scheduler()
+        scheduler.schedule(1, timezone.now() + timedelta(milliseconds=50))
+        scheduler.cancel(1)
+        scheduler.schedule(2, timezone.now() + timedelta(milliseconds=100))
+        self.assertTrue(done.wait(timeout=2))
+        self.assertEqual(fired, [2])
+
+    def test_reschedule_keeps_latest_deadline_only(self):
+        from datetime import timedelta
+        from django.utils import timezone
+
+        scheduler, fired, done = self._scheduler()
+        scheduler.schedule(3, timezone.now() + timedelta(seconds=30))
+        scheduler.schedule(3, timezone.now())
+        self.assertTrue(done.wait(timeout=2))
+        self.assertEqual(fired, [3])
+        self.assertEqual(scheduler.pending(), 0)
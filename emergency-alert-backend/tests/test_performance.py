@@ -2,22 +2,34 @@
 Performance Tests — Emergency Alert System
 ==========================================
 Tests response time, multi-channel delivery rate, concurrent load,
-and channel failover behaviour.
+channel failover behaviour, agency list serialization throughput,
+agency list bytes over the wire and the query plans of the hot queries.
 
 Run:
     python manage.py test tests.test_performance --settings=alert_system.test_settings -v 2
 """
+import gzip
+import json
 import time
 import threading
 import statistics
 from unittest.mock import patch, MagicMock
-from django.test import TestCase, TransactionTestCase
+import msgpack
+from django.db import connection
+from django.db.models import Q
+from django.db.models.signals import post_init
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from rest_framework.test import APIClient
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from accounts.models import User
-from agencies.models import SecurityAgency
-from alerts.models import EmergencyAlert, AlertAssignment
+from alert_system import query_plans
+from agencies.models import SecurityAgency, AgencyUser
+from alerts.models import EmergencyAlert, AlertAssignment, Acknowledgment, Location
+from alerts.projections import assignment_rows
+from alerts.serializers import AlertAssignmentSerializer
 from notifications.models import NotificationLog
 
 
@@ -355,6 +367,222 @@ class ChannelFailoverTest(TestCase):
         self._run_failover('PUSH')
 
 
+# ---------------------------------------------------------------------------
+# 5. Agency List Serialization — DRF serializer vs values_list() projection
+# ---------------------------------------------------------------------------
+
+class AgencyListSerializationTest(TestCase):
+    N_ASSIGNMENTS = 300
+    ROUNDS = 5
+
+    @classmethod
+    def setUpTestData(cls):
+        user = _create_user('ls@test.com', '+2348011000005')
+        agency = _create_agency('Police LS', 'POLICE', 'ls_police@test.com', '+2348010000005')
+        alerts = EmergencyAlert.objects.bulk_create([
+            EmergencyAlert(user=user, alert_type='ROBBERY', priority_level='HIGH',
+                           status='ACKNOWLEDGED', description='Serialization benchmark')
+            for _ in range(cls.N_ASSIGNMENTS)
+        ])
+        Location.objects.bulk_create([
+            Location(alert=alert, latitude='6.5244', longitude='3.3792') for alert in alerts
+        ])
+        assignments = AlertAssignment.objects.bulk_create([
+            AlertAssignment(alert=alert, agency=agency) for alert in alerts
+        ])
+        Acknowledgment.objects.bulk_create([
+            Acknowledgment(assignment=a, acknowledged_by='Officer', estimated_arrival=10)
+            for a in assignments
+        ])
+        NotificationLog.objects.bulk_create([
+            NotificationLog(assignment=a, channel_type=ch, recipient='test', delivery_status='SENT')
+            for a in assignments for ch in ('PUSH', 'SMS', 'EMAIL')
+        ])
+        cls.agency = agency
+
+    def _time(self, fn):
+        times_ms = []
+        for _ in range(self.ROUNDS):
+            t0 = time.perf_counter()
+            data = fn()
+            times_ms.append((time.perf_counter() - t0) * 1000)
+        return statistics.median(times_ms), data
+
+    def _cost(self, fn):
+        """(queries, model instances) one call takes: stable, unlike wall time."""
+        instances = []
+
+        def count(sender, **kwargs):
+            instances.append(sender)
+
+        post_init.connect(count)
+        try:
+            with CaptureQueriesContext(connection) as queries:
+                fn()
+        finally:
+            post_init.disconnect(count)
+        return len(queries), len(instances)
+
+    def test_projection_outpaces_serializer(self):
+        base = AlertAssignment.objects.filter(agency=self.agency).order_by('-assigned_at')
+
+        def drf():
+            queryset = (
+                base.select_related('alert__location', 'alert__user', 'agency')
+                .prefetch_related('acknowledgment', 'notifications')
+            )
+            return AlertAssignmentSerializer(queryset, many=True).data
+
+        drf_ms, drf_data = self._time(drf)
+        lean_ms, lean_data = self._time(lambda: assignment_rows(base))
+
+        self.assertEqual(lean_data, drf_data)
+        drf_queries, drf_instances = self._cost(drf)
+        lean_queries, lean_instances = self._cost(lambda: assignment_rows(base))
+        _print_table(
+            f'Agency List Serialization  ({self.N_ASSIGNMENTS} assignments, median of {self.ROUNDS})',
+            [
+                ['DRF serializer',      f'{drf_ms:.1f} ms',  f'{self.N_ASSIGNMENTS / drf_ms * 1000:,.0f}',
+                 drf_queries, f'{drf_instances:,}'],
+                ['values() projection', f'{lean_ms:.1f} ms', f'{self.N_ASSIGNMENTS / lean_ms * 1000:,.0f}',
+                 lean_queries, f'{lean_instances:,}'],
+            ],
+            ['Path', 'Time', 'Rows / s', 'Queries', 'Models built'],
+        )
+        print(f'\n  Speed-up: {drf_ms / lean_ms:.1f}x (informational)\n')
+        # Timing is printed only; the assertions use counts, which do not
+        # depend on how loaded the machine is.
+        self.assertLessEqual(lean_queries, 4)
+        self.assertEqual(lean_instances, 0)
+        self.assertGreaterEqual(drf_instances, self.N_ASSIGNMENTS * 4)
+
+
+# ---------------------------------------------------------------------------
+# 6. Wire Size — agency list as JSON / MessagePack, plain / gzip
+# ---------------------------------------------------------------------------
+
+class WireSizeTest(TestCase):
+    N_ASSIGNMENTS = 200
+    URL = '/api/agency/alerts/'
+
+    @classmethod
+    def setUpTestData(cls):
+        user = _create_user('ws@test.com', '+2348011000006')
+        agency = _create_agency('Police WS', 'POLICE', 'ws_police@test.com', '+2348010000006')
+        officer = _create_user('ws_officer@test.com', '+2348011000007')
+        AgencyUser.objects.create(user=officer, agency=agency, role='DISPATCHER')
+        alerts = EmergencyAlert.objects.bulk_create([
+            EmergencyAlert(user=user, alert_type='ROBBERY', priority_level='HIGH',
+                           status='DISPATCHED', description='Wire size benchmark')
+            for _ in range(cls.N_ASSIGNMENTS)
+        ])
+        assignments = AlertAssignment.objects.bulk_create([
+            AlertAssignment(alert=alert, agency=agency) for alert in alerts
+        ])
+        NotificationLog.objects.bulk_create([
+            NotificationLog(assignment=a, channel_type=ch, recipient='test', delivery_status='SENT')
+            for a in assignments for ch in ('PUSH', 'SMS', 'EMAIL')
+        ])
+        cls.officer = officer
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+    def test_negotiated_encodings_shrink_payload(self):
+        client = _authed_client(_token_string(self.officer))
+        sizes = {}
+        for label, accept, encoding in (
+            ('JSON',               'application/json',    'identity'),
+            ('MessagePack',        'application/msgpack', 'identity'),
+            ('JSON + gzip',        'application/json',    'gzip'),
+            ('MessagePack + gzip', 'application/msgpack', 'gzip'),
+        ):
+            response = client.get(self.URL, HTTP_ACCEPT=accept, HTTP_ACCEPT_ENCODING=encoding)
+            self.assertEqual(response.status_code, 200)
+            sizes[label] = len(response.content)
+            body = gzip.decompress(response.content) if encoding == 'gzip' else response.content
+            decode = msgpack.unpackb if accept == 'application/msgpack' else json.loads
+            self.assertEqual(len(decode(body)), self.N_ASSIGNMENTS)
+
+        baseline = sizes['JSON']
+        _print_table(
+            f'Agency List Wire Size  ({self.N_ASSIGNMENTS} assignments)',
+            [[label, f'{size:,} B', f'{baseline / size:.1f}x'] for label, size in sizes.items()],
+            ['Encoding', 'Bytes', 'Reduction'],
+        )
+        self.assertLess(sizes['MessagePack'], baseline)
+        self.assertGreater(baseline / sizes['JSON + gzip'], 3.0)
+
+
+# ---------------------------------------------------------------------------
+# 7. Query Plans — hot queries must read through an index
+# ---------------------------------------------------------------------------
+
+class QueryPlanTest(TestCase):
+    """
+    Each hot query below must be answered by an index range read (and, where
+    it is ordered, in index order).  Dropping or reshaping a supporting index
+    turns its plan into a full table or index scan or a sort, and this test
+    fails with the plan that regressed.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = _create_user('qp@test.com', '+2348011000008')
+        cls.agency = _create_agency('Police QP', 'POLICE', 'qp_police@test.com', '+2348010000008')
+        alert = EmergencyAlert.objects.create(user=cls.user, alert_type='ROBBERY', status='DISPATCHED')
+        cls.assignment = AlertAssignment.objects.create(alert=alert, agency=cls.agency)
+        NotificationLog.objects.create(
+            assignment=cls.assignment, channel_type='SMS', recipient='test', delivery_status='SENT',
+        )
+
+    def hot_queries(self):
+        """
+        (name, queryset, ordered, filtered) for the queries on the busiest
+        paths.  Only unfiltered pages may walk an index from its end.
+        """
+        since = timezone.now()
+        agency_alerts = AlertAssignment.objects.filter(agency=self.agency, is_standby=False)
+        return [
+            # Agency polling (agencies.views.AgencyAlertListView).
+            ('agency active list', agency_alerts.filter(is_active=True).order_by('-assigned_at'), True, True),
+            ('agency alert history', agency_alerts.order_by('-assigned_at'), True, True),
+            ('agency delta feed', agency_alerts.filter(updated_at__gt=since), False, True),
+            # Dispatch: active agencies of the alert's types.
+            ('dispatch candidates', SecurityAgency.objects.filter(agency_type__in=['POLICE', 'MILITARY'], is_active=True), False, True),
+            # Civilian "my alerts".
+            ('user alert history', EmergencyAlert.objects.filter(user=self.user).order_by('-created_at'), True, True),
+            # Admin alert list, by status, keyset order.
+            ('admin alerts by status', EmergencyAlert.objects.filter(status='PENDING').order_by('-created_at', '-alert_id')[:20], True, True),
+            # Incident correlation: recent alerts of one type.
+            ('recent alerts of a type', EmergencyAlert.objects.filter(alert_type='ROBBERY', created_at__gte=since), False, True),
+            # Admin notification log, unfiltered and by channel and status.
+            ('notification log', NotificationLog.objects.order_by('-sent_at', '-log_id')[:20], True, False),
+            ('notification log by channel and status', NotificationLog.objects.filter(
+                channel_type='SMS', delivery_status='FAILED',
+            ).order_by('-sent_at', '-log_id')[:20], True, True),
+            # Assignment delivery status after each send.
+            ('assignment deliveries by status', NotificationLog.objects.filter(
+                assignment=self.assignment, delivery_status='SENT',
+            ), False, True),
+            # Export batches: ascending keyset range.
+            ('alert export batch', EmergencyAlert.objects.filter(
+                Q(created_at__gte=since) & (Q(created_at__gt=since) | Q(alert_id__gt=0)),
+            ).order_by('created_at', 'alert_id')[:2000], True, True),
+        ]
+
+    def test_hot_queries_use_indexes(self):
+        rows = []
+        for name, queryset, ordered, filtered in self.hot_queries():
+            steps = query_plans.plan(queryset)
+            rows.append([name, ' / '.join(steps)])
+            with self.subTest(query=name):
+                self.assertEqual(query_plans.full_scans(queryset), [], f'{name}: {steps}')
+                if filtered:
+                    self.assertEqual(query_plans.index_scans(queryset), [], f'{name}: {steps}')
+                if ordered:
+                    self.assertEqual(query_plans.sorts(queryset), [], f'{name}: {steps}')
+        _print_table('Hot Query Plans', rows, ['Query', 'Plan'])
+
+
 # ---------------------------------------------------------------------------
 # Summary
 # ---------------------------------------------------------------------------
@@ -379,6 +607,15 @@ class PerformanceSummary(TestCase):
 |  Test 4 - Channel Failover (SMS / EMAIL / PUSH broken)           |
 |    Target : broken channel logs FAILED; others log SENT          |
 |                                                                  |
+|  Test 5 - Agency List Serialization (300 assignments)            |
+|    Target : projection builds no model instances, <= 4 queries   |
+|                                                                  |
+|  Test 6 - Agency List Wire Size (200 assignments)                |
+|    Target : gzip at least 3x smaller than plain JSON             |
+|                                                                  |
+|  Test 7 - Query Plans (hot agency, alert and log queries)        |
+|    Target : no full table scans, no sorts on ordered reads       |
+|                                                                  |
 |  Database : SQLite in-memory                                     |
 |  External services (FCM, Twilio, Email) : mocked                 |
 +==================================================================+